@@ -6,10 +6,14 @@ This provides an OpenAI-compatible embedding API for the multilingual-e5-large-i
 
 import os
 import time
+import base64
 import logging
+import zlib
 from typing import List, Optional, Union
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.routing import APIRoute
 from pydantic import BaseModel, Field
 import torch
 from sentence_transformers import SentenceTransformer, CrossEncoder
@@ -55,6 +59,59 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Large responses (NER entity lists for a full batch) go back gzipped to clients that ask,
+# which requests does by default. Level 1: on a non-local GPU host the wire is the cost,
+# and the higher levels buy a few percent for several times the CPU.
+app.add_middleware(GZipMiddleware, minimum_size=4096, compresslevel=1)
+
+
+#: Largest request body accepted once a gzipped one is decoded. Without a cap a few
+#: kilobytes of compressed zeros expand into gigabytes of server memory.
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", str(64 * 1024 * 1024)))
+
+
+class GzipRequest(Request):
+    """A request whose `Content-Encoding: gzip` body is decoded before parsing.
+
+    The workers compress large NER/embeddings batches when REMOTE_GZIP_MIN_BYTES is set
+    (main_services/processing/tasks/remote.py); uncompressed requests pass through as is.
+    A body that decodes past MAX_REQUEST_BYTES is refused with 413 without being
+    inflated any further.
+    """
+
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            body = await super().body()
+            if "gzip" in self.headers.getlist("Content-Encoding"):
+                decoder = zlib.decompressobj(wbits=31)  # 31: gzip header and trailer
+                try:
+                    body = decoder.decompress(body, MAX_REQUEST_BYTES + 1)
+                except zlib.error as exc:
+                    raise HTTPException(status_code=400, detail=f"Invalid gzip request body: {exc}")
+                if len(body) > MAX_REQUEST_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Decoded request body exceeds {MAX_REQUEST_BYTES} bytes",
+                    )
+                if not decoder.eof:
+                    raise HTTPException(status_code=400, detail="Invalid gzip request body: truncated")
+            self._body = body
+        return self._body
+
+
+class GzipRoute(APIRoute):
+    def get_route_handler(self):
+        original_handler = super().get_route_handler()
+
+        async def handler(request: Request):
+            return await original_handler(GzipRequest(request.scope, request.receive))
+
+        return handler
+
+
+# Set before any route is declared: the decorators below pick it up at definition time.
+app.router.route_class = GzipRoute
+
 # Global model variables
 model = None
 reranker = None
@@ -101,7 +158,10 @@ class EmbeddingRequest(BaseModel):
 
 class EmbeddingData(BaseModel):
     object: str = "embedding"
-    embedding: List[float]
+    # A list of floats, or with encoding_format="base64" (OpenAI's format) the
+    # little-endian float32 bytes, base64-encoded: ~4x smaller than decimal floats in
+    # JSON, and the client decodes it with one frombuffer instead of parsing numbers.
+    embedding: Union[List[float], str]
     index: int
 
 class EmbeddingResponse(BaseModel):
@@ -344,12 +404,12 @@ async def create_embeddings(request: EmbeddingRequest):
             
             # Check if this is a list of token arrays (for LangChain compatibility)
             if all(is_token_array(item) for item in request.input):
-                logger.info(f"Detected tokenized input from LangChain, decoding {len(request.input)} token arrays")
+                logger.info("Detected tokenized input from LangChain, decoding %d token arrays", len(request.input))
                 texts = []
                 for token_array in request.input:
                     decoded_text = decode_tokens_to_text(token_array)
                     texts.append(decoded_text)
-                    logger.debug(f"Decoded tokens {token_array[:10]}... -> '{decoded_text[:50]}...'")
+                    logger.debug("Decoded tokens %s... -> '%.50s...'", token_array[:10], decoded_text)
             else:
                 # Regular list of strings
                 texts = request.input
@@ -360,6 +420,10 @@ async def create_embeddings(request: EmbeddingRequest):
         if not texts or len(texts) == 0:
             raise HTTPException(status_code=400, detail="Input cannot be empty")
 
+        encoding_format = request.encoding_format or "float"
+        if encoding_format not in ("float", "base64"):
+            raise HTTPException(status_code=400, detail="encoding_format must be 'float' or 'base64'")
+
         # Check for empty strings
         if any(not str(text).strip() for text in texts):
             raise HTTPException(status_code=400, detail="Input texts cannot be empty")
@@ -382,7 +446,7 @@ async def create_embeddings(request: EmbeddingRequest):
                 ),
             )
 
-        logger.info(f"Processing {len(texts)} text(s) for embeddings")
+        logger.info("Processing %d text(s) for embeddings", len(texts))
         
         # Wrap only when the caller explicitly asked for the instruct template (see
         # EmbeddingRequest.task_description). The default is the raw text.
@@ -405,8 +469,11 @@ async def create_embeddings(request: EmbeddingRequest):
                 device=model.device  # Ensure consistent device usage
             )
         
-        # Convert to list format
-        if isinstance(embeddings, np.ndarray):
+        # Convert to the requested wire format
+        if encoding_format == "base64":
+            vectors = np.asarray(embeddings, dtype="<f4")
+            embeddings = [base64.b64encode(row.tobytes()).decode("ascii") for row in vectors]
+        elif isinstance(embeddings, np.ndarray):
             embeddings = embeddings.tolist()
         
         # Format response
@@ -430,7 +497,7 @@ async def create_embeddings(request: EmbeddingRequest):
             }
         )
         
-        logger.info(f"Successfully generated embeddings for {len(texts)} text(s) with task: '{task_description}'")
+        logger.info("Successfully generated embeddings for %d text(s) with task: '%s'", len(texts), task_description)
         return response
         
     except HTTPException:
@@ -460,7 +527,7 @@ async def rerank_documents(request: RerankRequest):
         if any(not str(doc).strip() for doc in request.documents):
             raise HTTPException(status_code=400, detail="Documents cannot be empty")
         
-        logger.info(f"Reranking {len(request.documents)} documents for query: '{request.query[:50]}...'")
+        logger.info("Reranking %d documents for query: '%.50s...'", len(request.documents), request.query)
         
         # Create query-document pairs for the cross-encoder
         pairs = [[request.query, doc] for doc in request.documents]
@@ -508,7 +575,7 @@ async def rerank_documents(request: RerankRequest):
             }
         )
         
-        logger.info(f"Successfully reranked {len(request.documents)} documents, returning top {len(sorted_results)}")
+        logger.info("Successfully reranked %d documents, returning top %d", len(request.documents), len(sorted_results))
         return response
         
     except HTTPException:
@@ -544,7 +611,7 @@ async def extract_entities(request: NERRequest):
         if any(not str(text).strip() for text in texts):
             raise HTTPException(status_code=400, detail="Input texts cannot be empty")
         
-        logger.info(f"Extracting entities from {len(texts)} text(s)")
+        logger.info("Extracting entities from %d text(s)", len(texts))
         
         model_used = request.model or ner_model_name
         all_entities = []
@@ -580,7 +647,7 @@ async def extract_entities(request: NERRequest):
             if not isinstance(text_ner_results, list):
                 text_ner_results = [text_ner_results]
                 
-            logger.debug(f"Processing results for text {text_idx + 1}/{len(texts)}")
+            logger.debug("Processing results for text %d/%d", text_idx + 1, len(texts))
             
             # Extract entities for this text
             for ent in text_ner_results:
@@ -620,7 +687,7 @@ async def extract_entities(request: NERRequest):
             }
         )
         
-        logger.info(f"Successfully extracted {len(all_entities)} entities from {len(texts)} text(s) using {model_used}")
+        logger.info("Successfully extracted %d entities from %d text(s) using %s", len(all_entities), len(texts), model_used)
         return response
         
     except HTTPException:
@@ -9,11 +9,13 @@ import statistics
 import pytest
 from typing import List
 from test_utils import (
-    DEFAULT_BASE_URL,
+    DEFAULT_BASE_URL, SESSION, throughput_opt_in,
     validate_server_connection, print_test_header, print_test_subheader, check_server_health,
     DIVERSE_TEST_TEXTS, DEFAULT_MODEL, DEFAULT_TASK_DESCRIPTION
 )
 
+pytestmark = throughput_opt_in
+
 
 def test_batch_size_optimization(base_url: str = DEFAULT_BASE_URL,
                                 batch_sizes: List[int] = None,
@@ -67,7 +69,7 @@ def test_batch_size_optimization(base_url: str = DEFAULT_BASE_URL,
         for i in range(warmup_batches):
             start_time = time.time()
             try:
-                response = requests.post(
+                response = SESSION.post(
                     f"{base_url}/v1/embeddings",
                     json={
                         "input": all_batches[i],
@@ -126,7 +128,7 @@ def test_batch_size_optimization(base_url: str = DEFAULT_BASE_URL,
             start_time = time.time()
 
             try:
-                response = requests.post(
+                response = SESSION.post(
                     f"{base_url}/v1/embeddings",
                     json={
                         "input": all_batches[i],
@@ -3,24 +3,32 @@
 Basic embedding API tests for the embedding server
 """
 
+import base64
+import gzip
+import json
+import struct
+
 import requests
 import pytest
 from test_utils import (
-    DEFAULT_BASE_URL,
-    cosine_similarity, euclidean_distance, check_server_health,
+    DEFAULT_BASE_URL, SESSION,
+    euclidean_distance, pairwise_cosine, check_server_health, embed_texts,
     print_test_header, validate_server_connection,
     SIMILARITY_TEST_TEXTS, DEFAULT_MODEL, DEFAULT_TASK_DESCRIPTION
 )
 
 
+@pytest.fixture(autouse=True, scope="module")
+def _require_server():
+    """Probe the server once for the whole module, not once per test."""
+    if not validate_server_connection():
+        pytest.skip("Server not available")
+
+
 def test_basic_embedding_generation():
     """Test basic embedding generation with direct API calls"""
     print_test_header("BASIC EMBEDDING GENERATION TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
     print("\nTest texts:")
     for i, text in enumerate(SIMILARITY_TEST_TEXTS):
         print(f"{i+1}. {text}")
@@ -28,7 +36,7 @@ def test_basic_embedding_generation():
     # Get embeddings using direct API call
     print("\nGetting embeddings using direct API...")
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/embeddings",
             json={
                 "input": SIMILARITY_TEST_TEXTS,
@@ -60,24 +68,9 @@ def test_similarity_computation():
     """Test similarity computation with embedding results"""
     print_test_header("EMBEDDING SIMILARITY COMPUTATION TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
     # Get embeddings first
     try:
-        response = requests.post(
-            DEFAULT_BASE_URL + "/v1/embeddings",
-            json={
-                "input": SIMILARITY_TEST_TEXTS,
-                "model": DEFAULT_MODEL
-            }
-        )
-
-        assert response.status_code == 200, f"API returned status code {response.status_code}: {response.text}"
-
-        result = response.json()
-        embeddings = [item["embedding"] for item in result["data"]]
+        embeddings = embed_texts(tuple(SIMILARITY_TEST_TEXTS))
         print(f" Successfully got {len(embeddings)} embeddings")
         print(f"Embedding dimension: {len(embeddings[0])}")
 
@@ -97,9 +90,10 @@ def test_similarity_computation():
     ]
 
     results = []
+    similarities = pairwise_cosine(embeddings)
 
     for i, j, description in comparisons:
-        cosine_sim = cosine_similarity(embeddings[i], embeddings[j])
+        cosine_sim = float(similarities[i, j])
         euclidean_dist = euclidean_distance(embeddings[i], embeddings[j])
 
         results.append({
@@ -153,13 +147,9 @@ def test_custom_task_description():
     """Test embedding generation with custom task description"""
     print_test_header("CUSTOM TASK DESCRIPTION TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
     print("Testing with different task description...")
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/embeddings",
             json={
                 "input": SIMILARITY_TEST_TEXTS,
@@ -186,15 +176,11 @@ def test_single_text_embedding():
     """Test embedding generation for single text input"""
     print_test_header("SINGLE TEXT EMBEDDING TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
     single_text = "This is a single test sentence for embedding."
     print(f"Test text: '{single_text}'")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/embeddings",
             json={
                 "input": single_text,
@@ -228,10 +214,7 @@ def test_a_model_this_server_does_not_serve_is_refused():
     """
     print_test_header("EMBEDDING MODEL MISMATCH TEST")
 
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
-    response = requests.post(
+    response = SESSION.post(
         DEFAULT_BASE_URL + "/v1/embeddings",
         json={"input": "dimension probe", "model": "some/other-model-v9"},
     )
@@ -243,7 +226,7 @@ def test_a_model_this_server_does_not_serve_is_refused():
     # And the honest path: no `model`, or the served one, still works and names itself.
     for payload in ({"input": "dimension probe"},
                     {"input": "dimension probe", "model": DEFAULT_MODEL}):
-        ok = requests.post(DEFAULT_BASE_URL + "/v1/embeddings", json=payload)
+        ok = SESSION.post(DEFAULT_BASE_URL + "/v1/embeddings", json=payload)
         assert ok.status_code == 200, ok.text
         assert ok.json()["model"] == DEFAULT_MODEL
 
@@ -252,14 +235,10 @@ def test_error_handling():
     """Test API error handling"""
     print_test_header("EMBEDDING API ERROR HANDLING TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
     # Test empty input
     print("Testing empty input...")
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/embeddings",
             json={
                 "input": [],
@@ -276,7 +255,7 @@ def test_error_handling():
     # Test missing input
     print("Testing missing input field...")
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/embeddings",
             json={
                 "model": DEFAULT_MODEL
@@ -290,8 +269,63 @@ def test_error_handling():
         pytest.fail(f"Error testing missing input: {e}")
 
 
+def test_base64_encoding_matches_float_encoding():
+    """encoding_format="base64" must carry the same float32 vectors as the float lists"""
+    print_test_header("BASE64 ENCODING FORMAT TEST")
+
+    texts = SIMILARITY_TEST_TEXTS[:2]
+    as_floats = SESSION.post(
+        DEFAULT_BASE_URL + "/v1/embeddings",
+        json={"input": texts, "model": DEFAULT_MODEL},
+    )
+    as_base64 = SESSION.post(
+        DEFAULT_BASE_URL + "/v1/embeddings",
+        json={"input": texts, "model": DEFAULT_MODEL, "encoding_format": "base64"},
+    )
+    assert as_floats.status_code == 200, as_floats.text
+    assert as_base64.status_code == 200, as_base64.text
+
+    for plain, packed in zip(as_floats.json()["data"], as_base64.json()["data"]):
+        raw = base64.b64decode(packed["embedding"])
+        decoded = struct.unpack(f"<{len(raw) // 4}f", raw)
+        assert len(decoded) == len(plain["embedding"])
+        assert all(abs(a - b) < 1e-6 for a, b in zip(decoded, plain["embedding"]))
+
+    bad = SESSION.post(
+        DEFAULT_BASE_URL + "/v1/embeddings",
+        json={"input": texts, "model": DEFAULT_MODEL, "encoding_format": "int8"},
+    )
+    assert bad.status_code == 400
+
+
+def test_gzip_request_body_is_accepted():
+    """A Content-Encoding: gzip request must embed exactly like the plain one"""
+    print_test_header("GZIP REQUEST BODY TEST")
+
+    payload = {"input": SIMILARITY_TEST_TEXTS[:2], "model": DEFAULT_MODEL}
+    plain = SESSION.post(DEFAULT_BASE_URL + "/v1/embeddings", json=payload)
+    packed = SESSION.post(
+        DEFAULT_BASE_URL + "/v1/embeddings",
+        data=gzip.compress(json.dumps(payload).encode(), compresslevel=1),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    assert plain.status_code == 200, plain.text
+    assert packed.status_code == 200, packed.text
+    for a, b in zip(plain.json()["data"], packed.json()["data"]):
+        assert all(abs(x - y) < 1e-6 for x, y in zip(a["embedding"], b["embedding"]))
+
+    corrupt = SESSION.post(
+        DEFAULT_BASE_URL + "/v1/embeddings",
+        data=b"not gzip",
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    assert corrupt.status_code == 400
+
+
 if __name__ == "__main__":
     print("Running embedding API tests...\n")
+    if not validate_server_connection():
+        exit(1)
 
     try:
         test_basic_embedding_generation()
@@ -309,6 +343,12 @@ if __name__ == "__main__":
         test_error_handling()
         print("\n" + "=" * 80)
 
+        test_base64_encoding_matches_float_encoding()
+        print("\n" + "=" * 80)
+
+        test_gzip_request_body_is_accepted()
+        print("\n" + "=" * 80)
+
         print("EMBEDDING TESTS RESULTS")
         print("=" * 80)
         print(" All embedding tests passed!")
@@ -4,26 +4,24 @@ Named Entity Recognition (NER) tests for the embedding server
 """
 
 import requests
+import time
 import pytest
 from test_utils import (
-    DEFAULT_BASE_URL,
-    validate_server_connection, print_test_header, check_server_health
+    DEFAULT_BASE_URL, SESSION,
+    require_model_loaded, print_test_header
 )
 
 
+@pytest.fixture(autouse=True, scope="module")
+def _require_server():
+    """Probe the server once for the whole module, not once per test."""
+    require_model_loaded("ner_model_loaded", "NER model")
+
+
 def test_basic_entity_extraction():
     """Test basic named entity recognition functionality"""
     print_test_header("BASIC ENTITY EXTRACTION TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
-    # Check if NER model is loaded
-    health_data = check_server_health()
-    if not health_data.get('ner_model_loaded', False):
-        pytest.skip("NER model not loaded")
-
     # Test text with various entity types
     test_text = """
     Apple Inc. was founded by Steve Jobs, Steve Wozniak, and Ronald Wayne in Cupertino, California on April 1, 1976.
@@ -35,7 +33,7 @@ def test_basic_entity_extraction():
     print(f"\nTest text: {test_text.strip()}")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/extract-entities",
             json={
                 "input": test_text
@@ -97,15 +95,6 @@ def test_entity_type_filtering():
     """Test filtering entities by specific types"""
     print_test_header("ENTITY TYPE FILTERING TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
-    # Check if NER model is loaded
-    health_data = check_server_health()
-    if not health_data.get('ner_model_loaded', False):
-        pytest.skip("NER model not loaded")
-
     test_text = """
     Microsoft Corporation was founded by Bill Gates and Paul Allen in Redmond, Washington.
     The company reported revenue of $211.9 billion in fiscal year 2023.
@@ -116,7 +105,7 @@ def test_entity_type_filtering():
     print("Testing with entity_types filter: ['PER', 'ORG']")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/extract-entities",
             json={
                 "input": test_text,
@@ -150,15 +139,6 @@ def test_entity_extraction_multiple_texts():
     """Test entity extraction with multiple input texts"""
     print_test_header("MULTIPLE TEXTS ENTITY EXTRACTION TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
-    # Check if NER model is loaded
-    health_data = check_server_health()
-    if not health_data.get('ner_model_loaded', False):
-        pytest.skip("NER model not loaded")
-
     test_texts = [
         "Google was founded by Larry Page and Sergey Brin at Stanford University.",
         "Amazon's headquarters are located in Seattle, Washington.",
@@ -170,7 +150,7 @@ def test_entity_extraction_multiple_texts():
         print(f"{i+1}. {text}")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/extract-entities",
             json={
                 "input": test_texts
@@ -202,19 +182,10 @@ def test_ner_error_handling():
     """Test NER error handling for invalid inputs"""
     print_test_header("NER ERROR HANDLING TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
-    # Check if NER model is loaded
-    health_data = check_server_health()
-    if not health_data.get('ner_model_loaded', False):
-        pytest.skip("NER model not loaded")
-
     # Test empty text
     print("Testing empty text...")
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/extract-entities",
             json={
                 "input": ""
@@ -230,7 +201,7 @@ def test_ner_error_handling():
     # Test missing input field
     print("Testing missing input field...")
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/extract-entities",
             json={}
         )
@@ -244,7 +215,7 @@ def test_ner_error_handling():
     # Test invalid entity types filter
     print("Testing invalid entity types...")
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/extract-entities",
             json={
                 "input": "Test text with some content.",
@@ -274,15 +245,6 @@ def test_ner_performance():
     """Test NER performance with longer text"""
     print_test_header("NER PERFORMANCE TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
-    # Check if NER model is loaded
-    health_data = check_server_health()
-    if not health_data.get('ner_model_loaded', False):
-        pytest.skip("NER model not loaded")
-
     # Longer text for performance testing
     long_text = """
     The technology industry has seen remarkable growth over the past decade. Companies like Microsoft, Google, Apple, and Amazon have become some of the most valuable corporations in the world. These companies are headquartered in various locations across the United States, including Redmond, Mountain View, Cupertino, and Seattle.
@@ -298,10 +260,9 @@ def test_ner_performance():
     print("Testing NER performance with longer text...")
 
     try:
-        import time
         start_time = time.time()
 
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/extract-entities",
             json={
                 "input": long_text
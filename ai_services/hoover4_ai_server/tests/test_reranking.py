@@ -7,24 +7,21 @@ import requests
 import time
 import pytest
 from test_utils import (
-    DEFAULT_BASE_URL,
-    validate_server_connection, print_test_header, print_test_subheader, check_server_health
+    DEFAULT_BASE_URL, SESSION,
+    require_model_loaded, print_test_header, print_test_subheader
 )
 
 
+@pytest.fixture(autouse=True, scope="module")
+def _require_server():
+    """Probe the server once for the whole module, not once per test."""
+    require_model_loaded("reranker_model_loaded", "Reranker model")
+
+
 def test_basic_reranking():
     """Test basic reranking functionality"""
     print_test_header("BASIC RERANKING TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
-    # Check if reranker model is loaded
-    health_data = check_server_health()
-    if not health_data.get('reranker_model_loaded', False):
-        pytest.skip("Reranker model not loaded")
-
     # Test documents - mix of relevant and irrelevant to cats
     query = "Tell me about cats as pets"
     documents = [
@@ -43,7 +40,7 @@ def test_basic_reranking():
         print(f"{i+1}. {doc}")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/rerank",
             json={
                 "query": query,
@@ -95,15 +92,6 @@ def test_top_k_filtering():
     """Test top-k filtering functionality"""
     print_test_header("TOP-K FILTERING TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
-    # Check if reranker model is loaded
-    health_data = check_server_health()
-    if not health_data.get('reranker_model_loaded', False):
-        pytest.skip("Reranker model not loaded")
-
     query = "Tell me about machine learning"
     documents = [
         "Machine learning algorithms can analyze large datasets efficiently.",
@@ -119,7 +107,7 @@ def test_top_k_filtering():
     print(f"Testing with top_k=3 from {len(documents)} documents")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/rerank",
             json={
                 "query": query,
@@ -152,15 +140,6 @@ def test_return_documents_false():
     """Test excluding document content from response"""
     print_test_header("RETURN DOCUMENTS FALSE TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
-    # Check if reranker model is loaded
-    health_data = check_server_health()
-    if not health_data.get('reranker_model_loaded', False):
-        pytest.skip("Reranker model not loaded")
-
     query = "artificial intelligence applications"
     documents = [
         "AI is used in healthcare for medical diagnosis.",
@@ -173,7 +152,7 @@ def test_return_documents_false():
     print("Testing with return_documents=False")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/rerank",
             json={
                 "query": query,
@@ -205,21 +184,12 @@ def test_reranking_error_handling():
     """Test error handling for invalid inputs"""
     print_test_header("RERANKING ERROR HANDLING TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
-    # Check if reranker model is loaded
-    health_data = check_server_health()
-    if not health_data.get('reranker_model_loaded', False):
-        pytest.skip("Reranker model not loaded")
-
     documents = ["Valid document for testing"]
 
     # Test empty query
     print("Testing empty query...")
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/rerank",
             json={
                 "query": "",
@@ -236,7 +206,7 @@ def test_reranking_error_handling():
     # Test empty documents
     print("Testing empty documents list...")
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/rerank",
             json={
                 "query": "valid query",
@@ -253,7 +223,7 @@ def test_reranking_error_handling():
     # Test missing fields
     print("Testing missing query field...")
     try:
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/rerank",
             json={
                 "documents": documents
@@ -271,15 +241,6 @@ def test_reranking_performance():
     """Test reranking performance with larger document set"""
     print_test_header("RERANKING PERFORMANCE TEST")
 
-    # Validate server connection
-    if not validate_server_connection():
-        pytest.skip("Server not available")
-
-    # Check if reranker model is loaded
-    health_data = check_server_health()
-    if not health_data.get('reranker_model_loaded', False):
-        pytest.skip("Reranker model not loaded")
-
     query = "machine learning and artificial intelligence"
 
     # Create a larger set of documents
@@ -301,7 +262,7 @@ def test_reranking_performance():
 
     try:
         start_time = time.time()
-        response = requests.post(
+        response = SESSION.post(
             DEFAULT_BASE_URL + "/v1/rerank",
             json={
                 "query": query,
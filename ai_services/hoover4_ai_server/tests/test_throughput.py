@@ -7,12 +7,15 @@ import requests
 import time
 import statistics
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from test_utils import (
-    DEFAULT_BASE_URL,
+    DEFAULT_BASE_URL, SESSION, throughput_opt_in,
     validate_server_connection, print_test_header, check_server_health,
     DIVERSE_TEST_TEXTS, DEFAULT_MODEL, DEFAULT_TASK_DESCRIPTION
 )
 
+pytestmark = throughput_opt_in
+
 
 def test_batch_throughput(base_url: str = DEFAULT_BASE_URL,
                          num_batches: int = 10,
@@ -59,7 +62,7 @@ def test_batch_throughput(base_url: str = DEFAULT_BASE_URL,
     for i in range(warmup_batches):
         start_time = time.time()
         try:
-            response = requests.post(
+            response = SESSION.post(
                 f"{base_url}/v1/embeddings",
                 json={
                     "input": all_batches[i],
@@ -99,7 +102,7 @@ def test_batch_throughput(base_url: str = DEFAULT_BASE_URL,
         start_time = time.time()
 
         try:
-            response = requests.post(
+            response = SESSION.post(
                 f"{base_url}/v1/embeddings",
                 json={
                     "input": all_batches[i],
@@ -244,6 +247,64 @@ def test_large_batch_performance():
     )
 
 
+def test_concurrent_batch_throughput(base_url: str = DEFAULT_BASE_URL,
+                                    batch_size: int = 20,
+                                    batches_per_level: int = 8,
+                                    concurrency_levels: tuple = (1, 2, 4)):
+    """Throughput with several batches in flight at once.
+
+    Every other test here waits for each response before sending the next batch, so
+    the GPU idles through every request's network and JSON time. The worker's P5
+    stage keeps `EMBEDDING_SERVICE_PARALLELISM` requests in flight, and this measures
+    whether the server turns that into throughput or just into queueing.
+    """
+
+    print_test_header("CONCURRENT BATCH THROUGHPUT TEST")
+
+    if not validate_server_connection(base_url):
+        pytest.skip("Server not available")
+
+    def embed(batch):
+        response = SESSION.post(
+            f"{base_url}/v1/embeddings",
+            json={
+                "input": batch,
+                "model": DEFAULT_MODEL,
+                "task_description": DEFAULT_TASK_DESCRIPTION
+            },
+            timeout=120
+        )
+        assert response.status_code == 200, f"Status code {response.status_code}: {response.text}"
+        return len(response.json()["data"])
+
+    # One warmup batch, so the first level does not pay for model warmup alone.
+    embed([f"Warmup: {t}" for t in DIVERSE_TEST_TEXTS[:batch_size]])
+
+    results = {}
+    for concurrency in concurrency_levels:
+        batches = [
+            [f"C{concurrency}_Batch{b}: {DIVERSE_TEST_TEXTS[i % len(DIVERSE_TEST_TEXTS)]}"
+             for i in range(batch_size)]
+            for b in range(batches_per_level)
+        ]
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            counts = list(pool.map(embed, batches))
+        elapsed = time.time() - started
+        assert sum(counts) == batch_size * batches_per_level, f"Incorrect total embeddings: {sum(counts)}"
+        results[concurrency] = sum(counts) / elapsed
+        print(f"  Concurrency {concurrency}: {sum(counts)} embeddings in {elapsed:.2f}s ({results[concurrency]:.1f} emb/s)")
+
+    best = max(results, key=results.get)
+    print(f"\n{'Concurrency':<15} {'Throughput':<15} {'vs serial'}")
+    print("-" * 45)
+    for concurrency, throughput in results.items():
+        print(f"{concurrency:<15} {throughput:<15.1f} {throughput / results[concurrency_levels[0]]:.2f}x")
+    print(f"\nBest: {best} request(s) in flight ({results[best]:.1f} emb/s)")
+
+    assert all(throughput > 1.0 for throughput in results.values()), f"Throughput too low: {results}"
+
+
 if __name__ == "__main__":
     print("Running throughput tests...\n")
 
@@ -2,9 +2,9 @@
 
 Things live here because two or more servers need them and a second copy would
 drift: the chat-artifact writer (metasearch writes `search_detail`, the browser router
-writes `page_capture`), the rerank client with its circuit breaker (metasearch and
-collection search), the RRF/floor fusion machinery (same two), the query-side embedding
-client, and the MinIO helper.
+writes `page_capture`), the rerank client (metasearch and collection search), the RRF/floor
+fusion machinery (same two), the query-side embedding client, the circuit breaker those
+two clients share, and the MinIO helper.
 
 **This package is vendored into each image, not installed from an index.** The Dockerfiles
 build with `main_services/agents` as their context and `COPY ./agent_common/`. That is why
@@ -12,4 +12,4 @@ its dependencies are declared in each consuming `pyproject.toml` rather than her
 `pip install ./agent_common` runs before the server's own install in every image.
 """
 
-__all__ = ["artifacts", "embeddings", "fusion", "minio_store", "rerank"]
+__all__ = ["artifacts", "breaker", "embeddings", "fusion", "minio_store", "rerank"]
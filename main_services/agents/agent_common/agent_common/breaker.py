@@ -0,0 +1,63 @@
+"""Per-endpoint circuit breaker for the GPU-tier clients (`rerank`, `embeddings`).
+
+Same shape as `_Breaker` in `main_services/processing/tasks/remote.py`: only *connect*
+failures count, and an open circuit is time-boxed, never latching, so a recovered GPU
+host comes back on its own. Each client keeps its own instance, because rerank and
+embeddings are separate endpoints that can fail separately.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("REMOTE_CIRCUIT_FAILURES", "3"))
+CIRCUIT_BREAK_SECONDS = float(os.getenv("GPU_CIRCUIT_BREAK_SECONDS", "60"))
+
+
+@dataclass
+class _Circuit:
+    consecutive_failures: int = 0
+    open_until: float = 0.0
+
+
+class Breaker:
+    """Per-endpoint circuit state, shared across this process's threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._circuits: dict[str, _Circuit] = {}
+
+    def is_open(self, url: str) -> bool:
+        with self._lock:
+            c = self._circuits.get(url)
+            return bool(c and c.open_until > time.monotonic())
+
+    def record_failure(self, url: str) -> bool:
+        """Count a connect failure; returns True if that tripped the breaker."""
+        with self._lock:
+            c = self._circuits.setdefault(url, _Circuit())
+            c.consecutive_failures += 1
+            if c.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
+                c.open_until = time.monotonic() + CIRCUIT_BREAK_SECONDS
+                c.consecutive_failures = 0
+                return True
+            return False
+
+    def record_success(self, url: str) -> None:
+        with self._lock:
+            self._circuits.pop(url, None)
+
+    def state(self) -> dict[str, dict]:
+        """Snapshot for a `/health` endpoint."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                url: {
+                    "consecutive_failures": c.consecutive_failures,
+                    "open_for_seconds": round(max(0.0, c.open_until - now), 1),
+                }
+                for url, c in self._circuits.items()
+            }
@@ -16,16 +16,23 @@ about what the server serves, never the configured value.
 
 The client mirrors `rerank.py`'s rules: a 2 s connect timeout so a dead GPU host is
 noticed in seconds, a finite read timeout so a slow one cannot wedge a search, and every
-call's latency logged.
+call's latency logged. Repeated queries are answered from a small exact-match LRU, a
+query already being embedded is waited for rather than sent again, and concurrent ones
+can be coalesced into one request (`EMBED_QUERY_BATCH_WINDOW_MS`).
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import queue
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future
 
 from agent_common import telemetry
+from agent_common.breaker import Breaker
 
 log = logging.getLogger(__name__)
 
@@ -40,16 +47,73 @@ READ_TIMEOUT = float(os.getenv("EMBED_TIMEOUT_SECONDS", "25"))
 #: e5 would change every embedding for no reason.
 QUERY_TASK = "Given a search query, retrieve relevant passages from a document collection"
 
+#: Query embeddings kept in memory, keyed by exactly what was sent. 0 disables the cache.
+#: An agent re-runs the same query across collections and follow-up turns, and each repeat
+#: otherwise costs a GPU forward pass on the search's critical path.
+QUERY_CACHE_SIZE = int(os.getenv("EMBED_QUERY_CACHE_SIZE", "1024"))
+
+#: How long the first query of a batch waits for concurrent ones to share its request.
+#: 0, the default, sends every query alone: with one agent searching there is nothing to
+#: coalesce and any window is pure added latency. Worth a few ms once many sessions search
+#: at once — the GPU embeds a batch of queries in about the time it embeds one.
+QUERY_BATCH_WINDOW_MS = float(os.getenv("EMBED_QUERY_BATCH_WINDOW_MS", "0"))
+QUERY_BATCH_MAX = max(1, int(os.getenv("EMBED_QUERY_BATCH_MAX", "32")))
+
 
 class EmbeddingUnavailable(RuntimeError):
     """The embeddings endpoint is unset or did not answer a query embedding."""
 
 
+#: Same breaker as rerank's (connect failures only, time-boxed), its own instance. With a
+#: dead GPU host every search otherwise paid the full connect timeout here before falling
+#: back to keyword-only — the breaker makes that one timeout per break window.
+_BREAKER = Breaker()
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+# Exact-match only: a "near-duplicate" query is a different query, and handing it another
+# query's vector would change its results without any trace. The key carries the model id,
+# so a model change after a re-probe can never be answered from the old model's vectors.
+_query_cache: OrderedDict[tuple[str, str, str | None], tuple[float, ...]] = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+# Cache misses being embedded right now, by the same key. A second caller asking for a
+# query already in flight waits for that request instead of sending its own: an agent
+# fanning one query out across collections otherwise missed the cache once per branch.
+_query_inflight: dict[tuple[str, str, str | None], Future] = {}
+
+
+def _session():
+    """One keep-alive session for every query embedding in the process.
+
+    A search embeds its query on the critical path, so a fresh connection per call put a
+    TCP handshake in front of every search. No adapter retries: a failed call falls back
+    to keyword search at once, which is the better answer than a slower vector.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
 def endpoint() -> str:
     """Base URL of the embeddings service (carries the `/v1` suffix), or empty."""
     return (os.getenv("EMBEDDINGS_URL") or "").rstrip("/")
 
 
+def breaker_state() -> dict[str, dict]:
+    return _BREAKER.state()
+
+
 def embedding_input(model_id: str, kind: str, text: str) -> tuple[str, str | None]:
     """Turn `text` into what the embeddings endpoint should receive.
 
@@ -88,26 +152,72 @@ def embed_query(query: str, model_id: str) -> list[float]:
     produced — the caller falls back to keyword-only search and says so, rather than
     silently returning a keyword result set it presents as fused.
     """
-    import requests
-
     url = endpoint()
     if not url:
         raise EmbeddingUnavailable("EMBEDDINGS_URL is not configured")
 
     text, task_description = embedding_input(model_id, "query", query)
-    payload: dict = {"input": text}
+    key = (model_id, text, task_description)
+    with _query_cache_lock:
+        cached = _query_cache.get(key)
+        if cached is not None:
+            _query_cache.move_to_end(key)
+        else:
+            inflight = _query_inflight.get(key)
+            if inflight is None:
+                _query_inflight[key] = Future()
+    if cached is not None:
+        log.info("embed_query served %d chars from cache", len(query))
+        return list(cached)
+    if inflight is not None:
+        log.info("embed_query joined an in-flight request for %d chars", len(query))
+        return list(inflight.result())
+
+    try:
+        if _BREAKER.is_open(url):
+            raise EmbeddingUnavailable(f"embeddings endpoint {url} circuit is open")
+
+        if QUERY_BATCH_WINDOW_MS > 0:
+            embedding = _batcher().submit(url, model_id, text, task_description)
+        else:
+            (embedding,) = _embed_texts(url, model_id, [text], task_description)
+    except BaseException as exc:
+        with _query_cache_lock:
+            _query_inflight.pop(key).set_exception(exc)
+        raise
+
+    with _query_cache_lock:
+        if QUERY_CACHE_SIZE > 0:
+            _query_cache[key] = tuple(embedding)
+            _query_cache.move_to_end(key)
+            while len(_query_cache) > QUERY_CACHE_SIZE:
+                _query_cache.popitem(last=False)
+        _query_inflight.pop(key).set_result(tuple(embedding))
+    return embedding
+
+
+def _embed_texts(url: str, model_id: str, texts: list[str],
+                 task_description: str | None) -> list[list[float]]:
+    """One POST for `texts` (one model, one task description); vectors in input order."""
+    import requests
+
+    payload: dict = {"input": texts[0] if len(texts) == 1 else texts}
     if task_description:
         payload["task_description"] = task_description
 
     started = time.monotonic()
     try:
-        response = requests.post(
+        response = _session().post(
             f"{url}/embeddings",
             json=payload,
             timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
         )
     except requests.exceptions.RequestException as exc:
         elapsed = (time.monotonic() - started) * 1000.0
+        # Only connect failures count (ConnectTimeout is one): a read timeout means the
+        # host is up and the model is slow, which the breaker must not call unreachable.
+        if isinstance(exc, requests.exceptions.ConnectionError) and _BREAKER.record_failure(url):
+            log.warning("embeddings circuit opened for %s", url)
         log.warning("embed_query failed after %.0fms: %s", elapsed, exc)
         telemetry.record_async(
             "embeddings", provider=url, latency_ms=elapsed, ok=False,
@@ -115,6 +225,7 @@ def embed_query(query: str, model_id: str) -> list[float]:
         )
         raise EmbeddingUnavailable(f"embeddings endpoint {url} failed: {exc}") from exc
 
+    _BREAKER.record_success(url)
     elapsed_ms = (time.monotonic() - started) * 1000.0
     # Recorded on every outcome, not only the good one. `/admin/ai_status` reads this
     # table; a capability that writes rows only when it works renders as "no traffic"
@@ -130,7 +241,9 @@ def embed_query(query: str, model_id: str) -> list[float]:
 
     try:
         data = response.json()
-        embedding = [float(v) for v in data["data"][0]["embedding"]]
+        by_index = {int(item.get("index", i)): item["embedding"]
+                    for i, item in enumerate(data["data"])}
+        embeddings = [[float(v) for v in by_index[i]] for i in range(len(texts))]
     except (ValueError, KeyError, IndexError, TypeError) as exc:
         raise EmbeddingUnavailable(f"embeddings returned unparseable JSON: {exc}") from exc
 
@@ -143,5 +256,66 @@ def embed_query(query: str, model_id: str) -> list[float]:
             f"serving model {served_model!r} != probed {model_id!r}; "
             "run `main.py probe-embeddings`"
         )
-    log.info("embed_query embedded %d chars in %.0fms", len(query), elapsed_ms)
-    return embedding
+    log.info("embed_query embedded %d queries in %.0fms", len(texts), elapsed_ms)
+    return embeddings
+
+
+class _QueryBatcher:
+    """Coalesces concurrent query embeddings into one request per window.
+
+    One daemon thread drains the queue: the first query opens a window of
+    `QUERY_BATCH_WINDOW_MS`, everything that arrives inside it (up to `QUERY_BATCH_MAX`)
+    shares its request, and each caller blocks on its own future. Queries that arrive
+    while a request is in flight form the next batch. A failed request fails every query
+    in it with the same `EmbeddingUnavailable`, exactly as if each had been sent alone.
+    """
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue = queue.Queue()
+        threading.Thread(target=self._run, name="embed-query-batcher", daemon=True).start()
+
+    def submit(self, url: str, model_id: str, text: str,
+               task_description: str | None) -> list[float]:
+        future: Future = Future()
+        self._queue.put(((url, model_id, task_description), text, future))
+        return future.result()
+
+    def _run(self) -> None:
+        while True:
+            pending = [self._queue.get()]
+            deadline = time.monotonic() + QUERY_BATCH_WINDOW_MS / 1000.0
+            while len(pending) < QUERY_BATCH_MAX:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            groups: dict[tuple, list[tuple[str, Future]]] = {}
+            for group, text, future in pending:
+                groups.setdefault(group, []).append((text, future))
+            for (url, model_id, task_description), items in groups.items():
+                texts = list(dict.fromkeys(text for text, _ in items))
+                try:
+                    vectors = _embed_texts(url, model_id, texts, task_description)
+                except Exception as exc:  # noqa: BLE001 - handed to every waiting caller
+                    for _, future in items:
+                        future.set_exception(exc)
+                    continue
+                by_text = dict(zip(texts, vectors))
+                for text, future in items:
+                    future.set_result(list(by_text[text]))
+
+
+_BATCHER: _QueryBatcher | None = None
+_BATCHER_LOCK = threading.Lock()
+
+
+def _batcher() -> _QueryBatcher:
+    global _BATCHER
+    with _BATCHER_LOCK:
+        if _BATCHER is None:
+            _BATCHER = _QueryBatcher()
+        return _BATCHER
@@ -14,19 +14,23 @@ This module is the single implementation of two things every search surface need
 
 `SearchResult` is the web-search payload shape; :func:`fuse_ranked_lists` is the generic
 half for callers whose items are not URLs (collection search fuses `(dataset, document,
-page)` keys, where `normalise_url` would be nonsense).
+page)` keys, where `normalise_url` would be nonsense). :func:`fuse_scored_lists` is
+the convex-combination alternative for callers whose sources carry real scores.
 """
 
 from __future__ import annotations
 
+import heapq
 import os
 from dataclasses import dataclass, field
+from operator import attrgetter
 from typing import Callable, Hashable, Iterable, TypeVar
 from urllib.parse import parse_qs, urlparse, urlunparse
 
 #: RRF constant. 60 is the value from the original Cormack et al. paper; it damps the
 #: difference between ranks 1 and 2 so agreement across sources matters more than one
-#: source's confidence.
+#: source's confidence. The default for both fusions; a caller with its own knob passes
+#: `k=` rather than inheriting metasearch's.
 RRF_K = int(os.getenv("METASEARCH_RRF_K", "60"))
 
 #: Tracking parameters stripped before two URLs are compared. Without this the same page
@@ -107,10 +111,27 @@ def dedupe_within_source(results: list[SearchResult]) -> list[SearchResult]:
     return out
 
 
+_score = attrgetter("score")
+
+
+def _best_first(merged: list, max_results: int | None) -> list:
+    """The `max_results` highest-scoring of `merged`, best first; ties keep merge order.
+
+    Every fusion merges far more than it keeps — collection search fuses one full
+    candidate pool per shard plus the KNN pool into `FUSION_CANDIDATES` — so sorting the
+    whole merge to slice off its head paid n log n for a k-item answer. `heapq.nlargest`
+    is documented as equal to that sort-and-slice, ties included.
+    """
+    if max_results is None or not 0 <= max_results < len(merged):
+        merged.sort(key=_score, reverse=True)
+        return merged[:max_results]
+    return heapq.nlargest(max_results, merged, key=_score)
+
+
 def reciprocal_rank_fusion(
-    per_engine: dict[str, list[SearchResult]], max_results: int
+    per_engine: dict[str, list[SearchResult]], max_results: int, k: int = RRF_K
 ) -> list[SearchResult]:
-    """Merge per-engine rankings: `score = sum over engines of 1 / (RRF_K + rank)`.
+    """Merge per-engine rankings: `score = sum over engines of 1 / (k + rank)`.
 
     Rank is 1-based. A URL two engines both put at rank 3 scores higher than one a single
     engine put at rank 1, which is the property that makes a metasearch worth running.
@@ -147,10 +168,9 @@ def reciprocal_rank_fusion(
                 existing.kind = result.kind
             existing.engines.append(engine)
             existing.source_ranks[engine] = rank
-            existing.score += 1.0 / (RRF_K + rank)
+            existing.score += 1.0 / (k + rank)
 
-    ordered = sorted(merged.values(), key=lambda r: r.score, reverse=True)
-    return ordered[:max_results]
+    return _best_first(list(merged.values()), max_results)
 
 
 T = TypeVar("T")
@@ -176,8 +196,9 @@ def fuse_ranked_lists(
     per_source: dict[str, list[T]],
     key_of: Callable[[T], Hashable],
     max_results: int | None = None,
+    k: int = RRF_K,
 ) -> list[FusedItem]:
-    """RRF over arbitrary ranked lists. `score = sum over sources of 1 / (RRF_K + rank)`.
+    """RRF over arbitrary ranked lists. `score = sum over sources of 1 / (k + rank)`.
 
     Each source's list is deduplicated on `key_of` first (same rule as
     :func:`dedupe_within_source`): one source contributes at most one rank per key.
@@ -200,10 +221,60 @@ def fuse_ranked_lists(
                 existing = FusedItem(item=item, key=key)
                 merged[key] = existing
             existing.source_ranks[source] = rank
-            existing.score += 1.0 / (RRF_K + rank)
+            existing.score += 1.0 / (k + rank)
+
+    return _best_first(list(merged.values()), max_results)
+
+
+def fuse_scored_lists(
+    per_source: dict[str, list[tuple[T, float]]],
+    key_of: Callable[[T], Hashable],
+    weights: dict[str, float],
+    max_results: int | None = None,
+) -> list[FusedItem]:
+    """Convex-combination fusion: `score = sum over sources of w * minmax(score)`.
+
+    Each source's list is `(item, score)` pairs, best first, higher score better. Scores
+    are min-max normalised within their own source — BM25 and cosine similarity live on
+    unrelated scales, and an unnormalised sum is just the larger scale winning — and the
+    weights are normalised to sum to 1, so `{"keyword": 3, "vector": 1}` means 0.75/0.25.
+    A source missing from `weights` contributes nothing; a source whose scores are all
+    equal gives every item full marks, because it has expressed no preference.
+
+    Unlike RRF this uses the score gaps, not just the order, which is why it wins when
+    tuned (Bruch et al.) and loses when the weights are wrong. Dedup, payload and
+    `source_ranks` bookkeeping follow :func:`fuse_ranked_lists`.
+    """
+    if any(w < 0 for w in weights.values()):
+        raise ValueError("fusion weights must not be negative")
+    total = sum(weights.get(source, 0.0) for source in per_source)
+    if per_source and total <= 0:
+        raise ValueError("fusion weights must not all be zero")
+
+    merged: dict[Hashable, FusedItem] = {}
+    for source, pairs in per_source.items():
+        weight = weights.get(source, 0.0) / total
+        seen: set[Hashable] = set()
+        ranked: list[tuple[Hashable, T, float]] = []
+        for item, score in pairs:
+            key = key_of(item)
+            if key in seen:
+                continue
+            seen.add(key)
+            ranked.append((key, item, score))
+        if not ranked:
+            continue
+        low = min(score for _, _, score in ranked)
+        span = max(score for _, _, score in ranked) - low
+        for rank, (key, item, score) in enumerate(ranked, start=1):
+            existing = merged.get(key)
+            if existing is None:
+                existing = FusedItem(item=item, key=key)
+                merged[key] = existing
+            existing.source_ranks[source] = rank
+            existing.score += weight * ((score - low) / span if span > 0 else 1.0)
 
-    ordered = sorted(merged.values(), key=lambda f: f.score, reverse=True)
-    return ordered[:max_results] if max_results is not None else ordered
+    return _best_first(list(merged.values()), max_results)
 
 
 def per_kind_floor(
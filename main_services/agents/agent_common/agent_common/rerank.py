@@ -13,19 +13,26 @@ Two rules the plan states explicitly and that read identically to their wrong ve
   the reranked order is the RRF order.
 * Latency is logged on **every** call, successful or not.
 
+`rerank` blocks; `arerank` is the same call for coroutines, on native async HTTP.
+
 The breaker only counts *connect* failures. A model that returns a 500 is a different
 problem and must stay visible on every call rather than being hidden behind a breaker.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 import threading
 import time
+import weakref
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass
 
 from agent_common import telemetry
+from agent_common.breaker import CIRCUIT_BREAK_SECONDS, Breaker
 
 log = logging.getLogger(__name__)
 
@@ -36,65 +43,22 @@ CONNECT_TIMEOUT = float(os.getenv("GPU_CONNECT_TIMEOUT_MS", "2000")) / 1000.0
 #: Hard cap on one rerank call. A timeout is an error (module docstring).
 READ_TIMEOUT = float(os.getenv("RERANK_TIMEOUT_SECONDS", "25"))
 
-CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("REMOTE_CIRCUIT_FAILURES", "3"))
-CIRCUIT_BREAK_SECONDS = float(os.getenv("GPU_CIRCUIT_BREAK_SECONDS", "60"))
-
 #: The cross-encoder truncates anyway; sending 20 kB of page text per candidate just
 #: costs transfer time. A title plus a snippet is what the model scores on.
 DOC_CHARS = int(os.getenv("RERANK_DOC_CHARS", "1200"))
 
+#: Rankings kept in memory, keyed by a digest of exactly what would be sent. 0 disables
+#: the cache. Paging through a result set, an agent's retry, a follow-up turn that re-asks
+#: the question: each repeat otherwise costs a cross-encoder pass over every candidate,
+#: the single most expensive step of a search.
+CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "256"))
+
 
 class RerankUnavailable(RuntimeError):
     """The rerank endpoint is unset, breaker-open, or did not answer in time."""
 
 
-@dataclass
-class _Circuit:
-    consecutive_failures: int = 0
-    open_until: float = 0.0
-
-
-class _Breaker:
-    """Per-endpoint circuit state, shared across this process's threads."""
-
-    def __init__(self) -> None:
-        self._lock = threading.Lock()
-        self._circuits: dict[str, _Circuit] = {}
-
-    def is_open(self, url: str) -> bool:
-        with self._lock:
-            c = self._circuits.get(url)
-            return bool(c and c.open_until > time.monotonic())
-
-    def record_failure(self, url: str) -> bool:
-        """Count a connect failure; returns True if that tripped the breaker."""
-        with self._lock:
-            c = self._circuits.setdefault(url, _Circuit())
-            c.consecutive_failures += 1
-            if c.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
-                c.open_until = time.monotonic() + CIRCUIT_BREAK_SECONDS
-                c.consecutive_failures = 0
-                return True
-            return False
-
-    def record_success(self, url: str) -> None:
-        with self._lock:
-            self._circuits.pop(url, None)
-
-    def state(self) -> dict[str, dict]:
-        """Snapshot for a `/health` endpoint."""
-        now = time.monotonic()
-        with self._lock:
-            return {
-                url: {
-                    "consecutive_failures": c.consecutive_failures,
-                    "open_for_seconds": round(max(0.0, c.open_until - now), 1),
-                }
-                for url, c in self._circuits.items()
-            }
-
-
-_BREAKER = _Breaker()
+_BREAKER = Breaker()
 
 
 def endpoint() -> str:
@@ -115,7 +79,7 @@ def breaker_state() -> dict[str, dict]:
     return _BREAKER.state()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RerankScore:
     """One document's place in the reranked order."""
 
@@ -123,68 +87,124 @@ class RerankScore:
     score: float
 
 
-def rerank(query: str, documents: list[str], model: str | None = None) -> tuple[list[RerankScore], float]:
-    """Score `documents` against `query`, best first.
+def _prepare(query: str, documents: list[str], model: str | None) -> tuple[str, dict, list[int]]:
+    """The endpoint, request body and slot map for one call, or RerankUnavailable.
 
-    Returns `(scores, elapsed_ms)`. `scores[i].index` points back into `documents`.
-    Raises :class:`RerankUnavailable` on anything that stops a real ranking being
-    produced — an empty list would be indistinguishable from "everything scored zero".
+    Identical documents are sent once: `slots[i]` is where `documents[i]` went in the
+    request. Candidates keyed by page or URL still repeat their text — a mirrored
+    article, a letterhead page, an empty snippet — and the cross-encoder scored every
+    copy. :func:`_fan_out` gives each copy its text's score back.
     """
-    import requests
-
     url = endpoint()
     if not url:
         raise RerankUnavailable("RERANK_URL is not configured")
     if _BREAKER.is_open(url):
         raise RerankUnavailable(f"rerank endpoint {url} circuit is open")
-    if not documents:
-        return [], 0.0
-
-    payload = {
-        "query": query,
-        "documents": [(d or "")[:DOC_CHARS] for d in documents],
-    }
+    slot_of: dict[str, int] = {}
+    slots = [slot_of.setdefault((d or "")[:DOC_CHARS], len(slot_of)) for d in documents]
+    payload = {"query": query, "documents": list(slot_of)}
     if model:
         payload["model"] = model
-
-    started = time.monotonic()
-    try:
-        response = requests.post(
-            f"{url}/rerank",
-            json=payload,
-            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
-        )
-    except requests.exceptions.ConnectTimeout as exc:
-        elapsed = (time.monotonic() - started) * 1000.0
-        if _BREAKER.record_failure(url):
-            log.warning("rerank circuit opened for %s for %.0fs", url, CIRCUIT_BREAK_SECONDS)
-        log.warning("rerank connect failed after %.0fms: %s", elapsed, exc)
-        telemetry.record_async("rerank", provider=url, latency_ms=elapsed, ok=False,
-                               detail="connect timeout")
-        raise RerankUnavailable(f"rerank endpoint {url} unreachable: {exc}") from exc
-    except requests.exceptions.ConnectionError as exc:
-        elapsed = (time.monotonic() - started) * 1000.0
-        if _BREAKER.record_failure(url):
-            log.warning("rerank circuit opened for %s for %.0fs", url, CIRCUIT_BREAK_SECONDS)
-        log.warning("rerank connection error after %.0fms: %s", elapsed, exc)
-        telemetry.record_async("rerank", provider=url, latency_ms=elapsed, ok=False,
-                               detail="connection error")
-        raise RerankUnavailable(f"rerank endpoint {url} unreachable: {exc}") from exc
-    except requests.exceptions.ReadTimeout as exc:
-        elapsed = (time.monotonic() - started) * 1000.0
-        # Deliberately NOT a breaker failure: the host answered, it was just slow, and
-        # skipping it for a minute would hide a model that needs replacing.
-        log.warning("rerank timed out after %.0fms (cap %.0fs)", elapsed, READ_TIMEOUT)
-        telemetry.record_async("rerank", provider=url, latency_ms=elapsed, ok=False,
-                               detail=f"read timeout ({READ_TIMEOUT:g}s)")
-        raise RerankUnavailable(f"rerank timed out after {READ_TIMEOUT:g}s") from exc
-
+    return url, payload, slots
+
+
+def _fan_out(scores: list[RerankScore], slots: list[int]) -> list[RerankScore]:
+    """Scores over the sent documents, turned back into scores over the caller's list."""
+    if len(slots) == len(set(slots)):
+        return scores  # nothing was merged, so the indices already line up
+    by_slot: dict[int, float] = {}
+    for s in scores:
+        by_slot.setdefault(s.index, s.score)
+    fanned = [
+        RerankScore(index=i, score=by_slot[slot])
+        for i, slot in enumerate(slots)
+        if slot in by_slot
+    ]
+    fanned.sort(key=lambda s: s.score, reverse=True)
+    return fanned
+
+
+# Keyed by a 16-byte digest rather than the request itself: one entry would otherwise pin
+# up to DOC_CHARS of text per candidate. Exact-match only, like embeddings' query cache —
+# a different candidate set is a different ranking.
+_cache: OrderedDict[bytes, tuple[RerankScore, ...]] = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_hits = 0
+_cache_misses = 0
+
+
+def _cache_key(url: str, payload: dict, slots: list[int]) -> bytes | None:
+    """Digest of one prepared request and its slot map, or None when caching is off."""
+    if CACHE_SIZE <= 0:
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    for part in (url, payload.get("model") or "", payload["query"], *payload["documents"]):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    h.update(array("I", slots).tobytes())
+    return h.digest()
+
+
+def _cached(key: bytes | None) -> list[RerankScore] | None:
+    global _cache_hits, _cache_misses
+    if key is None:
+        return None
+    with _cache_lock:
+        scores = _cache.get(key)
+        if scores is None:
+            _cache_misses += 1
+            return None
+        _cache.move_to_end(key)
+        _cache_hits += 1
+    log.info("rerank served %d documents from cache", len(scores))
+    return list(scores)
+
+
+def _remember(key: bytes | None, scores: list[RerankScore]) -> None:
+    if key is None:
+        return
+    with _cache_lock:
+        _cache[key] = tuple(scores)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def cache_stats() -> dict[str, int]:
+    """Hit and miss counts since start, and the entries held — for a `/health` endpoint."""
+    with _cache_lock:
+        return {"hits": _cache_hits, "misses": _cache_misses, "entries": len(_cache)}
+
+
+def _unreachable(url: str, started: float, exc: Exception, detail: str) -> RerankUnavailable:
+    """Count a connect failure against the breaker and build the error to raise."""
+    elapsed = (time.monotonic() - started) * 1000.0
+    if _BREAKER.record_failure(url):
+        log.warning("rerank circuit opened for %s for %.0fs", url, CIRCUIT_BREAK_SECONDS)
+    log.warning("rerank %s after %.0fms: %s", detail, elapsed, exc)
+    telemetry.record_async("rerank", provider=url, latency_ms=elapsed, ok=False, detail=detail)
+    return RerankUnavailable(f"rerank endpoint {url} unreachable: {exc}")
+
+
+def _timed_out(url: str, started: float) -> RerankUnavailable:
+    # Deliberately NOT a breaker failure: the host answered, it was just slow, and
+    # skipping it for a minute would hide a model that needs replacing.
+    elapsed = (time.monotonic() - started) * 1000.0
+    log.warning("rerank timed out after %.0fms (cap %.0fs)", elapsed, READ_TIMEOUT)
+    telemetry.record_async("rerank", provider=url, latency_ms=elapsed, ok=False,
+                           detail=f"read timeout ({READ_TIMEOUT:g}s)")
+    return RerankUnavailable(f"rerank timed out after {READ_TIMEOUT:g}s")
+
+
+def _scores(url: str, response, started: float, model: str | None,
+            n_documents: int) -> tuple[list[RerankScore], float]:
+    """Turn an answered request into the ranking. Works on requests and httpx responses."""
     elapsed_ms = (time.monotonic() - started) * 1000.0
     # Every outcome, not just the good one — see `telemetry`. A capability that only
     # writes rows when it works reads as idle exactly while it is broken.
     telemetry.record_async(
         "rerank", provider=url, latency_ms=elapsed_ms, ok=response.status_code == 200,
-        detail=(model or f"{len(documents)} documents")
+        detail=(model or f"{n_documents} documents")
         if response.status_code == 200 else f"HTTP {response.status_code}",
     )
     if response.status_code != 200:
@@ -210,3 +230,129 @@ def rerank(query: str, documents: list[str], model: str | None = None) -> tuple[
     scores.sort(key=lambda s: s.score, reverse=True)
     log.info("rerank scored %d documents in %.0fms", len(scores), elapsed_ms)
     return scores, elapsed_ms
+
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _session():
+    """One keep-alive session for every synchronous rerank in the process (the async path
+    has its own clients, below). Same shape as `embeddings._session`: no adapter
+    retries, a failure degrades to the fused order at once."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def rerank(query: str, documents: list[str], model: str | None = None) -> tuple[list[RerankScore], float]:
+    """Score `documents` against `query`, best first.
+
+    Returns `(scores, elapsed_ms)`. `scores[i].index` points back into `documents`.
+    Raises :class:`RerankUnavailable` on anything that stops a real ranking being
+    produced — an empty list would be indistinguishable from "everything scored zero".
+    """
+    import requests
+
+    url, payload, slots = _prepare(query, documents, model)
+    if not documents:
+        return [], 0.0
+    key = _cache_key(url, payload, slots)
+    cached = _cached(key)
+    if cached is not None:
+        return cached, 0.0
+
+    started = time.monotonic()
+    try:
+        response = _session().post(
+            f"{url}/rerank",
+            json=payload,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+        )
+    except requests.exceptions.ConnectTimeout as exc:
+        raise _unreachable(url, started, exc, "connect timeout") from exc
+    except requests.exceptions.ConnectionError as exc:
+        raise _unreachable(url, started, exc, "connection error") from exc
+    except requests.exceptions.ReadTimeout as exc:
+        raise _timed_out(url, started) from exc
+    scores, elapsed_ms = _scores(url, response, started, model, len(payload["documents"]))
+    scores = _fan_out(scores, slots)
+    _remember(key, scores)
+    return scores, elapsed_ms
+
+
+# Keyed by the loop object, weakly: an `id()` is reused once a loop is collected, and a
+# new loop must never be handed a client whose connections belong to a dead one.
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+
+def _async_client():
+    """One pooled ``httpx.AsyncClient`` per event loop.
+
+    An AsyncClient's connections belong to the loop that opened them, so the client is
+    keyed by loop rather than shared module-wide; a server runs one loop for its life.
+    Clients of loops that have since closed (every ``asyncio.run`` in a script or test)
+    are dropped here — their sockets hold the loop, so a weak key alone never frees them.
+    """
+    import asyncio
+
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        for stale in [other for other in list(_async_clients) if other.is_closed()]:
+            _async_clients.pop(stale, None)
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT))
+            _async_clients[loop] = client
+    return client
+
+
+async def arerank(
+    query: str, documents: list[str], model: str | None = None,
+) -> tuple[list[RerankScore], float]:
+    """:func:`rerank` for async callers, on native async HTTP.
+
+    Calling the blocking :func:`rerank` from a coroutine stalls the whole event loop —
+    every other request the server is handling — for up to :data:`READ_TIMEOUT`.
+    Same contract, same breaker, same telemetry.
+    """
+    import httpx
+
+    url, payload, slots = _prepare(query, documents, model)
+    if not documents:
+        return [], 0.0
+    key = _cache_key(url, payload, slots)
+    cached = _cached(key)
+    if cached is not None:
+        return cached, 0.0
+
+    started = time.monotonic()
+    try:
+        response = await _async_client().post(f"{url}/rerank", json=payload)
+    except httpx.ConnectTimeout as exc:
+        raise _unreachable(url, started, exc, "connect timeout") from exc
+    except httpx.ConnectError as exc:
+        raise _unreachable(url, started, exc, "connection error") from exc
+    except httpx.TimeoutException as exc:
+        raise _timed_out(url, started) from exc
+    except httpx.TransportError as exc:
+        # A dropped or reset connection (ReadError, WriteError, RemoteProtocolError — a
+        # stale keep-alive the server closed, say): what requests' ConnectionError covers
+        # on the sync path, so the same breaker count and telemetry row.
+        raise _unreachable(url, started, exc, "connection error") from exc
+    scores, elapsed_ms = _scores(url, response, started, model, len(payload["documents"]))
+    scores = _fan_out(scores, slots)
+    _remember(key, scores)
+    return scores, elapsed_ms
@@ -1,5 +1,7 @@
 """Tests for the query-side embedding contract (agent_common.embeddings)."""
 
+import time
+
 import pytest
 
 from agent_common.embeddings import embedding_input
@@ -41,3 +43,179 @@ class TestEmbeddingInput:
                     assert task is not None
                 else:
                     assert task is None
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, model, vector):
+        self._payload = {"model": model, "data": [{"index": 0, "embedding": vector}]}
+
+    def json(self):
+        return self._payload
+
+
+class TestEmbedQueryCache:
+    MODEL = "intfloat/multilingual-e5-small"
+
+    @pytest.fixture(autouse=True)
+    def _server(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from agent_common import embeddings, telemetry
+
+        self.sent = []
+        self.serving = self.MODEL
+
+        def post(url, json=None, **kwargs):
+            self.sent.append(json["input"])
+            return _Response(self.serving, [float(len(self.sent)), 0.0])
+
+        monkeypatch.setenv("EMBEDDINGS_URL", "http://gpu.test/v1")
+        monkeypatch.setattr(embeddings, "_session", lambda: SimpleNamespace(post=post))
+        monkeypatch.setattr(telemetry, "record_async", lambda *a, **kw: None)
+        monkeypatch.setattr(embeddings, "_query_cache", type(embeddings._query_cache)())
+        self.embeddings = embeddings
+
+    def test_repeat_query_is_not_re_embedded(self):
+        first = self.embeddings.embed_query("water", self.MODEL)
+        first.append(99.0)  # a caller mutating its result must not poison the cache
+        assert self.embeddings.embed_query("water", self.MODEL) == [1.0, 0.0]
+        assert self.sent == ["query: water"]
+
+    def test_key_is_exact_and_carries_the_model(self):
+        self.embeddings.embed_query("water", self.MODEL)
+        self.embeddings.embed_query("water ", self.MODEL)
+        self.serving = "intfloat/multilingual-e5-large-instruct"
+        self.embeddings.embed_query("water", self.serving)
+        assert len(self.sent) == 3
+
+    def test_least_recently_used_entry_is_evicted(self, monkeypatch):
+        monkeypatch.setattr(self.embeddings, "QUERY_CACHE_SIZE", 2)
+        for q in ("a", "b", "a", "c", "a", "b"):
+            self.embeddings.embed_query(q, self.MODEL)
+        assert self.sent == ["query: a", "query: b", "query: c", "query: b"]
+
+    def test_a_query_in_flight_is_waited_for_not_sent_again(self, monkeypatch):
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from types import SimpleNamespace
+
+        entered, release = threading.Event(), threading.Event()
+
+        def slow_post(url, json=None, **kwargs):
+            self.sent.append(json["input"])
+            entered.set()
+            release.wait(5)
+            return _Response(self.serving, [1.0, 0.0])
+
+        monkeypatch.setattr(self.embeddings, "_session", lambda: SimpleNamespace(post=slow_post))
+        with ThreadPoolExecutor(2) as pool:
+            first = pool.submit(self.embeddings.embed_query, "water", self.MODEL)
+            assert entered.wait(5)
+            second = pool.submit(self.embeddings.embed_query, "water", self.MODEL)
+            time.sleep(0.05)  # let the second caller reach the in-flight request
+            release.set()
+            assert first.result() == second.result() == [1.0, 0.0]
+        assert self.sent == ["query: water"]
+        assert not self.embeddings._query_inflight
+
+
+class TestEmbedQueryBreaker:
+    """A dead GPU host used to cost every search the full connect timeout."""
+
+    @pytest.fixture(autouse=True)
+    def _server(self, monkeypatch):
+        import requests
+        from types import SimpleNamespace
+
+        from agent_common import breaker, embeddings, telemetry
+
+        self.calls = 0
+        self.error = requests.exceptions.ConnectTimeout("connect timed out")
+
+        def post(url, json=None, **kwargs):
+            self.calls += 1
+            raise self.error
+
+        monkeypatch.setenv("EMBEDDINGS_URL", "http://gpu.test/v1")
+        monkeypatch.setattr(embeddings, "_session", lambda: SimpleNamespace(post=post))
+        monkeypatch.setattr(telemetry, "record_async", lambda *a, **kw: None)
+        monkeypatch.setattr(embeddings, "_query_cache", type(embeddings._query_cache)())
+        monkeypatch.setattr(embeddings, "_BREAKER", breaker.Breaker())
+        self.embeddings = embeddings
+        self.threshold = breaker.CIRCUIT_FAILURE_THRESHOLD
+
+    def _fail(self, n):
+        for i in range(n):
+            with pytest.raises(self.embeddings.EmbeddingUnavailable):
+                self.embeddings.embed_query(f"q{i}", "intfloat/multilingual-e5-small")
+
+    def test_connect_failures_open_the_circuit(self):
+        self._fail(self.threshold)
+        assert self.calls == self.threshold
+        self._fail(1)
+        assert self.calls == self.threshold  # fast-failed without a request
+        assert self.embeddings.breaker_state()["http://gpu.test/v1"]["open_for_seconds"] > 0
+
+    def test_read_timeout_does_not_count(self):
+        import requests
+
+        self.error = requests.exceptions.ReadTimeout("slow model")
+        self._fail(self.threshold + 1)
+        assert self.calls == self.threshold + 1
+
+
+class TestEmbedQueryBatching:
+    """With a window set, concurrent searches share one embeddings request."""
+
+    MODEL = "intfloat/multilingual-e5-small"
+
+    @pytest.fixture(autouse=True)
+    def _server(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from agent_common import breaker, embeddings, telemetry
+
+        self.sent = []
+
+        def post(url, json=None, **kwargs):
+            texts = json["input"] if isinstance(json["input"], list) else [json["input"]]
+            self.sent.append(texts)
+            response = _Response(self.MODEL, [])
+            response._payload["data"] = [
+                {"index": i, "embedding": [float(len(t)), 0.0]} for i, t in enumerate(texts)
+            ][::-1]  # out of order on purpose: the index decides, not the position
+            return response
+
+        monkeypatch.setenv("EMBEDDINGS_URL", "http://gpu.test/v1")
+        monkeypatch.setattr(embeddings, "_session", lambda: SimpleNamespace(post=post))
+        monkeypatch.setattr(telemetry, "record_async", lambda *a, **kw: None)
+        monkeypatch.setattr(embeddings, "_query_cache", type(embeddings._query_cache)())
+        monkeypatch.setattr(embeddings, "_BREAKER", breaker.Breaker())
+        monkeypatch.setattr(embeddings, "_BATCHER", None)
+        monkeypatch.setattr(embeddings, "QUERY_BATCH_WINDOW_MS", 200.0)
+        self.embeddings = embeddings
+
+    def test_concurrent_queries_share_one_request(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        queries = ["a", "bb", "ccc", "bb"]
+        with ThreadPoolExecutor(len(queries)) as pool:
+            vectors = list(pool.map(lambda q: self.embeddings.embed_query(q, self.MODEL), queries))
+
+        assert len(self.sent) == 1
+        assert sorted(self.sent[0]) == ["query: a", "query: bb", "query: ccc"]
+        assert vectors == [[float(len("query: " + q)), 0.0] for q in queries]
+
+    def test_a_failed_batch_fails_every_caller(self, monkeypatch):
+        from types import SimpleNamespace
+
+        import requests
+
+        def refuse(url, json=None, **kwargs):
+            raise requests.exceptions.ConnectionError("refused")
+
+        monkeypatch.setattr(self.embeddings, "_session", lambda: SimpleNamespace(post=refuse))
+        with pytest.raises(self.embeddings.EmbeddingUnavailable):
+            self.embeddings.embed_query("water", self.MODEL)
@@ -1,10 +1,12 @@
-"""Tests for the shared fusion machinery: generic RRF and the per-kind floor."""
+"""Tests for the shared fusion machinery: generic RRF, convex combination and the
+per-kind floor."""
 
 import pytest
 
 from agent_common.fusion import (
     SearchResult,
     fuse_ranked_lists,
+    fuse_scored_lists,
     normalise_url,
     per_kind_floor,
     reciprocal_rank_fusion,
@@ -48,6 +50,71 @@ class TestFuseRankedLists:
         fused = fuse_ranked_lists({"a": list(range(10))}, key_of=lambda x: x, max_results=3)
         assert len(fused) == 3
 
+    def test_a_capped_fusion_is_the_head_of_the_full_one(self):
+        """The capped path takes the top k without sorting everything; it must still be
+        exactly the head of the full order, ties in first-merged order included."""
+        per_source = {
+            "a": [f"a{i}" for i in range(40)] + [f"s{i}" for i in range(20)],
+            "b": [f"b{i}" for i in range(40)] + [f"s{i}" for i in range(20)],
+        }
+        full = fuse_ranked_lists(per_source, key_of=lambda x: x)
+        for cap in (1, 5, 37, 99):
+            capped = fuse_ranked_lists(per_source, key_of=lambda x: x, max_results=cap)
+            assert [f.key for f in capped] == [f.key for f in full[:cap]]
+
+    def test_k_is_the_callers(self):
+        fused = fuse_ranked_lists({"a": ["x"], "b": ["y", "x"]}, key_of=lambda x: x, k=10)
+        scores = {f.item: f.score for f in fused}
+        assert scores["x"] == pytest.approx(1 / 11 + 1 / 12)
+        assert scores["y"] == pytest.approx(1 / 11)
+
+
+class TestFuseScoredLists:
+    def test_scores_are_normalised_per_source_and_weights_sum_to_one(self):
+        # BM25 in the tens, cosine similarity under 1: without min-max the keyword
+        # scale alone would decide. Weights 3:1 mean 0.75/0.25.
+        fused = fuse_scored_lists(
+            {
+                "keyword": [("a", 30.0), ("b", 20.0), ("c", 10.0)],
+                "vector": [("c", 0.9), ("a", 0.5)],
+            },
+            key_of=lambda x: x,
+            weights={"keyword": 3, "vector": 1},
+        )
+        scores = {f.item: f.score for f in fused}
+        assert scores["a"] == pytest.approx(0.75 * 1.0 + 0.25 * 0.0)
+        assert scores["b"] == pytest.approx(0.75 * 0.5)
+        assert scores["c"] == pytest.approx(0.75 * 0.0 + 0.25 * 1.0)
+        assert fused[0].source_ranks == {"keyword": 1, "vector": 2}
+
+    def test_score_gaps_matter_where_rrf_sees_only_order(self):
+        # Keyword barely prefers y over x; vector rates x far above y. RRF ties them
+        # (each is 1st once and 2nd once), CC follows the confident source.
+        per_source = {
+            "keyword": [("y", 10.0), ("x", 9.9), ("z", 1.0)],
+            "vector": [("x", 0.95), ("y", 0.15), ("w", 0.10)],
+        }
+        fused = fuse_scored_lists(per_source, key_of=lambda x: x,
+                                  weights={"keyword": 1, "vector": 1})
+        assert fused[0].item == "x"
+
+    def test_a_source_with_no_preference_gives_full_marks(self):
+        fused = fuse_scored_lists({"a": [("x", 2.0), ("y", 2.0)]}, key_of=lambda x: x,
+                                  weights={"a": 1})
+        assert [f.score for f in fused] == [1.0, 1.0]
+
+    def test_within_source_dedupe_keeps_the_first_score(self):
+        fused = fuse_scored_lists({"a": [("x", 5.0), ("x", 1.0), ("y", 1.0)]},
+                                  key_of=lambda x: x, weights={"a": 1})
+        assert {f.item: f.score for f in fused} == {"x": 1.0, "y": 0.0}
+
+    def test_bad_weights_are_refused(self):
+        with pytest.raises(ValueError):
+            fuse_scored_lists({"a": [("x", 1.0)]}, key_of=lambda x: x, weights={"a": 0})
+        with pytest.raises(ValueError):
+            fuse_scored_lists({"a": [("x", 1.0)]}, key_of=lambda x: x,
+                              weights={"a": 1, "b": -1})
+
 
 class TestPerKindFloor:
     @staticmethod
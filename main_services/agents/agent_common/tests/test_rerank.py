@@ -0,0 +1,134 @@
+"""Tests for the async rerank path (agent_common.rerank.arerank).
+
+`arerank` exists because the metasearch pipeline is a coroutine: calling the blocking
+`rerank` from it stalled every other request on the server's event loop for the length
+of the call. It must keep the sync client's contract — the ranking, the breaker, the
+read-timeout-is-not-a-connect-failure rule — on top of native async HTTP.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+
+import httpx
+import pytest
+
+from agent_common import breaker, rerank, telemetry
+
+
+@pytest.fixture(autouse=True)
+def _endpoint(monkeypatch):
+    monkeypatch.setenv("RERANK_URL", "http://gpu.test/v1")
+    monkeypatch.setattr(telemetry, "record_async", lambda *a, **kw: None)
+    monkeypatch.setattr(rerank, "_BREAKER", breaker.Breaker())
+    monkeypatch.setattr(rerank, "_cache", OrderedDict())
+
+
+def _serve(monkeypatch, handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(rerank, "_async_client", lambda: client)
+
+
+def test_scores_come_back_best_first(monkeypatch):
+    def handler(request):
+        return httpx.Response(200, json={"data": [
+            {"index": 0, "relevance_score": 0.1},
+            {"index": 1, "relevance_score": 0.9},
+        ]})
+
+    _serve(monkeypatch, handler)
+    scores, _ = asyncio.run(rerank.arerank("q", ["a", "b"]))
+    assert [s.index for s in scores] == [1, 0]
+
+
+def test_connect_failures_open_the_breaker(monkeypatch):
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    _serve(monkeypatch, handler)
+    for _ in range(breaker.CIRCUIT_FAILURE_THRESHOLD):
+        with pytest.raises(rerank.RerankUnavailable):
+            asyncio.run(rerank.arerank("q", ["a"]))
+    assert not rerank.available()
+
+
+@pytest.mark.parametrize("error", [httpx.ReadError, httpx.RemoteProtocolError, httpx.WriteError])
+def test_a_dropped_connection_is_rerank_unavailable(monkeypatch, error):
+    """requests' ConnectionError covers these on the sync path; they must not escape
+    the async one as raw httpx exceptions."""
+    def handler(request):
+        raise error("connection closed", request=request)
+
+    _serve(monkeypatch, handler)
+    for _ in range(breaker.CIRCUIT_FAILURE_THRESHOLD):
+        with pytest.raises(rerank.RerankUnavailable):
+            asyncio.run(rerank.arerank("q", ["a"]))
+    assert not rerank.available()
+
+
+def test_a_read_timeout_is_an_error_but_not_a_breaker_failure(monkeypatch):
+    def handler(request):
+        raise httpx.ReadTimeout("slow", request=request)
+
+    _serve(monkeypatch, handler)
+    for _ in range(breaker.CIRCUIT_FAILURE_THRESHOLD):
+        with pytest.raises(rerank.RerankUnavailable, match="timed out"):
+            asyncio.run(rerank.arerank("q", ["a"]))
+    assert rerank.available()
+
+
+def test_a_repeated_rerank_is_served_from_cache(monkeypatch):
+    """Paging and retries re-send the same query over the same candidates; only the
+    first may cost a cross-encoder pass. A changed candidate set must not be served the
+    old ranking."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"data": [
+            {"index": 0, "relevance_score": 0.2},
+            {"index": 1, "relevance_score": 0.8},
+        ]})
+
+    _serve(monkeypatch, handler)
+    first, _ = asyncio.run(rerank.arerank("q", ["a", "b"]))
+    again, elapsed = asyncio.run(rerank.arerank("q", ["a", "b"]))
+    assert again == first and elapsed == 0.0
+    assert len(calls) == 1
+
+    asyncio.run(rerank.arerank("q", ["a", "c"]))
+    assert len(calls) == 2
+    stats = rerank.cache_stats()
+    assert stats["hits"] >= 1 and stats["entries"] == 2
+
+
+def test_identical_documents_are_scored_once_and_share_the_score(monkeypatch):
+    sent = []
+
+    def handler(request):
+        documents = json.loads(request.content)["documents"]
+        sent.append(documents)
+        return httpx.Response(200, json={"data": [
+            {"index": i, "relevance_score": 0.9 if d == "b" else 0.1}
+            for i, d in enumerate(documents)
+        ]})
+
+    _serve(monkeypatch, handler)
+    scores, _ = asyncio.run(rerank.arerank("q", ["a", "b", "a", "b"]))
+    assert sent == [["a", "b"]]
+    assert [(s.index, s.score) for s in scores] == [(1, 0.9), (3, 0.9), (0, 0.1), (2, 0.1)]
+
+
+def test_each_loop_gets_its_own_client_and_closed_loops_are_dropped():
+    loops = []
+
+    async def client():
+        loops.append(asyncio.get_running_loop())
+        return rerank._async_client()
+
+    first = asyncio.run(client())
+    # `loops` keeps the first, now closed, loop alive the way an open socket would.
+    second = asyncio.run(client())
+
+    assert first is not second
+    assert loops[0] not in rerank._async_clients
@@ -10,16 +10,46 @@ from __future__ import annotations
 
 import json
 import logging
+import operator
 import os
 import re
-from typing import Any, NamedTuple
+import threading
+import time
+from itertools import islice
+from typing import Any, Callable, Iterable, NamedTuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 log = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = float(os.getenv("BACKEND_TIMEOUT_SECONDS", "30"))
 
+#: Keep-alive connections kept per backend host. One search runs a query per shard on
+#: each side, so a connection per query put a TCP handshake in front of every one.
+POOL_MAXSIZE = int(os.getenv("BACKEND_POOL_MAXSIZE", "16"))
+
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _session() -> requests.Session:
+    """One keep-alive session for every ClickHouse and Manticore query in the process.
+
+    No adapter retries: every query here is a SELECT whose caller already decides what a
+    failure means (a skipped shard, a noted collection), and a silent retry would only
+    double the time it takes to get there.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
 GLOBAL_DB = "Hoover4_Processing"
 
 
@@ -52,7 +82,7 @@ def clickhouse_query(sql: str, database: str, params: dict[str, Any] | None = No
     for key, value in (params or {}).items():
         query_params[f"param_{key}"] = value
 
-    response = requests.post(
+    response = _session().post(
         _clickhouse_url(), params=query_params, data=sql.encode(), timeout=DEFAULT_TIMEOUT
     )
     if response.status_code != 200:
@@ -68,7 +98,7 @@ def manticore_query(sql: str) -> list[dict]:
     result set still carries an `error` field, which is checked here so a broken query
     surfaces as an exception instead of silently returning nothing.
     """
-    response = requests.post(
+    response = _session().post(
         f"{_manticore_url()}/sql",
         params={"mode": "raw"},
         data={"query": sql},
@@ -85,6 +115,107 @@ def manticore_query(sql: str) -> list[dict]:
     return payload.get("data", [])
 
 
+def row_getter(columns: tuple[str, ...]) -> Callable[[dict], tuple]:
+    """A function that unpacks one result row into `columns`, in order, in one call.
+
+    Search builds a candidate from every row of every shard, and six `row.get()` calls
+    per row were most of that loop's cost. `operator.itemgetter` does the lookups in C;
+    a row missing a column (a shard built before the column existed) falls back to
+    `None` for it rather than failing the shard. Needs at least two columns —
+    `itemgetter` with one returns a bare value, not a tuple.
+    """
+    get = operator.itemgetter(*columns)
+
+    def values(row: dict) -> tuple:
+        try:
+            return get(row)
+        except KeyError:
+            return tuple(row.get(c) for c in columns)
+
+    return values
+
+
+#: A content hash as the pipeline writes them: hex, 32-128 chars (md5 through sha3-512).
+_HASH_RE = re.compile(r"^[0-9a-f]{32,128}$")
+
+#: Most hashes one `IN {hashes:Array(String)}` lookup carries. The array travels as text
+#: in the URL-encoded parameters and ClickHouse parses it whole before it reads a row, so a
+#: lookup over a few thousand hits is split rather than sent as one outsized literal.
+IN_BATCH = max(1, int(os.getenv("COLLECTION_SEARCH_IN_BATCH", "1024")))
+
+
+def is_hash(value: str) -> bool:
+    return bool(_HASH_RE.match(value or ""))
+
+
+def hash_arrays(hashes: Iterable[str]) -> list[str]:
+    """ClickHouse `Array(String)` parameter texts covering `hashes`, `IN_BATCH` apiece.
+
+    ClickHouse takes Array parameters as text, so the literal is assembled by hand, and
+    anything that is not a plain content hash is dropped here rather than interpolated.
+    The hashes come back from Manticore and should always be hex — this is the belt to
+    that braces. Deduplicated and sorted, so a repeated lookup sends the same text.
+    """
+    unique = iter(sorted({h for h in hashes if is_hash(h)}))
+    arrays = []
+    while batch := tuple(islice(unique, IN_BATCH)):
+        arrays.append("['" + "','".join(batch) + "']")
+    return arrays
+
+
+#: How long a collection's shard ledger and Manticore's table list are reused. Both
+#: change only when P6 plans or drops a shard, while every search read both — one ledger
+#: SELECT per collection for the keyword side, another per collection plus a `SHOW
+#: TABLES` for the vector side — before running a single query. A shard that vanishes
+#: inside the window fails its own query, and that failure drops the cached entry.
+SHARD_CACHE_SECONDS = float(os.getenv("COLLECTION_SEARCH_SHARD_CACHE_SECONDS", "30"))
+
+_shard_cache: dict[str, tuple[float, tuple[str, ...]]] = {}
+_tables_cache: tuple[float, frozenset[str]] = (0.0, frozenset())
+
+
+def shard_names(collectionname: str) -> tuple[str, ...]:
+    """The collection's registered shard names from its `manticore_shards` ledger, newest
+    first, briefly cached.
+
+    An empty ledger is not cached: a collection with no shard yet gets its first one from
+    P6, and that shard must be searchable on the next call, not half a minute later.
+    """
+    now = time.monotonic()
+    cached = _shard_cache.get(collectionname)
+    if cached and now - cached[0] < SHARD_CACHE_SECONDS:
+        return cached[1]
+    rows = clickhouse_query(
+        "SELECT DISTINCT shard_name FROM manticore_shards FINAL ORDER BY shard_name DESC",
+        database=collection_db(collectionname),
+    )
+    names = tuple(str(r["shard_name"]) for r in rows if r.get("shard_name"))
+    if names:
+        _shard_cache[collectionname] = (now, names)
+    return names
+
+
+def manticore_tables() -> frozenset[str]:
+    """Every table Manticore has (`SHOW TABLES`), cached like `shard_names`."""
+    global _tables_cache
+    fetched_at, tables = _tables_cache
+    now = time.monotonic()
+    if fetched_at and now - fetched_at < SHARD_CACHE_SECONDS:
+        return tables
+    out: set[str] = set()
+    for row in manticore_query("SHOW TABLES"):
+        out.update(str(v) for v in row.values())
+    _tables_cache = (now, frozenset(out))
+    return _tables_cache[1]
+
+
+def forget_shards(collectionname: str) -> None:
+    """Drop the cached shard view of one collection, after one of its shards failed."""
+    global _tables_cache
+    _shard_cache.pop(collectionname, None)
+    _tables_cache = (0.0, frozenset())
+
+
 def escape_manticore_string(value: str) -> str:
     """Escape a value for a single-quoted Manticore SQL string literal.
 
@@ -26,6 +26,10 @@ import json
 import logging
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
 from fastmcp import FastMCP
@@ -38,10 +42,16 @@ from collection_search_server import vectors
 from collection_search_server.acl import AccessDenied, CallerAcl, parse_acl
 from collection_search_server.backends import (
     GLOBAL_DB,
+    POOL_MAXSIZE,
     clickhouse_query,
     collection_db,
+    forget_shards,
+    hash_arrays,
+    is_hash as _is_hash,
     manticore_query,
     prepare_match_query,
+    row_getter,
+    shard_names,
 )
 from collection_search_server.prompts import MATCH_SYNTAX, SERVER_INSTRUCTIONS
 
@@ -67,6 +77,48 @@ MAX_DOCUMENT_CHARS = int(os.getenv("MAX_DOCUMENT_CHARS", "40000"))
 #: pipeline runs, and the cap on the fused pool sent to the reranker.
 FUSION_CANDIDATES = int(os.getenv("COLLECTION_SEARCH_FUSION_CANDIDATES", "60"))
 
+#: Manticore ranker per keyword profile. `bm25` scores term statistics only and skips
+#: the phrase-proximity pass that dominates the cost of a broad MATCH; `proximity_bm25`
+#: is Manticore's default and what search always ran; `sph04` adds the exact-phrase and
+#: field-start boosts on top, for the queries where the best page must come first.
+_KEYWORD_RANKERS = {"fast": "bm25", "balanced": "proximity_bm25", "recall": "sph04"}
+
+
+def _keyword_ranker(raw: str) -> str:
+    """`COLLECTION_SEARCH_KEYWORD_PROFILE`: a profile name or a Manticore ranker name."""
+    raw = raw.strip().lower()
+    if raw in _KEYWORD_RANKERS:
+        return _KEYWORD_RANKERS[raw]
+    if re.fullmatch(r"[a-z0-9_]+", raw):
+        return raw
+    log.warning("COLLECTION_SEARCH_KEYWORD_PROFILE=%r is not a profile or ranker; using balanced",
+                raw)
+    return _KEYWORD_RANKERS["balanced"]
+
+
+KEYWORD_RANKER = _keyword_ranker(os.getenv("COLLECTION_SEARCH_KEYWORD_PROFILE", "balanced"))
+
+#: RRF constant for the keyword/vector fusion. Its own knob: this fusion has two sources
+#: that disagree by construction, metasearch's has many that mostly agree, and tuning one
+#: through `METASEARCH_RRF_K` silently retuned the other.
+RRF_K = int(os.getenv("COLLECTION_SEARCH_RRF_K", str(fusion.RRF_K)))
+
+#: How the keyword and vector rankings are fused: `rrf` (rank only, robust with no
+#: tuning) or `cc` — a convex combination of per-source min-max-normalised scores (BM25
+#: for keyword, `1 - dist` for vector) under `CC_WEIGHTS`. CC uses the score gaps RRF
+#: throws away and wins in-domain once the weights are tuned; untuned it can lose, which
+#: is why RRF stays the default. Anything else falls back to `rrf` with a warning.
+FUSION = os.getenv("COLLECTION_SEARCH_FUSION", "rrf").strip().lower()
+if FUSION not in ("rrf", "cc"):
+    log.warning("COLLECTION_SEARCH_FUSION=%r is not rrf or cc; using rrf", FUSION)
+    FUSION = "rrf"
+
+#: Per-source weights for `cc` fusion; normalised to sum to 1 by the fusion itself.
+CC_WEIGHTS = {
+    "keyword": float(os.getenv("COLLECTION_SEARCH_CC_KEYWORD_WEIGHT", "0.5")),
+    "vector": float(os.getenv("COLLECTION_SEARCH_CC_VECTOR_WEIGHT", "0.5")),
+}
+
 #: The per-kind floor after reranking: each of the `keyword` and `vector` kinds keeps
 #: its best results even when the other kind dominates the fused order (RRF is a
 #: popularity measure; keyword-exact hits would otherwise drown semantic ones).
@@ -79,6 +131,30 @@ FUSION_CANDIDATES = int(os.getenv("COLLECTION_SEARCH_FUSION_CANDIDATES", "60"))
 MIN_PER_KIND = int(os.getenv("COLLECTION_SEARCH_MIN_PER_KIND", "3"))
 MAX_PER_KIND = int(os.getenv("COLLECTION_SEARCH_MAX_PER_KIND", "15"))
 
+#: Shard queries in flight at once across the whole process. The keyword shards and the
+#: vector branch (query embedding + KNN) are independent, and running them one after
+#: another made a search's latency the SUM of every shard's instead of the slowest one's.
+#: `_FANOUT` is module-level, so this cap is shared by every concurrent search: N
+#: searches at once queue behind each other's shards, not N times this many. Each
+#: worker holds one backend connection, and the backend session pool is process-wide
+#: too, so the default is `BACKEND_POOL_MAXSIZE`; more threads would only queue there.
+SHARD_CONCURRENCY = max(
+    1, int(os.getenv("COLLECTION_SEARCH_SHARD_CONCURRENCY", str(POOL_MAXSIZE)))
+)
+
+_FANOUT = ThreadPoolExecutor(max_workers=SHARD_CONCURRENCY, thread_name_prefix="shard")
+
+#: How long a fused search's candidate pools are kept for the same query over the same
+#: collections. The pools are `FUSION_CANDIDATES` deep whatever `max_results` asked for,
+#: so the next page is already in them — and an agent that wants more hits re-runs the
+#: search with a bigger `max_results`, which re-ran every shard query and KNN to rebuild
+#: pools it had just thrown away. 0 disables the cache.
+POOL_CACHE_SECONDS = float(os.getenv("COLLECTION_SEARCH_POOL_CACHE_SECONDS", "60"))
+POOL_CACHE_SIZE = max(1, int(os.getenv("COLLECTION_SEARCH_POOL_CACHE_SIZE", "64")))
+
+_pool_cache: OrderedDict[tuple, tuple[float, list, list]] = OrderedDict()
+_pool_cache_lock = threading.Lock()
+
 mcp = FastMCP(
     name=os.getenv("SERVER_NAME", "hoover4_collection_search"),
     # The canonical text lives in `prompts.py`; the env var is a thin override for
@@ -118,19 +194,25 @@ class _Candidate:
     Fused at page granularity — a vector hit knows its chunk, but the answer a hit
     points at is the page, and the chunk text becomes the snippet (the matched
     passage, more precise than a page excerpt).
+
+    A keyword hit arrives without its text: `shard` and `row_id` say where to fetch it
+    once fusion has decided the hit is worth showing (see :func:`_attach_page_texts`).
     """
 
     __slots__ = ("collectionname", "collection_dataset", "file_hash", "page_id",
-                 "keyword_score", "text")
+                 "keyword_score", "text", "shard", "row_id")
 
     def __init__(self, collectionname: str, collection_dataset: str, file_hash: str,
-                 page_id: int, keyword_score: float = 0.0, text: str = ""):
+                 page_id: int, keyword_score: float = 0.0, text: str = "",
+                 shard: str = "", row_id: int = 0):
         self.collectionname = collectionname
         self.collection_dataset = collection_dataset
         self.file_hash = file_hash
         self.page_id = page_id
         self.keyword_score = keyword_score
         self.text = text
+        self.shard = shard
+        self.row_id = row_id
 
     def key(self) -> tuple[str, str, str, int]:
         return (self.collectionname, self.collection_dataset, self.file_hash, self.page_id)
@@ -167,12 +249,10 @@ class DocumentEntities(BaseModel):
     error: str | None = None
 
 
-#: A content hash as the pipeline writes them: hex, 32-128 chars (md5 through sha3-512).
-_HASH_RE = re.compile(r"^[0-9a-f]{32,128}$")
-
-
-def _is_hash(value: str) -> bool:
-    return bool(_HASH_RE.match(value or ""))
+#: The keyword SELECT's columns, in order; every shard row is unpacked through this.
+#: No `page_text`: see :func:`_attach_page_texts`.
+_KEYWORD_ROW = row_getter(("id", "collection_dataset", "file_hash", "page_id", "score"))
+_KEYWORD_SELECT = "SELECT id, collection_dataset, file_hash, page_id, WEIGHT() AS score FROM "
 
 
 def _caller() -> CallerAcl:
@@ -218,11 +298,7 @@ def _shard_tables(collectionname: str) -> list[str]:
     that exists in Manticore but is not registered (a half-finished migration) is not
     searched.
     """
-    rows = clickhouse_query(
-        "SELECT DISTINCT shard_name FROM manticore_shards FINAL ORDER BY shard_name DESC",
-        database=collection_db(collectionname),
-    )
-    return [f"{r['shard_name']}_pages" for r in rows if r.get("shard_name")]
+    return [f"{name}_pages" for name in shard_names(collectionname)]
 
 
 @mcp.tool(
@@ -327,78 +403,64 @@ def search_collections(
     # candidate pool deep enough for RRF and the reranker to be worth running.
     vector_model = None
     if embeddings_client.endpoint():
+        # The shard listing does not depend on the model, so it runs beside the model
+        # read instead of after it. Both are cached; on a cold cache they were a
+        # ClickHouse round-trip, then a ledger read per collection and `SHOW TABLES`,
+        # back to back. The listing is never wasted: it warms the same ledger cache the
+        # keyword side reads next.
+        shards_future = _FANOUT.submit(vectors.has_vector_shards, targets)
         try:
             vector_model = vectors.serving_model()
         except Exception as exc:  # noqa: BLE001 - degrade to keyword-only, say so
             log.warning("could not read embeddings_serving_model: %s", exc)
             notes.append(f"vector search unavailable: could not read the serving model ({exc})")
-    per_shard_limit = FUSION_CANDIDATES if vector_model else limit
-
-    candidates: list[_Candidate] = []
-    failed_targets: list[str] = []
-    #: Manticore's own words about a bad query. Kept so they can be returned rather than
-    #: only logged — a syntax error the model never sees is one it cannot correct.
-    shard_errors: list[str] = []
-
-    for collectionname in targets:
+        # No `_vectors` shard anywhere in scope means the vector branch would embed the
+        # query and search nothing, and the fused path would then rank a keyword-only
+        # pool at fusion depth. Run the plain keyword search instead.
         try:
-            tables = _shard_tables(collectionname)
-        except Exception as exc:  # noqa: BLE001
-            log.warning("cannot list shards of %s: %s", collectionname, exc)
-            failed_targets.append(collectionname)
-            continue
-
-        for table in tables:
-            # Per-shard limit is the full limit: a shard that holds every good match
-            # must be able to supply them all. Over-fetching is trimmed after merging.
-            sql = (
-                f"SELECT collection_dataset, file_hash, page_id, page_text, WEIGHT() AS score "
-                f"FROM {table} WHERE MATCH('{match_expr}') "
-                f"ORDER BY score DESC LIMIT {per_shard_limit} OPTION max_matches={per_shard_limit * 10}"
-            )
-            try:
-                rows = manticore_query(sql)
-            except Exception as exc:  # noqa: BLE001 - one bad shard must not blank the page
-                log.warning("shard %s failed: %s", table, exc)
-                failed_targets.append(table)
-                shard_errors.append(str(exc))
-                continue
-
-            for row in rows:
-                candidates.append(
-                    _Candidate(
-                        collectionname=collectionname,
-                        collection_dataset=row.get("collection_dataset", ""),
-                        file_hash=row.get("file_hash", ""),
-                        page_id=int(row.get("page_id") or 0),
-                        keyword_score=float(row["score"]) if row.get("score") is not None else 0.0,
-                        text=(row.get("page_text") or "")[:SNIPPET_CHARS],
-                    )
-                )
-
-    # BM25 statistics are per-table, so scores from different shards are only roughly
-    # comparable — the same caveat the website's search fan-out carries.
-    candidates.sort(key=lambda c: c.keyword_score, reverse=True)
-    keyword_list = candidates
+            if not shards_future.result() and vector_model:
+                vector_model = None
+                notes.append("no vector index for these collections yet; keyword search only")
+        except Exception as exc:  # noqa: BLE001 - let the vector branch find out
+            log.warning("could not list _vectors shards: %s", exc)
+    per_shard_limit = FUSION_CANDIDATES if vector_model else limit
 
-    # The vector half: embed the query with the probed serving model's query
-    # convention, KNN every live _vectors shard, nearest first.
-    vector_list: list[vectors.VectorCandidate] = []
-    vector_branch_ran = False
-    if vector_model:
-        try:
-            query_vector = embeddings_client.embed_query(query, vector_model)
-            vector_branch_ran = True
-            vector_list = vectors.search(query_vector, targets)
-        except embeddings_client.EmbeddingUnavailable as exc:
-            notes.append(f"vector search unavailable: {exc}")
-        except Exception as exc:  # noqa: BLE001 - a search must still answer
-            log.exception("vector search failed")
-            notes.append(f"vector search failed: {exc}")
+    pool_key = (query, vector_model, tuple(targets)) if vector_model else None
+    pool = _cached_pools(pool_key)
+    if pool is not None:
+        keyword_list, vector_list = pool
+        failed_targets: list[str] = []
+        shard_errors: list[str] = []
+        vector_branch_ran = True
+    else:
+        # The vector half starts first and runs beside the keyword shards: it needs
+        # nothing from them, and the query embedding is the slowest single step.
+        vector_future = (
+            _FANOUT.submit(_vector_branch, query, vector_model, targets) if vector_model else None
+        )
+        keyword_list, failed_targets, shard_errors = _keyword_branch(
+            match_expr, per_shard_limit, targets
+        )
 
+        vector_list: list[vectors.VectorCandidate] = []
+        vector_branch_ran = False
+        vector_notes: list[str] = []
+        if vector_future is not None:
+            vector_branch_ran, vector_list, vector_notes = vector_future.result()
+            notes.extend(vector_notes)
+        # Only a complete search is worth repeating: pools missing a shard or a vector
+        # branch would keep serving the outage after it is over.
+        if pool_key and vector_branch_ran and not failed_targets and not vector_notes:
+            _remember_pools(pool_key, keyword_list, vector_list)
+
+    path_lookups = None
     if vector_branch_ran:
         hits = _fused_pipeline(query, keyword_list, vector_list, limit, notes)
     else:
+        # Without fusion the hits shown are known now, so their paths (ClickHouse) are
+        # looked up beside their page text (Manticore) instead of after it.
+        path_lookups = _start_path_lookups(keyword_list[:limit])
+        _attach_page_texts(keyword_list[:limit])
         hits = [
             SearchHit(
                 collectionname=c.collectionname,
@@ -411,7 +473,7 @@ def search_collections(
             )
             for c in keyword_list[:limit]
         ]
-    _attach_paths(hits)
+    _attach_paths(hits, path_lookups)
 
     if failed_targets:
         notes.append(
@@ -435,6 +497,127 @@ def search_collections(
     )
 
 
+def _cached_pools(key: tuple | None) -> tuple[list, list] | None:
+    """The keyword and vector pools of a recent complete search for `key`, if any."""
+    if key is None or POOL_CACHE_SECONDS <= 0:
+        return None
+    with _pool_cache_lock:
+        entry = _pool_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= POOL_CACHE_SECONDS:
+            del _pool_cache[key]
+            return None
+        _pool_cache.move_to_end(key)
+    return entry[1], entry[2]
+
+
+def _remember_pools(key: tuple, keyword_list: list, vector_list: list) -> None:
+    """Keep a complete search's pools for `POOL_CACHE_SECONDS`, least recent out first."""
+    if POOL_CACHE_SECONDS <= 0:
+        return
+    with _pool_cache_lock:
+        _pool_cache[key] = (time.monotonic(), keyword_list, vector_list)
+        _pool_cache.move_to_end(key)
+        while len(_pool_cache) > POOL_CACHE_SIZE:
+            _pool_cache.popitem(last=False)
+
+
+def _keyword_branch(
+    match_expr: str, per_shard_limit: int, targets: list[str]
+) -> tuple[list[_Candidate], list[str], list[str]]:
+    """MATCH every live `_pages` shard of `targets`, best BM25 first.
+
+    Returns `(candidates, failed_targets, shard_errors)`: the collections or shards that
+    could not be queried, and Manticore's own words about why.
+    """
+    candidates: list[_Candidate] = []
+    failed_targets: list[str] = []
+    #: Manticore's own words about a bad query. Kept so they can be returned rather than
+    #: only logged — a syntax error the model never sees is one it cannot correct.
+    shard_errors: list[str] = []
+
+    # Everything after the table name is the same for every shard, so it is built once
+    # per search rather than re-formatted into each shard's statement.
+    keyword_tail = (
+        f" WHERE MATCH('{match_expr}') "
+        f"ORDER BY score DESC LIMIT {per_shard_limit} "
+        f"OPTION max_matches={per_shard_limit * 10}, ranker={KEYWORD_RANKER}"
+    )
+    shard_futures = []
+    for collectionname in targets:
+        try:
+            tables = _shard_tables(collectionname)
+        except Exception as exc:  # noqa: BLE001
+            log.warning("cannot list shards of %s: %s", collectionname, exc)
+            failed_targets.append(collectionname)
+            continue
+
+        for table in tables:
+            # Per-shard limit is the full limit: a shard that holds every good match
+            # must be able to supply them all. Over-fetching is trimmed after merging.
+            sql = _KEYWORD_SELECT + table + keyword_tail
+            shard_futures.append(
+                (collectionname, table, _FANOUT.submit(manticore_query, sql))
+            )
+
+    # Collected in submission order, so the merge is the same whatever order the
+    # shards answer in.
+    for collectionname, table, future in shard_futures:
+        try:
+            rows = future.result()
+        except Exception as exc:  # noqa: BLE001 - one bad shard must not blank the page
+            log.warning("shard %s failed: %s", table, exc)
+            forget_shards(collectionname)
+            failed_targets.append(table)
+            shard_errors.append(str(exc))
+            continue
+
+        for row_id, dataset, file_hash, page_id, score in map(_KEYWORD_ROW, rows):
+            candidates.append(
+                _Candidate(
+                    collectionname=collectionname,
+                    collection_dataset=dataset or "",
+                    file_hash=file_hash or "",
+                    page_id=int(page_id or 0),
+                    keyword_score=float(score) if score is not None else 0.0,
+                    shard=table,
+                    row_id=int(row_id or 0),
+                )
+            )
+
+    # BM25 statistics are per-table, so scores from different shards are only roughly
+    # comparable — the same caveat the website's search fan-out carries.
+    candidates.sort(key=lambda c: c.keyword_score, reverse=True)
+    return candidates, failed_targets, shard_errors
+
+
+def _vector_branch(
+    query: str, vector_model: str, targets: list[str]
+) -> "tuple[bool, list[vectors.VectorCandidate], list[str]]":
+    """Embed the query with the probed serving model's query convention, KNN every live
+    `_vectors` shard, nearest first.
+
+    Returns `(ran, candidates, notes)`. `ran` is whether the query was embedded — a
+    vector search that found nothing still fuses. Runs on the fan-out pool, so its notes
+    come back to the caller rather than being appended from another thread.
+    """
+    notes: list[str] = []
+    try:
+        query_vector = embeddings_client.embed_query(query, vector_model)
+    except embeddings_client.EmbeddingUnavailable as exc:
+        return False, [], [f"vector search unavailable: {exc}"]
+    except Exception as exc:  # noqa: BLE001 - a search must still answer
+        log.exception("vector search failed")
+        return False, [], [f"vector search failed: {exc}"]
+    try:
+        return True, vectors.search(query_vector, targets), notes
+    except Exception as exc:  # noqa: BLE001 - a search must still answer
+        log.exception("vector search failed")
+        notes.append(f"vector search failed: {exc}")
+        return True, [], notes
+
+
 def _fused_pipeline(
     query: str,
     keyword_list: list[_Candidate],
@@ -442,7 +625,7 @@ def _fused_pipeline(
     limit: int,
     notes: list[str],
 ) -> list[SearchHit]:
-    """Fuse keyword + vector rankings (RRF), rerank, apply the per-kind floor.
+    """Fuse keyword + vector rankings (`FUSION`), rerank, apply the per-kind floor.
 
     The order is not interchangeable: rerank the whole fused candidate pool, THEN take
     the best per kind — flooring first would let the reranker reorder an
@@ -453,12 +636,12 @@ def _fused_pipeline(
     for c in keyword_list:
         by_key.setdefault(c.key(), c)
     vector_candidates: list[_Candidate] = []
-    #: Pages whose snippet already came from a chunk. `vector_list` is nearest-first, so
-    #: the first chunk seen for a page is its best one — and assigning unconditionally
-    #: meant the *last*, i.e. the FARTHEST, chunk of a multi-chunk page won. That text is
-    #: also what the reranker scores, so a page was being judged on its least relevant
+    #: The chunk each page's snippet comes from. `vector_list` is nearest-first, so the
+    #: first chunk seen for a page is its best one — and assigning unconditionally meant
+    #: the *last*, i.e. the FARTHEST, chunk of a multi-chunk page won. That text is also
+    #: what the reranker scores, so a page was being judged on its least relevant
     #: passage and then shown to the user with it.
-    snippet_from_chunk: set[tuple] = set()
+    best_chunk: dict[tuple, vectors.VectorCandidate] = {}
     for v in vector_list:
         key = (v.collectionname, v.collection_dataset, v.file_hash, v.page_id)
         c = by_key.get(key)
@@ -470,40 +653,66 @@ def _fused_pipeline(
                 page_id=v.page_id,
             )
             by_key[key] = c
-        if v.text and key not in snippet_from_chunk:
-            # The chunk is the matched passage; it makes a better snippet than the
-            # page excerpt the keyword half brought.
-            c.text = v.text[:SNIPPET_CHARS]
-            snippet_from_chunk.add(key)
+        best_chunk.setdefault(key, v)
         vector_candidates.append(c)
 
-    fused = fusion.fuse_ranked_lists(
-        {"keyword": keyword_list, "vector": vector_candidates},
-        key_of=lambda c: c.key(),
-        max_results=FUSION_CANDIDATES,
-    )
+    if FUSION == "cc":
+        # Similarity is only needed by `cc`, so RRF never pays for it. No clamp: the
+        # per-source min-max normalisation absorbs cosine distance's [0, 2] range.
+        fused = fusion.fuse_scored_lists(
+            {
+                "keyword": [(c, c.keyword_score) for c in keyword_list],
+                "vector": [(c, 1.0 - v.dist) for c, v in zip(vector_candidates, vector_list)],
+            },
+            key_of=lambda c: c.key(),
+            weights=CC_WEIGHTS,
+            max_results=FUSION_CANDIDATES,
+        )
+    else:
+        fused = fusion.fuse_ranked_lists(
+            {"keyword": keyword_list, "vector": vector_candidates},
+            key_of=lambda c: c.key(),
+            max_results=FUSION_CANDIDATES,
+            k=RRF_K,
+        )
+
+    # Snippets only for what survived fusion, and before the rerank, which scores
+    # exactly this text. The chunk is the matched passage, a better snippet than the
+    # page excerpt, so a page with a chunk takes it; the rest get their page excerpt.
+    chunks = [best_chunk[f.key] for f in fused if f.key in best_chunk]
+    vectors.attach_chunk_texts([v for v in chunks if not v.text])
+    for f in fused:
+        v = best_chunk.get(f.key)
+        if v is not None and v.text:
+            f.item.text = v.text[:SNIPPET_CHARS]
+    _attach_page_texts([f.item for f in fused if not f.item.text])
 
     ordered = fused
     rerank_applied = False
-    try:
-        scores, rerank_ms = rerank_client.rerank(query, [f.item.text for f in fused])
-        if scores:
-            seen: set[int] = set()
-            ordered = []
-            for s in scores:
-                if 0 <= s.index < len(fused) and s.index not in seen:
-                    seen.add(s.index)
-                    ordered.append(fused[s.index])
-            # A partial rerank response must not delete the candidates it did not score:
-            # they were real hits with a real fused position, and dropping them silently
-            # shrinks the search. They keep their fused order behind the scored ones.
-            ordered += [f for i, f in enumerate(fused) if i not in seen]
-            rerank_applied = True
-    except rerank_client.RerankUnavailable as exc:
-        notes.append(f"rerank unavailable ({exc}); showing the fused order")
-    except Exception as exc:  # noqa: BLE001 - a search must still answer
-        log.exception("rerank failed unexpectedly")
-        notes.append(f"rerank failed: {exc}; showing the fused order")
+    # One candidate, or none, has exactly one order: the cross-encoder round trip could
+    # only confirm it. Narrow queries and one-document collections hit this constantly.
+    if len(fused) > 1:
+        try:
+            scores, rerank_ms = rerank_client.rerank(query, [f.item.text for f in fused])
+            if scores:
+                seen: set[int] = set()
+                ordered = []
+                n = len(fused)
+                for s in scores:
+                    if 0 <= s.index < n and s.index not in seen:
+                        seen.add(s.index)
+                        ordered.append(fused[s.index])
+                # A partial rerank response must not delete the candidates it did not score:
+                # they were real hits with a real fused position, and dropping them silently
+                # shrinks the search. They keep their fused order behind the scored ones.
+                if len(seen) < n:
+                    ordered += [f for i, f in enumerate(fused) if i not in seen]
+                rerank_applied = True
+        except rerank_client.RerankUnavailable as exc:
+            notes.append(f"rerank unavailable ({exc}); showing the fused order")
+        except Exception as exc:  # noqa: BLE001 - a search must still answer
+            log.exception("rerank failed unexpectedly")
+            notes.append(f"rerank failed: {exc}; showing the fused order")
 
     final = fusion.per_kind_floor(
         ordered,
@@ -531,34 +740,93 @@ def _fused_pipeline(
     ]
 
 
-def _attach_paths(hits: list[SearchHit]) -> None:
-    """Fill in `path` for each hit, one query per collection rather than one per hit."""
-    by_collection: dict[str, list[SearchHit]] = {}
-    for hit in hits:
-        if hit.file_hash:
-            by_collection.setdefault(hit.collectionname, []).append(hit)
-
-    for collectionname, group in by_collection.items():
-        # The array literal below is assembled by hand (ClickHouse takes Array params as
-        # text), so anything that is not a plain content hash is dropped rather than
-        # interpolated. These come back from Manticore, so they should always be hex —
-        # this is the belt to that braces.
-        hashes = sorted({h.file_hash for h in group if _is_hash(h.file_hash)})
-        if not hashes:
-            continue
+def _attach_page_texts(candidates: list[_Candidate]) -> None:
+    """Fetch the page excerpt of each keyword candidate, one query per shard.
+
+    The shard queries return identities and scores only. Every shard answers with its
+    own full candidate pool — `FUSION_CANDIDATES` rows each — and fusion keeps at most
+    that many overall, so fetching `page_text` up front moved every discarded page across
+    the wire too, whole, to be cut to `SNIPPET_CHARS` and thrown away. Fetching after
+    fusion moves only the pages that can be shown. A failed fetch leaves those snippets
+    empty; the hits themselves stand.
+    """
+    by_shard: dict[str, list[_Candidate]] = {}
+    for c in candidates:
+        if c.shard and c.row_id:
+            by_shard.setdefault(c.shard, []).append(c)
+
+    futures = []
+    for shard, group in by_shard.items():
+        ids = sorted({c.row_id for c in group})
+        sql = (
+            f"SELECT id, page_text FROM {shard} "
+            f"WHERE id IN ({','.join(str(i) for i in ids)}) LIMIT {len(ids)}"
+        )
+        futures.append((shard, group, _FANOUT.submit(manticore_query, sql)))
+
+    for shard, group, future in futures:
         try:
-            rows = clickhouse_query(
+            rows = future.result()
+        except Exception as exc:  # noqa: BLE001 - a missing snippet degrades one hit
+            log.warning("page text lookup failed for %s: %s", shard, exc)
+            continue
+        texts = {int(r.get("id") or 0): r.get("page_text") or "" for r in rows}
+        for c in group:
+            c.text = texts.get(c.row_id, "")[:SNIPPET_CHARS]
+
+
+def _start_path_lookups(items: list) -> list[tuple[str, Future]]:
+    """Submit the `vfs_files` path lookups for `items` (hits or candidates: anything
+    with `collectionname` and `file_hash`) and return them unawaited.
+
+    Separate from :func:`_attach_paths` so a caller that already knows which documents
+    it will show can start the lookups before the rest of its work.
+    """
+    by_collection: dict[str, list[str]] = {}
+    for item in items:
+        if item.file_hash:
+            by_collection.setdefault(item.collectionname, []).append(item.file_hash)
+
+    futures = []
+    for collectionname, file_hashes in by_collection.items():
+        for hashes in hash_arrays(file_hashes):
+            futures.append((collectionname, _FANOUT.submit(
+                clickhouse_query,
                 "SELECT hash, any(path) AS path FROM vfs_files "
                 "WHERE hash IN {hashes:Array(String)} GROUP BY hash",
                 database=collection_db(collectionname),
-                params={"hashes": "['" + "','".join(hashes) + "']"},
-            )
+                params={"hashes": hashes},
+            )))
+    return futures
+
+
+def _attach_paths(
+    hits: list[SearchHit], lookups: list[tuple[str, Future]] | None = None
+) -> None:
+    """Fill in `path` for each hit, one query per collection rather than one per hit.
+
+    The lookups run side by side on the shard pool: with several collections in scope,
+    one after another they were a ClickHouse round-trip each on the way out of every
+    search. A collection with more than `IN_BATCH` distinct hashes is split across
+    lookups (see :func:`backends.hash_arrays`). `lookups` are ones already started by
+    :func:`_start_path_lookups` for the same documents.
+    """
+    futures = _start_path_lookups(hits) if lookups is None else lookups
+
+    paths: dict[str, dict[str, str]] = {}
+    for collectionname, future in futures:
+        try:
+            rows = future.result()
         except Exception as exc:  # noqa: BLE001 - a missing path is cosmetic
             log.warning("path lookup failed for %s: %s", collectionname, exc)
             continue
-        paths = {r["hash"]: r["path"] for r in rows}
-        for hit in group:
-            hit.path = paths.get(hit.file_hash)
+        found = paths.setdefault(collectionname, {})
+        for r in rows:
+            found[r["hash"]] = r["path"]
+
+    for hit in hits:
+        if hit.file_hash:
+            hit.path = paths.get(hit.collectionname, {}).get(hit.file_hash)
 
 
 @mcp.tool(
@@ -582,11 +850,16 @@ def get_document_text(collectionname: str, file_hash: str) -> DocumentText:
         )
 
     try:
+        # Each page is cut to one character past the cap in ClickHouse: the reply never
+        # carries more than `MAX_DOCUMENT_CHARS`, so a scanned ledger's multi-megabyte
+        # pages were crossing the wire whole only to be sliced off here. One extra
+        # character is enough to tell a page that was cut. `substringUTF8`, not
+        # `substring`, which counts bytes and would split a multibyte character.
         rows = clickhouse_query(
-            "SELECT text FROM text_content FINAL WHERE file_hash = {hash:String} "
-            "ORDER BY extracted_by, page_id",
+            "SELECT substringUTF8(text, 1, {chars:UInt32}) AS text FROM text_content FINAL "
+            "WHERE file_hash = {hash:String} ORDER BY extracted_by, page_id",
             database=collection_db(collectionname),
-            params={"hash": file_hash},
+            params={"hash": file_hash, "chars": MAX_DOCUMENT_CHARS + 1},
         )
         path_rows = clickhouse_query(
             "SELECT any(path) AS path FROM vfs_files WHERE hash = {hash:String}",
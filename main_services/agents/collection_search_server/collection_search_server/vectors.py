@@ -18,6 +18,9 @@ Two Manticore behaviours below were verified live against the running daemon
 * **`knn(v, k, …)` bounds nothing by itself** — without a LIMIT the query matched every
   row. The working shape is `WHERE knn(embedding, K, (…)) ORDER BY <alias> ASC LIMIT K`,
   with the alias because `ORDER BY knn_dist()` is a syntax error.
+
+The HNSW search width `ef` is passed as the knn options object (`{ef=N}`) from
+`COLLECTION_SEARCH_VECTOR_EF`; see `VECTOR_EF`.
 """
 
 from __future__ import annotations
@@ -26,21 +29,79 @@ import logging
 import os
 import re
 import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 from collection_search_server.backends import (
     GLOBAL_DB,
     clickhouse_query,
     collection_db,
+    forget_shards,
+    hash_arrays,
     manticore_query,
+    manticore_tables,
+    row_getter,
+    shard_names,
 )
 
 log = logging.getLogger(__name__)
 
+#: The KNN SELECT's columns, in order; `search` unpacks every row through this.
+_VECTOR_ROW = row_getter(
+    ("collection_dataset", "file_hash", "extracted_by", "page_id", "chunk_index", "dist")
+)
+_VECTOR_SELECT = (
+    "SELECT collection_dataset, file_hash, extracted_by, page_id, chunk_index, "
+    "knn_dist() AS dist FROM "
+)
+
 #: Candidates per shard per search. HNSW makes a k=60 probe cheap; the fused pool is
 #: capped again after the merge.
 VECTOR_PER_SHARD = int(os.getenv("COLLECTION_SEARCH_VECTOR_PER_SHARD", "60"))
 
+#: KNN shard queries in flight at once for one search. Its own pool, not the server's
+#: `_FANOUT`: `search` already runs on that pool as the vector branch, and a task that
+#: waits on its own pool deadlocks once every worker is such a task.
+VECTOR_CONCURRENCY = max(1, int(os.getenv("COLLECTION_SEARCH_VECTOR_CONCURRENCY", "4")))
+
+_KNN_POOL = ThreadPoolExecutor(max_workers=VECTOR_CONCURRENCY, thread_name_prefix="knn")
+
+#: HNSW search width per shard, as a multiple of `VECTOR_PER_SHARD`. HNSW never searches
+#: narrower than k, so `fast` is the floor; wider finds neighbours the greedy walk would
+#: miss, for latency that grows roughly with ef.
+_EF_PROFILES = {"fast": 1, "balanced": 2, "recall": 8}
+
+
+def _vector_ef(raw: str) -> int:
+    """`COLLECTION_SEARCH_VECTOR_EF`: a profile name or an explicit ef, never below k."""
+    raw = raw.strip().lower()
+    if raw in _EF_PROFILES:
+        return VECTOR_PER_SHARD * _EF_PROFILES[raw]
+    try:
+        return max(VECTOR_PER_SHARD, int(raw))
+    except ValueError:
+        log.warning("COLLECTION_SEARCH_VECTOR_EF=%r is neither %s nor an int; using balanced",
+                    raw, "/".join(_EF_PROFILES))
+        return VECTOR_PER_SHARD * _EF_PROFILES["balanced"]
+
+
+VECTOR_EF = _vector_ef(os.getenv("COLLECTION_SEARCH_VECTOR_EF", "balanced"))
+
+#: For `_vectors` tables built with `MANTICORE_VECTOR_QUANTIZATION`: fetch this many
+#: times k from the quantized graph and rescore them at full precision, which buys back
+#: most of the recall quantization costs. 0 leaves both options out of the query — the
+#: right value for float32 tables, which have nothing to rescore.
+VECTOR_OVERSAMPLING = float(os.getenv("COLLECTION_SEARCH_VECTOR_OVERSAMPLING", "0"))
+
+
+def _knn_options() -> str:
+    """The `{...}` options block of the KNN clause."""
+    options = f"ef={VECTOR_EF}"
+    if VECTOR_OVERSAMPLING > 0:
+        options += f", oversampling={VECTOR_OVERSAMPLING:g}, rescore=1"
+    return "{" + options + "}"
+
 #: The serving model changes only when an admin re-probes; a search need not re-read
 #: server_settings on every call.
 _MODEL_CACHE_SECONDS = 300.0
@@ -58,12 +119,9 @@ _model_cache: tuple[float, str | None] = (0.0, None)
 
 _VECTORS_TABLE_RE = re.compile(r"^[a-z0-9_]+_[0-9]+_vectors$")
 
-#: Same content-hash rule as server.py — hashes heading for a SQL literal are validated
-#: first. Duplicated rather than imported to keep this module usable without the server.
-_HASH_RE = re.compile(r"^[0-9a-f]{32,128}$")
-
-
-@dataclass
+#: Slotted, not frozen: `text` is filled in after the KNN round. One per KNN hit per
+#: shard, so the per-instance `__dict__` was most of its footprint.
+@dataclass(slots=True)
 class VectorCandidate:
     collectionname: str
     collection_dataset: str
@@ -72,7 +130,8 @@ class VectorCandidate:
     page_id: int
     chunk_index: int
     dist: float
-    #: The chunk text, filled in from ClickHouse `text_chunks` after the KNN round.
+    #: The chunk text, filled in from ClickHouse `text_chunks` for the chunks that
+    #: survive fusion (:func:`attach_chunk_texts`).
     text: str = ""
 
 
@@ -97,17 +156,13 @@ def serving_model() -> str | None:
     return _model_cache[1]
 
 
-def _vector_tables(collectionname: str, existing: set[str]) -> list[str]:
+def _vector_tables(collectionname: str, existing: frozenset[str]) -> list[str]:
     """Live `_vectors` tables of one collection: the ledger's shards, intersected with
     what Manticore actually has (a shard planned before P5 existed may have none yet).
     """
-    rows = clickhouse_query(
-        "SELECT DISTINCT shard_name FROM manticore_shards FINAL ORDER BY shard_name DESC",
-        database=collection_db(collectionname),
-    )
     tables = []
-    for row in rows:
-        name = f"{row.get('shard_name') or ''}_vectors"
+    for shard in shard_names(collectionname):
+        name = f"{shard}_vectors"
         # Ledger-derived names are trusted, but the table name is interpolated into
         # SQL, so the regex is the belt to that braces.
         if _VECTORS_TABLE_RE.match(name) and name in existing:
@@ -115,11 +170,26 @@ def _vector_tables(collectionname: str, existing: set[str]) -> list[str]:
     return tables
 
 
-def _existing_tables() -> set[str]:
-    out: set[str] = set()
-    for row in manticore_query("SHOW TABLES"):
-        out.update(str(v) for v in row.values())
-    return out
+def has_vector_shards(collections: list[str]) -> bool:
+    """Whether any of `collections` has a live `_vectors` table to search.
+
+    Both inputs are cached (`shard_names`, `manticore_tables`), so this costs no query
+    in steady state. A collection still waiting for P5 — or a stack that never ran it —
+    has none, and then embedding the query would buy nothing.
+    """
+    existing = manticore_tables()
+    return any(_vector_tables(c, existing) for c in collections)
+
+
+def _vector_literal(query_vector: list[float]) -> str:
+    """The query vector as the comma list `knn()` takes, at the column's own precision.
+
+    `float_vector` stores float32, so the value is narrowed to a packed float32 array
+    first and written with 9 significant digits — enough to round-trip any float32
+    exactly. `repr` of the float64 spelled every component in up to 17 digits, roughly
+    doubling a statement that is sent once per shard.
+    """
+    return ",".join(map("{:.9g}".format, array("f", query_vector)))
 
 
 def search(query_vector: list[float], collections: list[str]) -> list[VectorCandidate]:
@@ -127,42 +197,50 @@ def search(query_vector: list[float], collections: list[str]) -> list[VectorCand
 
     Distances are comparable across shards (one model, cosine), so the per-shard lists
     merge into a single ranking by `knn_dist()` — which is what the RRF fusion then
-    consumes as the `vector` source.
+    consumes as the `vector` source. The candidates come back without text: see
+    :func:`attach_chunk_texts`.
     """
     if not query_vector or not collections:
         return []
 
-    vector_csv = ",".join(repr(float(v)) for v in query_vector)
-    existing = _existing_tables()
+    # The query vector is several kB of text and identical for every shard: format it,
+    # and the rest of the clause, once per search; each shard only adds its table name.
+    knn_tail = (
+        f" WHERE knn(embedding, {VECTOR_PER_SHARD}, ({_vector_literal(query_vector)}), "
+        f"{_knn_options()}) ORDER BY dist ASC LIMIT {VECTOR_PER_SHARD}"
+    )
+    existing = manticore_tables()
+    # Every shard's KNN runs at once: one after another, a search over many shards paid
+    # the sum of their latencies for rankings that do not depend on each other. Results
+    # are read in submission order, so the merge does not depend on who answered first.
+    shard_futures = [
+        (collectionname, table, _KNN_POOL.submit(manticore_query, _VECTOR_SELECT + table + knn_tail))
+        for collectionname in collections
+        for table in _vector_tables(collectionname, existing)
+    ]
     hits: list[VectorCandidate] = []
-    for collectionname in collections:
-        for table in _vector_tables(collectionname, existing):
-            sql = (
-                f"SELECT collection_dataset, file_hash, extracted_by, page_id, chunk_index, "
-                f"knn_dist() AS dist FROM {table} "
-                f"WHERE knn(embedding, {VECTOR_PER_SHARD}, ({vector_csv})) "
-                f"ORDER BY dist ASC LIMIT {VECTOR_PER_SHARD}"
-            )
-            try:
-                rows = manticore_query(sql)
-            except Exception as exc:  # noqa: BLE001 - one bad shard must not blank the search
-                log.warning("vector shard %s failed: %s", table, exc)
-                continue
-            for row in rows:
-                hits.append(
-                    VectorCandidate(
-                        collectionname=collectionname,
-                        collection_dataset=str(row.get("collection_dataset") or ""),
-                        file_hash=str(row.get("file_hash") or ""),
-                        extracted_by=str(row.get("extracted_by") or ""),
-                        page_id=int(row.get("page_id") or 0),
-                        chunk_index=int(row.get("chunk_index") or 0),
-                        dist=float(row.get("dist") or 0.0),
-                    )
+    for collectionname, table, future in shard_futures:
+        try:
+            rows = future.result()
+        except Exception as exc:  # noqa: BLE001 - one bad shard must not blank the search
+            log.warning("vector shard %s failed: %s", table, exc)
+            forget_shards(collectionname)
+            continue
+        for row in map(_VECTOR_ROW, rows):
+            dataset, file_hash, extracted_by, page_id, chunk_index, dist = row
+            hits.append(
+                VectorCandidate(
+                    collectionname=collectionname,
+                    collection_dataset=str(dataset or ""),
+                    file_hash=str(file_hash or ""),
+                    extracted_by=str(extracted_by or ""),
+                    page_id=int(page_id or 0),
+                    chunk_index=int(chunk_index or 0),
+                    dist=float(dist or 0.0),
                 )
+            )
 
     hits.sort(key=lambda h: h.dist)
-    _attach_chunk_texts(hits)
     log.info(
         "vector search: %d candidates from %d collection(s)",
         len(hits), len(collections),
@@ -170,31 +248,32 @@ def search(query_vector: list[float], collections: list[str]) -> list[VectorCand
     return hits
 
 
-def _attach_chunk_texts(hits: list[VectorCandidate]) -> None:
+def attach_chunk_texts(hits: list[VectorCandidate]) -> None:
     """Fill in each candidate's chunk text, one query per collection.
 
     The `_vectors` table carries no text (it is the disposable copy; ClickHouse
     `text_chunks` is the store of record), so a KNN hit is joined back here — the
     snippet the model reads and the document the reranker scores both come from this.
+    Called by the search after fusion, for the chunks that will be shown: the lookup
+    reads every chunk of every file it names, and doing it for the whole KNN pool read
+    them for every shard's candidates, most of which fusion then dropped.
     """
     by_collection: dict[str, list[VectorCandidate]] = {}
     for hit in hits:
         by_collection.setdefault(hit.collectionname, []).append(hit)
 
     for collectionname, group in by_collection.items():
-        hashes = sorted({h.file_hash for h in group if _HASH_RE.match(h.file_hash)})
-        if not hashes:
-            continue
-        try:
-            rows = clickhouse_query(
-                "SELECT file_hash, extracted_by, page_id, chunk_index, text "
-                "FROM text_chunks FINAL WHERE file_hash IN {hashes:Array(String)}",
-                database=collection_db(collectionname),
-                params={"hashes": "['" + "','".join(hashes) + "']"},
-            )
-        except Exception as exc:  # noqa: BLE001 - a missing snippet degrades one hit
-            log.warning("chunk text lookup failed for %s: %s", collectionname, exc)
-            continue
+        rows = []
+        for hashes in hash_arrays(h.file_hash for h in group):
+            try:
+                rows += clickhouse_query(
+                    "SELECT file_hash, extracted_by, page_id, chunk_index, text "
+                    "FROM text_chunks FINAL WHERE file_hash IN {hashes:Array(String)}",
+                    database=collection_db(collectionname),
+                    params={"hashes": hashes},
+                )
+            except Exception as exc:  # noqa: BLE001 - a missing snippet degrades one hit
+                log.warning("chunk text lookup failed for %s: %s", collectionname, exc)
         texts = {
             (r["file_hash"], r["extracted_by"], int(r["page_id"]), int(r["chunk_index"])): r["text"]
             for r in rows
@@ -0,0 +1,93 @@
+"""Tests for the shard-ledger cache in collection_search_server.backends."""
+
+import pytest
+
+from collection_search_server import backends
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    """Counts ledger reads; `rows` is what the next read returns."""
+    state = {"reads": 0, "rows": [{"shard_name": "coll_2"}, {"shard_name": "coll_1"}]}
+
+    def fake_clickhouse_query(sql, database, params=None):
+        state["reads"] += 1
+        return state["rows"]
+
+    monkeypatch.setattr(backends, "clickhouse_query", fake_clickhouse_query)
+    monkeypatch.setattr(backends, "_shard_cache", {})
+    return state
+
+
+def test_ledger_is_read_once_per_window(ledger):
+    assert backends.shard_names("coll") == ("coll_2", "coll_1")
+    assert backends.shard_names("coll") == ("coll_2", "coll_1")
+    assert ledger["reads"] == 1
+
+
+def test_empty_ledger_is_not_cached(ledger):
+    """The first shard P6 writes must be searchable on the next call."""
+    ledger["rows"] = []
+    assert backends.shard_names("coll") == ()
+    ledger["rows"] = [{"shard_name": "coll_1"}]
+    assert backends.shard_names("coll") == ("coll_1",)
+    assert ledger["reads"] == 2
+
+
+def test_failed_shard_drops_the_cached_view(ledger):
+    backends.shard_names("coll")
+    backends.forget_shards("coll")
+    backends.shard_names("coll")
+    assert ledger["reads"] == 2
+
+
+def test_window_expires(ledger, monkeypatch):
+    monkeypatch.setattr(backends, "SHARD_CACHE_SECONDS", 0.0)
+    backends.shard_names("coll")
+    backends.shard_names("coll")
+    assert ledger["reads"] == 2
+
+
+def test_queries_share_one_keep_alive_session(monkeypatch):
+    sessions = []
+
+    class _Response:
+        status_code = 200
+        text = '{"v": 1}\n'
+
+        def json(self):
+            return [{"data": [{"v": 1}]}]
+
+    real_session = backends._session
+
+    def spying_session():
+        session = real_session()
+        sessions.append(session)
+        monkeypatch.setattr(session, "post", lambda *a, **kw: _Response())
+        return session
+
+    monkeypatch.setattr(backends, "_SESSION", None)
+    monkeypatch.setattr(backends, "_session", spying_session)
+    assert backends.clickhouse_query("SELECT 1", "db") == [{"v": 1}]
+    assert backends.manticore_query("SELECT 1") == [{"v": 1}]
+    assert len(sessions) == 2 and sessions[0] is sessions[1]
+
+
+def test_row_getter_unpacks_in_column_order_and_tolerates_a_missing_column():
+    get = backends.row_getter(("a", "b", "c"))
+    assert get({"c": 3, "a": 1, "b": 2, "extra": 9}) == (1, 2, 3)
+    # An older shard without `c` must not fail the whole shard.
+    assert get({"a": 1, "b": 2}) == (1, 2, None)
+
+
+def test_hash_arrays_validate_dedupe_and_split(monkeypatch):
+    """The arrays are interpolated by hand, so only content hashes may reach them — and a
+    big lookup is split rather than sent as one literal."""
+    monkeypatch.setattr(backends, "IN_BATCH", 2)
+    good = ["c" * 64, "a" * 64, "b" * 64, "a" * 64]
+    bad = ["x' OR 1=1 --", "", "A" * 64]
+    assert backends.hash_arrays(good + bad) == [
+        f"['{'a' * 64}','{'b' * 64}']",
+        f"['{'c' * 64}']",
+    ]
+    assert backends.hash_arrays(bad) == []
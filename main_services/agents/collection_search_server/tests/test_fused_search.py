@@ -1,9 +1,12 @@
 """Tests for the hybrid (keyword + vector) search pipeline in search_collections."""
 
+import time
+
 import pytest
 
 from agent_common import rerank as rerank_client
 from collection_search_server import server
+from collection_search_server.acl import CallerAcl
 from collection_search_server.vectors import VectorCandidate
 
 H1 = "a" * 32
@@ -27,6 +30,16 @@ def _vector(
     )
 
 
+def _shard_row(id_: int, page: int, score: float) -> dict:
+    """One keyword row as a shard answers it: no page text, that is fetched by id."""
+    return {"id": id_, "collection_dataset": "coll_ds", "file_hash": H1, "page_id": page, "score": score}
+
+
+@pytest.fixture(autouse=True)
+def _no_cached_pools(monkeypatch):
+    monkeypatch.setattr(server, "_pool_cache", server.OrderedDict())
+
+
 def _identity_rerank(monkeypatch):
     """A reranker that keeps the fused order, so a test can be about something else."""
     monkeypatch.setattr(
@@ -141,6 +154,24 @@ class TestFusedSnippet:
             2: "page two passage",
         }
 
+    def test_chunk_text_is_fetched_only_for_pages_that_survive_fusion(self, monkeypatch):
+        """The KNN pool comes back without text; reading the chunks of every file in it
+        moved text for candidates fusion was about to drop."""
+        asked = []
+
+        def text_chunks(sql, database, params):
+            asked.append(params["hashes"])
+            return [{"file_hash": H1, "extracted_by": "tika", "page_id": 1,
+                     "chunk_index": 0, "text": "the nearest passage"}]
+
+        monkeypatch.setattr(server.vectors, "clickhouse_query", text_chunks)
+        monkeypatch.setattr(server, "FUSION_CANDIDATES", 1)
+        vector = [_vector(H1, 1, 0.05, ""), _vector(H2, 1, 0.10, ""), _vector(H3, 1, 0.20, "")]
+        hits = server._fused_pipeline("q", [], vector, limit=10, notes=[])
+
+        assert asked == [f"['{H1}']"]
+        assert [h.snippet for h in hits] == ["the nearest passage"]
+
 
 class TestPartialRerank:
     def test_candidates_the_reranker_skipped_are_kept_in_fused_order(self, monkeypatch):
@@ -157,3 +188,233 @@ class TestPartialRerank:
         )
         hits = server._fused_pipeline("q", keyword, [], limit=10, notes=[])
         assert [h.snippet for h in hits] == ["third", "first", "second"]
+
+    def test_a_single_candidate_skips_the_rerank_round_trip(self, monkeypatch):
+        def must_not_rerank(query, documents, model=None):
+            raise AssertionError("one candidate has nothing to reorder")
+
+        monkeypatch.setattr(rerank_client, "rerank", must_not_rerank)
+        notes: list[str] = []
+        hits = server._fused_pipeline("q", [_keyword(H1, 1, 5.0, "only")], [], limit=10, notes=notes)
+
+        assert [h.file_hash for h in hits] == [H1]
+        assert "reranked" not in notes[-1]
+
+
+class TestConvexFusion:
+    def test_cc_follows_score_gaps_rrf_would_tie(self, monkeypatch):
+        """Under RRF, H1 (keyword 1st, vector 2nd) and H2 (keyword 2nd, vector 1st) tie on
+        rank; under `cc` the vector branch's much closer match for H2 decides it."""
+        _identity_rerank(monkeypatch)
+        monkeypatch.setattr(server, "FUSION", "cc")
+        monkeypatch.setattr(server, "CC_WEIGHTS", {"keyword": 1.0, "vector": 1.0})
+        keyword = [
+            _keyword(H1, 1, 10.0, "one"), _keyword(H2, 1, 9.9, "two"), _keyword(H3, 1, 1.0, "three"),
+        ]
+        vector = [_vector(H2, 1, 0.05, "two"), _vector(H1, 1, 0.80, "one"), _vector(H3, 2, 0.85, "x")]
+
+        hits = server._fused_pipeline("q", keyword, vector, limit=10, notes=[])
+
+        assert [h.file_hash for h in hits[:2]] == [H2, H1]
+        assert hits[0].match_sources == ["keyword", "vector"]
+
+
+class TestShardFanOut:
+    def _install(self, monkeypatch, query_fn):
+        monkeypatch.setattr(server, "_caller", lambda: CallerAcl(username="u", collections=("coll",)))
+        monkeypatch.setattr(server, "_shard_tables", lambda c: ["coll_1", "coll_2", "coll_3"])
+        monkeypatch.setattr(server, "clickhouse_query", lambda *args, **kwargs: [])
+        monkeypatch.setattr(server.embeddings_client, "endpoint", lambda: None)
+        monkeypatch.setattr(server, "manticore_query", query_fn)
+
+    def test_shards_are_queried_concurrently(self, monkeypatch):
+        """Three shards that each take 0.2 s answer in about 0.2 s, not 0.6 s — and the
+        merge does not depend on which one answered first."""
+
+        def slow_shard(sql):
+            time.sleep(0.2)
+            table = sql.split(" FROM ")[1].split()[0]
+            n = int(table.split("_")[1])
+            if sql.startswith("SELECT id, page_text"):
+                return [{"id": n, "page_text": f"text of {table}"}]
+            return [_shard_row(n, n, 10 - n)]
+
+        self._install(monkeypatch, slow_shard)
+        started = time.monotonic()
+        response = server.search_collections.fn("needle")
+        elapsed = time.monotonic() - started
+
+        # Both rounds — the shard queries and the page-text fetch — run in parallel.
+        assert elapsed < 0.7
+        assert [h.page_id for h in response.results] == [1, 2, 3]
+        assert [h.snippet for h in response.results] == [
+            "text of coll_1", "text of coll_2", "text of coll_3",
+        ]
+
+    def test_paths_are_looked_up_beside_the_page_text(self, monkeypatch):
+        """Without fusion the hits are known once the shards answer, so the ClickHouse
+        path lookup runs beside the Manticore page-text fetch instead of after it."""
+
+        def shard(sql):
+            if sql.startswith("SELECT id, page_text"):
+                time.sleep(0.2)
+                return [{"id": 1, "page_text": "the page"}]
+            return [_shard_row(1, 1, 5)]
+
+        def slow_paths(sql, **kwargs):
+            time.sleep(0.2)
+            return [{"hash": H1, "path": "/docs/a.pdf"}]
+
+        self._install(monkeypatch, shard)
+        monkeypatch.setattr(server, "_shard_tables", lambda c: ["coll_1"])
+        monkeypatch.setattr(server, "clickhouse_query", slow_paths)
+        started = time.monotonic()
+        response = server.search_collections.fn("needle")
+
+        assert time.monotonic() - started < 0.35
+        assert [(h.snippet, h.path) for h in response.results] == [("the page", "/docs/a.pdf")]
+
+    def test_a_failed_shard_is_reported_and_the_rest_answer(self, monkeypatch):
+        def flaky(sql):
+            if "coll_2" in sql:
+                raise RuntimeError("Manticore query failed: shard is broken")
+            return [_shard_row(1, 0, 1)]
+
+        self._install(monkeypatch, flaky)
+        response = server.search_collections.fn("needle")
+
+        assert response.success
+        assert len(response.results) == 2
+        assert "1 shard(s) could not be queried" in response.note
+
+    def test_keyword_profile_picks_the_ranker(self, monkeypatch):
+        assert server._keyword_ranker("fast") == "bm25"
+        assert server._keyword_ranker("Balanced") == "proximity_bm25"
+        assert server._keyword_ranker("recall") == "sph04"
+        assert server._keyword_ranker("wordcount") == "wordcount"
+        # Goes into SQL verbatim, so anything that is not a bare name is refused.
+        assert server._keyword_ranker("bm25; DROP") == "proximity_bm25"
+
+        sent = []
+        self._install(monkeypatch, lambda sql: sent.append(sql) or [])
+        monkeypatch.setattr(server, "KEYWORD_RANKER", "bm25")
+        server.search_collections.fn("needle")
+        assert sent and all(sql.endswith(", ranker=bm25") for sql in sent)
+
+    def test_page_text_is_fetched_only_for_the_hits_shown(self, monkeypatch):
+        """Shard rows carry no page text; it is fetched afterwards, by id, for the hits
+        that made the cut — never for the pool fusion threw away."""
+        sent = []
+
+        def shard(sql):
+            sent.append(sql)
+            if sql.startswith("SELECT id, page_text"):
+                return [{"id": 2, "page_text": "x" * 5000}]
+            return [_shard_row(i, i, 100 - i) for i in range(1, 10)]
+
+        self._install(monkeypatch, shard)
+        monkeypatch.setattr(server, "_shard_tables", lambda c: ["coll_1"])
+        response = server.search_collections.fn("needle", max_results=2)
+
+        search_sql, fetch_sql = sent
+        assert "page_text" not in search_sql
+        assert fetch_sql.startswith("SELECT id, page_text FROM coll_1 WHERE id IN (1,2) LIMIT 2")
+        assert [h.snippet for h in response.results] == ["", "x" * server.SNIPPET_CHARS]
+
+    def test_no_vector_shards_means_no_query_embedding(self, monkeypatch):
+        def must_not_embed(*args, **kwargs):
+            raise AssertionError("nothing to search the vector against")
+
+        self._install(monkeypatch, lambda sql: [])
+        monkeypatch.setattr(server.embeddings_client, "endpoint", lambda: "http://gpu.test/v1")
+        monkeypatch.setattr(server.embeddings_client, "embed_query", must_not_embed)
+        monkeypatch.setattr(server.vectors, "serving_model", lambda: "intfloat/multilingual-e5-small")
+        monkeypatch.setattr(server.vectors, "has_vector_shards", lambda targets: False)
+
+        response = server.search_collections.fn("needle")
+
+        assert response.success
+        assert "no vector index for these collections yet" in response.note
+
+    def test_model_read_and_vector_shard_listing_overlap(self, monkeypatch):
+        """Neither lookup needs the other, so on a cold cache they cost the slower of
+        the two, not the sum."""
+
+        def slow_model():
+            time.sleep(0.2)
+            return "intfloat/multilingual-e5-small"
+
+        def slow_listing(targets):
+            time.sleep(0.2)
+            return False
+
+        self._install(monkeypatch, lambda sql: [])
+        monkeypatch.setattr(server.embeddings_client, "endpoint", lambda: "http://gpu.test/v1")
+        monkeypatch.setattr(server.vectors, "serving_model", slow_model)
+        monkeypatch.setattr(server.vectors, "has_vector_shards", slow_listing)
+
+        started = time.monotonic()
+        response = server.search_collections.fn("needle")
+
+        assert time.monotonic() - started < 0.35
+        assert "no vector index for these collections yet" in response.note
+
+    def test_a_wider_repeat_of_a_fused_search_reuses_its_pools(self, monkeypatch):
+        """The fused pools are deeper than any page, so asking again for more results
+        re-fuses what the first search fetched instead of querying every shard again."""
+        sent = []
+        embedded = []
+
+        def shard(sql):
+            sent.append(sql)
+            if sql.startswith("SELECT id, page_text"):
+                return [{"id": i, "page_text": f"page {i}"} for i in range(1, 10)]
+            return [_shard_row(i, i, 100 - i) for i in range(1, 10)]
+
+        self._install(monkeypatch, shard)
+        monkeypatch.setattr(server, "_shard_tables", lambda c: ["coll_1"])
+        monkeypatch.setattr(server.embeddings_client, "endpoint", lambda: "http://gpu.test/v1")
+        monkeypatch.setattr(server.vectors, "serving_model", lambda: "intfloat/multilingual-e5-small")
+        monkeypatch.setattr(server.vectors, "has_vector_shards", lambda targets: True)
+        monkeypatch.setattr(server.embeddings_client, "embed_query",
+                            lambda query, model: embedded.append(query) or [1.0, 0.0])
+        monkeypatch.setattr(server.vectors, "search",
+                            lambda vector, targets: [_vector(H2, 1, 0.1, "chunk text")])
+        _identity_rerank(monkeypatch)
+
+        first = server.search_collections.fn("needle", max_results=3)
+        queries_after_first = len(sent)
+        second = server.search_collections.fn("needle", max_results=8)
+
+        assert len(embedded) == 1
+        assert len(sent) == queries_after_first
+        shown = {(h.file_hash, h.page_id) for h in second.results}
+        assert {(h.file_hash, h.page_id) for h in first.results} <= shown
+        assert len(second.results) == 8
+
+        server.search_collections.fn("another needle", max_results=3)
+        assert len(embedded) == 2
+
+
+class TestDocumentText:
+    def test_pages_are_cut_to_the_cap_before_they_cross_the_wire(self, monkeypatch):
+        """The database slices each page one character past the cap, so a huge page
+        costs only the cap to transfer and the reply still knows it was cut."""
+        pages = ["x" * 50, "y" * 500]
+        seen = []
+
+        def fake_clickhouse(sql, database=None, params=None):
+            seen.append(params)
+            if "vfs_files" in sql:
+                return [{"path": "/ledger.pdf"}]
+            return [{"text": p[:params["chars"]]} for p in pages]
+
+        monkeypatch.setattr(server, "_caller", lambda: CallerAcl(username="u", collections=("coll",)))
+        monkeypatch.setattr(server, "clickhouse_query", fake_clickhouse)
+        monkeypatch.setattr(server, "MAX_DOCUMENT_CHARS", 100)
+
+        doc = server.get_document_text.fn("coll", H1)
+
+        assert seen[0]["chars"] == 101
+        assert doc.truncated
+        assert doc.text == "x" * 50 + "\n\n" + "y" * 48
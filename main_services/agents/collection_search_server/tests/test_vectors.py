@@ -0,0 +1,82 @@
+"""Tests for the KNN query the vector half of collection search sends."""
+
+import time
+
+from collection_search_server import vectors
+
+H1 = "a" * 32
+# A model-sized query vector whose components are not exact in float32, built once.
+QUERY_384 = [0.1 + i / 7 for i in range(384)]
+
+
+def test_ef_profiles_and_the_k_floor():
+    k = vectors.VECTOR_PER_SHARD
+    assert vectors._vector_ef("fast") == k
+    assert vectors._vector_ef("Balanced") == 2 * k
+    assert vectors._vector_ef("recall") == 8 * k
+    assert vectors._vector_ef(str(k * 10)) == k * 10
+    assert vectors._vector_ef("1") == k  # HNSW never searches narrower than k
+    assert vectors._vector_ef("nonsense") == 2 * k
+
+
+def test_knn_carries_ef_and_is_bounded(monkeypatch):
+    sent = []
+
+    def fake_manticore_query(sql):
+        sent.append(sql)
+        return [{"collection_dataset": "ds", "file_hash": H1, "extracted_by": "tika",
+                 "page_id": 1, "chunk_index": 0, "dist": 0.25}]
+
+    monkeypatch.setattr(vectors, "manticore_query", fake_manticore_query)
+    monkeypatch.setattr(vectors, "manticore_tables", lambda: frozenset({"coll_1_vectors"}))
+    monkeypatch.setattr(vectors, "shard_names", lambda c: ("coll_1",))
+    monkeypatch.setattr(vectors, "clickhouse_query", lambda *a, **kw: [])
+    monkeypatch.setattr(vectors, "VECTOR_EF", 240)
+
+    hits = vectors.search([0.5, 0.25], ["coll"])
+
+    assert [h.file_hash for h in hits] == [H1]
+    (sql,) = sent
+    assert f"knn(embedding, {vectors.VECTOR_PER_SHARD}, (0.5,0.25), {{ef=240}})" in sql
+    assert sql.endswith(f"LIMIT {vectors.VECTOR_PER_SHARD}")
+
+
+def test_shards_are_searched_concurrently_and_merged_by_distance(monkeypatch):
+    """Three shards that each take 0.2 s answer in about 0.2 s, and a failed shard
+    drops out without taking the others with it."""
+
+    def slow_shard(sql):
+        time.sleep(0.2)
+        n = int(sql.split(" FROM ")[1].split("_")[1])
+        if n == 2:
+            raise RuntimeError("shard down")
+        return [{"collection_dataset": "ds", "file_hash": H1, "extracted_by": "tika",
+                 "page_id": n, "chunk_index": 0, "dist": 1.0 / n}]
+
+    tables = frozenset({"coll_1_vectors", "coll_2_vectors", "coll_3_vectors"})
+    monkeypatch.setattr(vectors, "manticore_query", slow_shard)
+    monkeypatch.setattr(vectors, "manticore_tables", lambda: tables)
+    monkeypatch.setattr(vectors, "shard_names", lambda c: ("coll_3", "coll_2", "coll_1"))
+    monkeypatch.setattr(vectors, "forget_shards", lambda c: None)
+
+    started = time.monotonic()
+    hits = vectors.search([0.5, 0.25], ["coll"])
+
+    assert time.monotonic() - started < 0.35
+    assert [h.page_id for h in hits] == [3, 1]
+
+
+def test_vector_literal_round_trips_float32_and_is_short():
+    from array import array
+
+    literal = vectors._vector_literal(QUERY_384)
+    parsed = array("f", (float(v) for v in literal.split(",")))
+    assert parsed == array("f", QUERY_384)  # nothing the float32 column could hold is lost
+    assert len(literal) < len(",".join(repr(v) for v in QUERY_384)) * 0.7
+
+
+def test_oversampling_asks_for_a_full_precision_rescore(monkeypatch):
+    monkeypatch.setattr(vectors, "VECTOR_EF", 120)
+    assert vectors._knn_options() == "{ef=120}"
+    monkeypatch.setattr(vectors, "VECTOR_OVERSAMPLING", 3.0)
+    assert vectors._knn_options() == "{ef=120, oversampling=3, rescore=1}"
@@ -205,35 +205,41 @@ async def run_search(
     # Step 3: rerank the whole candidate pool — before the floor, never after. See the
     # module docstring for why the reverse reads identically and is wrong.
     ordered = list(outcome.fused)
-    try:
-        scores, rerank_ms = rerank_client.rerank(
-            query, [_rerank_document(item.result) for item in outcome.fused]
-        )
-        outcome.rerank_ms = round(rerank_ms, 1)
-        if scores:
-            ordered = []
-            seen: set[int] = set()
-            for position, score in enumerate(scores, start=1):
-                if 0 <= score.index < len(outcome.fused) and score.index not in seen:
-                    seen.add(score.index)
-                    item = outcome.fused[score.index]
-                    item.rerank_rank = position
-                    item.rerank_score = round(score.score, 6)
-                    ordered.append(item)
-            # A response that scored only some of the candidates (a `top_k` the server
-            # applied, a truncated body) must not *delete* the rest: they were real
-            # results with a real RRF position, and dropping them turns a partial rerank
-            # into a partial search. They keep their fused order, behind everything the
-            # cross-encoder did score, with no rerank rank — which is exactly true.
-            ordered += [item for i, item in enumerate(outcome.fused) if i not in seen]
-            outcome.rerank_applied = True
-    except rerank_client.RerankUnavailable as exc:
-        # Visible, never silent: the card shows an unreranked search as unreranked.
-        log.warning("rerank unavailable, falling back to RRF order: %s", exc)
-        outcome.rerank_error = str(exc)
-    except Exception as exc:  # noqa: BLE001 - a search must still answer
-        log.exception("rerank failed unexpectedly")
-        outcome.rerank_error = str(exc)
+    # One candidate has exactly one order: the cross-encoder round trip could only
+    # confirm it, and a narrow query on a single source lands here often.
+    if len(outcome.fused) > 1:
+        try:
+            scores, rerank_ms = await rerank_client.arerank(
+                query, [_rerank_document(item.result) for item in outcome.fused]
+            )
+            outcome.rerank_ms = round(rerank_ms, 1)
+            if scores:
+                ordered = []
+                seen: set[int] = set()
+                n = len(outcome.fused)
+                for position, score in enumerate(scores, start=1):
+                    if 0 <= score.index < n and score.index not in seen:
+                        seen.add(score.index)
+                        item = outcome.fused[score.index]
+                        item.rerank_rank = position
+                        item.rerank_score = round(score.score, 6)
+                        ordered.append(item)
+                # A response that scored only some of the candidates (a `top_k` the server
+                # applied, a truncated body) must not *delete* the rest: they were real
+                # results with a real RRF position, and dropping them turns a partial rerank
+                # into a partial search. They keep their fused order, behind everything the
+                # cross-encoder did score, with no rerank rank — which is exactly true.
+                # A full response — the usual one — has nothing left over to look for.
+                if len(seen) < n:
+                    ordered += [item for i, item in enumerate(outcome.fused) if i not in seen]
+                outcome.rerank_applied = True
+        except rerank_client.RerankUnavailable as exc:
+            # Visible, never silent: the card shows an unreranked search as unreranked.
+            log.warning("rerank unavailable, falling back to RRF order: %s", exc)
+            outcome.rerank_error = str(exc)
+        except Exception as exc:  # noqa: BLE001 - a search must still answer
+            log.exception("rerank failed unexpectedly")
+            outcome.rerank_error = str(exc)
 
     # Step 4: the per-kind floor, which also applies the caller's cap.
     outcome.ranked = apply_per_kind_floor(ordered, max_results=max(1, max_results))
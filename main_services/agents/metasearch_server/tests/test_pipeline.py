@@ -15,6 +15,24 @@ from metasearch_server.engines import SearchResult
 from metasearch_server.pipeline import Ranked, apply_per_kind_floor
 
 
+def _answer(result):
+    """A stand-in for `rerank_client.arerank` that returns `result`."""
+
+    async def arerank(query, documents, model=None):
+        return result
+
+    return arerank
+
+
+def _refuse(exc):
+    """A stand-in for `rerank_client.arerank` that raises `exc`."""
+
+    async def arerank(query, documents, model=None):
+        raise exc
+
+    return arerank
+
+
 def _ranked(kind: str, index: int, rerank_score: float | None = None) -> Ranked:
     return Ranked(
         result=SearchResult(f"t{index}", f"https://e{index}.example", kind=kind),
@@ -148,10 +166,10 @@ class TestRunSearch:
             {"ddg": [SearchResult("a", "https://a.example"), SearchResult("b", "https://b.example")]},
         )
 
-        def dead(query, documents, model=None):
+        async def dead(query, documents, model=None):
             raise rerank_client.RerankUnavailable("circuit open")
 
-        monkeypatch.setattr(rerank_client, "rerank", dead)
+        monkeypatch.setattr(rerank_client, "arerank", dead)
 
         outcome = asyncio.run(pipeline.run_search("q", max_results=10))
         assert outcome.rerank_applied is False
@@ -167,14 +185,14 @@ class TestRunSearch:
             {"ddg": [SearchResult("a", "https://a.example"), SearchResult("b", "https://b.example")]},
         )
 
-        def flip(query, documents, model=None):
+        async def flip(query, documents, model=None):
             # Reverse the fused order, so a wrong "rerank did nothing" would be visible.
             return [
                 rerank_client.RerankScore(index=1, score=9.0),
                 rerank_client.RerankScore(index=0, score=1.0),
             ], 12.0
 
-        monkeypatch.setattr(rerank_client, "rerank", flip)
+        monkeypatch.setattr(rerank_client, "arerank", flip)
 
         outcome = asyncio.run(pipeline.run_search("q", max_results=10))
         assert outcome.rerank_applied is True
@@ -190,9 +208,7 @@ class TestRunSearch:
             monkeypatch, {"ddg": [SearchResult("a", "https://a.example")], "brave": []}
         )
         monkeypatch.setattr(
-            rerank_client,
-            "rerank",
-            lambda q, d, model=None: (_ for _ in ()).throw(rerank_client.RerankUnavailable("no")),
+            rerank_client, "arerank", _refuse(rerank_client.RerankUnavailable("no"))
         )
         outcome = asyncio.run(pipeline.run_search("q"))
         assert outcome.degraded == ["brave"]
@@ -200,6 +216,18 @@ class TestRunSearch:
         assert outcome.degraded_reasons["brave"]
         assert len(outcome.ranked) == 1
 
+    def test_a_single_candidate_is_not_sent_to_the_reranker(self, monkeypatch):
+        """One result has one order; the cross-encoder could only confirm it."""
+        self._stub_sources(monkeypatch, {"ddg": [SearchResult("a", "https://a.example")]})
+
+        async def must_not_rerank(query, documents, model=None):
+            raise AssertionError("one candidate needs no rerank")
+
+        monkeypatch.setattr(rerank_client, "arerank", must_not_rerank)
+        outcome = asyncio.run(pipeline.run_search("q", max_results=10))
+        assert not outcome.rerank_error
+        assert [r.result.url for r in outcome.ranked] == ["https://a.example"]
+
     def test_a_partial_rerank_response_does_not_delete_the_rest(self, monkeypatch):
         """C7: the reranker scored one of three candidates (a `top_k`, a truncated body).
         The two it skipped are real results with a real RRF position; dropping them turns
@@ -210,8 +238,8 @@ class TestRunSearch:
         )
         monkeypatch.setattr(
             rerank_client,
-            "rerank",
-            lambda q, d, model=None: ([rerank_client.RerankScore(index=2, score=9.0)], 3.0),
+            "arerank",
+            _answer(([rerank_client.RerankScore(index=2, score=9.0)], 3.0)),
         )
         outcome = asyncio.run(pipeline.run_search("q", max_results=10))
         assert outcome.rerank_applied is True
@@ -231,14 +259,14 @@ class TestRunSearch:
         )
         monkeypatch.setattr(
             rerank_client,
-            "rerank",
-            lambda q, d, model=None: (
+            "arerank",
+            _answer((
                 [
                     rerank_client.RerankScore(index=1, score=9.0),
                     rerank_client.RerankScore(index=1, score=8.0),
                 ],
                 3.0,
-            ),
+            )),
         )
         outcome = asyncio.run(pipeline.run_search("q", max_results=10))
         assert [r.result.url for r in outcome.ranked] == [
@@ -132,6 +132,33 @@ class OcrPdfResponse(BaseModel):
     run_time_ms: int
 
 
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _session() -> requests.Session:
+    """One keep-alive session for every page sent to the OCR tier.
+
+    A PDF is OCR'd page by page, and a bare ``requests.post`` opened a fresh TCP
+    connection for each page to the host it had just talked to. Sized for the pool's
+    workers; no adapter retries, so a 503 from a full OCR queue still reaches the caller
+    as backpressure instead of being retried underneath it.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=2, pool_maxsize=OCR_PDF_CONCURRENCY, max_retries=0,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
 def _minio():
     from minio import Minio
 
@@ -172,7 +199,7 @@ def _ocr_page(engine: str, languages: str, image_bytes: bytes) -> dict:
         "languages": languages,
     }
     try:
-        response = requests.post(url, json=payload, timeout=(5, OCR_READ_TIMEOUT))
+        response = _session().post(url, json=payload, timeout=(5, OCR_READ_TIMEOUT))
     except requests.RequestException as exc:
         raise HTTPException(status_code=503, detail=f"OCR tier unreachable: {exc}")
     if response.status_code == 503:
@@ -20,6 +20,7 @@ interpolate anything else.
 
 from contextlib import contextmanager
 import logging
+import os
 import re
 
 log = logging.getLogger(__name__)
@@ -33,6 +34,29 @@ PAGES_TABLE_SUFFIX = 'pages'
 META_TABLE_SUFFIX = 'meta'
 VECTORS_TABLE_SUFFIX = 'vectors'
 
+# HNSW graph parameters of new ``_vectors`` tables, spelled out rather than left to the
+# daemon's defaults (the same 16 / 200) so a Manticore upgrade cannot change them
+# underneath an index. Like ``knn_dims`` they are fixed at creation: a change applies to
+# tables built after it, i.e. after ``main.py reindex-collection``. Query-time ``ef`` is
+# the search side's knob (collection_search_server ``vectors.py``).
+HNSW_M = int(os.getenv('MANTICORE_HNSW_M', '16'))
+HNSW_EF_CONSTRUCTION = int(os.getenv('MANTICORE_HNSW_EF_CONSTRUCTION', '200'))
+
+# Scalar quantization of new ``_vectors`` tables: ``8bit`` stores each component in a
+# byte instead of a float32 (4x less RAM per chunk, roughly double the KNN throughput,
+# a recall cost usually under a point for cosine text embeddings), ``4bit`` / ``1bit``
+# trade further. Empty keeps full float32 — the default, because the HNSW budget in
+# ops/Readme.md is sized for it and a recall change must be a decision, not an upgrade
+# side effect. Fixed at creation like the rest of the column; pair it with
+# ``COLLECTION_SEARCH_VECTOR_OVERSAMPLING`` on the search side so the shortlist is
+# rescored at full precision.
+_QUANTIZATIONS = ('', '8bit', '4bit', '1bit', '1bitsimple')
+VECTOR_QUANTIZATION = (os.getenv('MANTICORE_VECTOR_QUANTIZATION') or '').strip().lower()
+if VECTOR_QUANTIZATION not in _QUANTIZATIONS:
+    log.warning('MANTICORE_VECTOR_QUANTIZATION=%r is not one of %s; storing float32',
+                VECTOR_QUANTIZATION, '/'.join(q for q in _QUANTIZATIONS if q))
+    VECTOR_QUANTIZATION = ''
+
 
 @contextmanager
 def get_manticore_client():
@@ -213,6 +237,7 @@ def vectors_table_ddl(table_name: str, dims: int) -> str:
     """
     if not isinstance(dims, int) or isinstance(dims, bool) or not 1 <= dims <= 65535:
         raise ValueError(f'knn_dims must be an int in [1, 65535], got {dims!r}')
+    quantization = f" quantization='{VECTOR_QUANTIZATION}'" if VECTOR_QUANTIZATION else ''
     return f"""
         create table if not exists {table_name}(
             collection_dataset string,
@@ -221,6 +246,7 @@ def vectors_table_ddl(table_name: str, dims: int) -> str:
             page_id int,
             chunk_index int,
             embedding float_vector knn_type='hnsw' knn_dims='{dims}' hnsw_similarity='COSINE'
+                hnsw_m='{HNSW_M}' hnsw_ef_construction='{HNSW_EF_CONSTRUCTION}'{quantization}
         )
     """
 
@@ -24,24 +24,38 @@ def get_minio_client() -> Minio:
     )
 
 
+# Buckets this process has seen exist. Nothing in the pipeline deletes a bucket, and
+# P0 calls `ensure_bucket` before every new blob it uploads, so asking MinIO each time
+# was a round trip per file for an answer that never changes.
+_known_buckets: set[str] = set()
+
+
 def ensure_bucket(bucket_name: str) -> None:
     """Create the bucket if it does not already exist."""
+    if bucket_name in _known_buckets:
+        return
     client = get_minio_client()
     try:
-        if client.bucket_exists(bucket_name):
-            return
-        log.info(f"Creating s3 bucket {bucket_name}")
-        client.make_bucket(bucket_name)
+        if not client.bucket_exists(bucket_name):
+            log.info(f"Creating s3 bucket {bucket_name}")
+            client.make_bucket(bucket_name)
     except S3Error as exc:
         # If another process created it in the meantime, ignore AlreadyOwnedByYou/BucketAlreadyOwnedByYou
         if exc.code not in {"BucketAlreadyOwnedByYou", "BucketAlreadyExists"}:
             raise
+    _known_buckets.add(bucket_name)
+
+
+def forget_bucket(bucket_name: str) -> None:
+    """Drop a bucket from the existence cache, for callers that delete it out of band."""
+    _known_buckets.discard(bucket_name)
 
 
 __all__ = [
     "BUCKET_NAME",
     "get_minio_client",
     "ensure_bucket",
+    "forget_bucket",
 ]
 
 
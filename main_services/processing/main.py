@@ -348,7 +348,10 @@ def purge_unattributed_entities(collectionname: str, apply: bool):
 
 @cli.command(name="backfill-vectors")
 @click.argument("collectionname", type=str)
-def backfill_vectors(collectionname: str):
+@click.option("--concurrency", type=click.IntRange(min=1), default=1, show_default=True,
+              help="Plans processed at once. Each plan still runs P5 then P6; raise "
+                   "this for a cold load of a large collection.")
+def backfill_vectors(collectionname: str, concurrency: int):
     """Run chunk+embed (P5) and re-index (P6) every finished plan of a collection.
 
     The backfill path for data ingested before P5 existed: the normal pipeline runs
@@ -360,6 +363,12 @@ def backfill_vectors(collectionname: str):
     Blocks until every plan's two workflows have completed. ClickHouse keeps the
     vectors, so this never drops anything; use `reindex-collection` instead when the
     Manticore tables themselves must be rebuilt (lost volume, knn_dims change).
+
+    One plan at a time by default, which leaves a cold load of a large collection
+    waiting on each plan's slowest activity in turn while the embed and index workers
+    idle. ``--concurrency N`` keeps N plans in flight — ingestion itself runs plans
+    in parallel batches of 16, so P6 is already safe against concurrent plans — and
+    the worker queues' own concurrency still bounds the GPU tier and Manticore.
     """
     from database.clickhouse import get_collection_client, validate_collectionname
 
@@ -388,7 +397,13 @@ def backfill_vectors(collectionname: str):
         from tasks.visibility import dataset_search_attributes
 
         client = await TemporalClient.connect("temporal:7233")
-        for collection_dataset, plan_hash in plans:
+        slots = asyncio.Semaphore(concurrency)
+
+        async def _backfill_plan(collection_dataset: str, plan_hash: str):
+            async with slots:
+                await _embed_then_index(collection_dataset, plan_hash)
+
+        async def _embed_then_index(collection_dataset: str, plan_hash: str):
             # P5 before P6: the vector indexer copies the rows P5 writes.
             handle = await client.start_workflow(
                 ChunkEmbedForPlan.run,
@@ -413,6 +428,8 @@ def backfill_vectors(collectionname: str):
             log.info("re-index running: %s plan %s", collection_dataset, plan_hash[:8])
             await handle.result()
 
+        await asyncio.gather(*(_backfill_plan(ds, ph) for ds, ph in plans))
+
     asyncio.run(_run())
     print(f"backfill-vectors of {collectionname}: {len(plans)} plan(s) done")
 
@@ -152,21 +152,20 @@ def insert_vfs_directories(params: InsertVfsDirectoriesParams) -> int:
     if not dir_paths:
         return 0
 
-    def _escape(v: str) -> str:
-        return v.replace("'", "''")
-
     # Deduplicate against existing
     existing_paths: Set[str] = set()
     with get_collection_client(params.collectionname) as client:
-        in_list = ",".join([f"'{_escape(p)}'" for p in dir_paths])
-        sql = f"""
+        tbl = client.query_arrow("""
             SELECT path
             FROM vfs_directories
-            WHERE collection_dataset = '{_escape(collection_dataset)}'
-              AND container_hash = '{_escape(container_hash)}'
-              AND path IN ({in_list})
-        """
-        tbl = client.query_arrow(sql)
+            WHERE collection_dataset = {collection_dataset:String}
+              AND container_hash = {container_hash:String}
+              AND path IN {paths:Array(String)}
+        """, {
+            "collection_dataset": collection_dataset,
+            "container_hash": container_hash,
+            "paths": dir_paths,
+        })
         if tbl and tbl.num_rows:
             col = tbl.column("path")
             for i in range(tbl.num_rows):
@@ -207,21 +206,19 @@ def ingest_files_batch(params: IngestFilesBatchParams) -> str:
     container_hash: str = params.container_hash or ""
     root_path_prefix: str = params.root_path_prefix or ""
 
-    def _escape(v: str) -> str:
-        return v.replace("'", "''")
-
     # 1) Filter out vfs_files duplicates by path
     existing_paths: Set[str] = set()
     if file_paths:
         with get_collection_client(params.collectionname) as client:
-            in_list = ",".join([f"'{_escape(p)}'" for p in file_paths])
-            sql = f"""
+            tbl = client.query_arrow("""
                 SELECT path
                 FROM vfs_files
-                WHERE collection_dataset = '{_escape(collection_dataset)}'
-                  AND path IN ({in_list})
-            """
-            tbl = client.query_arrow(sql)
+                WHERE collection_dataset = {collection_dataset:String}
+                  AND path IN {paths:Array(String)}
+            """, {
+                "collection_dataset": collection_dataset,
+                "paths": file_paths,
+            })
             if tbl and tbl.num_rows:
                 col = tbl.column("path")
                 for i in range(tbl.num_rows):
@@ -258,15 +255,17 @@ def ingest_files_batch(params: IngestFilesBatchParams) -> str:
     existing_blob_values: Set[str] = set()
     with get_collection_client(params.collectionname) as client:
         if unique_hashes:
-            in_hashes = ",".join([f"'{_escape(h)}'" for h in unique_hashes])
+            blob_params = {
+                "collection_dataset": collection_dataset,
+                "hashes": unique_hashes,
+            }
             # Existing blobs for this dataset
-            sql_blobs = f"""
+            tbl_b = client.query_arrow("""
                 SELECT blob_hash, stored_in_clickhouse, s3_path
                 FROM blobs
-                WHERE collection_dataset = '{_escape(collection_dataset)}'
-                  AND blob_hash IN ({in_hashes})
-            """
-            tbl_b = client.query_arrow(sql_blobs)
+                WHERE collection_dataset = {collection_dataset:String}
+                  AND blob_hash IN {hashes:Array(String)}
+            """, blob_params)
             existing_blob_meta: Dict[str, Dict[str, Any]] = {}
             if tbl_b and tbl_b.num_rows:
                 hh = tbl_b.column("blob_hash")
@@ -282,13 +281,12 @@ def ingest_files_batch(params: IngestFilesBatchParams) -> str:
                     }
 
             # Existing blob_values for this dataset
-            sql_bv = f"""
+            tbl_v = client.query_arrow("""
                 SELECT blob_hash
                 FROM blob_values
-                WHERE collection_dataset = '{_escape(collection_dataset)}'
-                  AND blob_hash IN ({in_hashes})
-            """
-            tbl_v = client.query_arrow(sql_bv)
+                WHERE collection_dataset = {collection_dataset:String}
+                  AND blob_hash IN {hashes:Array(String)}
+            """, blob_params)
             if tbl_v and tbl_v.num_rows:
                 col = tbl_v.column("blob_hash")
                 for i in range(tbl_v.num_rows):
@@ -185,15 +185,16 @@ def download_plan_files(params: DownloadPlanFilesParams) -> Dict[str, Any]:
         batch = ch_hashes[i:i + BATCH_SIZE]
         if not batch:
             continue
-        in_list = ",".join([f"'{_escape(h)}'" for h in batch])
-        sql = f"""
-            SELECT blob_hash, blob_value
-            FROM blob_values
-            WHERE collection_dataset = '{_escape(collection_dataset)}'
-              AND blob_hash IN ({in_list})
-        """
         with get_collection_client(params.collectionname) as client:
-            tbl = client.query_arrow(sql)
+            tbl = client.query_arrow("""
+                SELECT blob_hash, blob_value
+                FROM blob_values
+                WHERE collection_dataset = {collection_dataset:String}
+                  AND blob_hash IN {hashes:Array(String)}
+            """, {
+                "collection_dataset": collection_dataset,
+                "hashes": batch,
+            })
             if not tbl or tbl.num_rows == 0:
                 continue
             col_hash = tbl.column("blob_hash").combine_chunks()
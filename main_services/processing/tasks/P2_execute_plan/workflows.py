@@ -269,27 +269,51 @@ class ExecuteSinglePlan:
             retry_policy=RetryPolicy(maximum_attempts=3),
         )
 
-        # 5) NLP stage: extract entities. Must complete before indexing starts -
-        # the indexing stage reads the entity_hit rows and nlp_processed
-        # watermarks written here.
-        await workflow.execute_child_workflow(
-            ExtractEntitiesForPlan.run,
-            ExtractEntitiesForPlanParams(collectionname=params.collectionname, collection_dataset=params.collection_dataset, plan_hash=params.plan_hash),
-            id=f"extract-entities-{params.collection_dataset}-{params.plan_hash}",
-            task_queue="processing-common-queue",
-            search_attributes=dataset_search_attributes(params.collection_dataset),
-        )
-
-        # 6) Chunk+embed stage: writes text_chunks and text_chunk_vectors (the durable
-        # vector store). Must complete before indexing starts - the P6 vector indexer
-        # copies these rows into the shard's HNSW table.
-        await workflow.execute_child_workflow(
-            ChunkEmbedForPlan.run,
-            ChunkEmbedForPlanParams(collectionname=params.collectionname, collection_dataset=params.collection_dataset, plan_hash=params.plan_hash),
-            id=f"chunk-embed-{params.collection_dataset}-{params.plan_hash}",
-            task_queue="processing-common-queue",
-            search_attributes=dataset_search_attributes(params.collection_dataset),
-        )
+        # 5+6) NLP stage and chunk+embed stage, side by side. Neither reads what the
+        # other writes - both read text_content; NER writes entity_hit rows and the
+        # nlp_processed watermarks, chunk+embed writes text_chunks and
+        # text_chunk_vectors (the durable vector store) - and they call different
+        # models, so the plan waits for the slower of the two instead of their sum.
+        # Both must complete before indexing starts: P6 reads the entity rows and
+        # watermarks, and its vector indexer copies the vectors into the shard's HNSW
+        # table.
+        #
+        # Versioned: a plan started before this change has NER's child start,
+        # completion and then chunk+embed's start in its history, and replaying that
+        # through the gather (both starts in one workflow task) is nondeterministic.
+        # Those plans keep the sequential path; the marker can go once none is left.
+        if workflow.patched("p4-p5-concurrent"):
+            await asyncio.gather(
+                workflow.execute_child_workflow(
+                    ExtractEntitiesForPlan.run,
+                    ExtractEntitiesForPlanParams(collectionname=params.collectionname, collection_dataset=params.collection_dataset, plan_hash=params.plan_hash),
+                    id=f"extract-entities-{params.collection_dataset}-{params.plan_hash}",
+                    task_queue="processing-common-queue",
+                    search_attributes=dataset_search_attributes(params.collection_dataset),
+                ),
+                workflow.execute_child_workflow(
+                    ChunkEmbedForPlan.run,
+                    ChunkEmbedForPlanParams(collectionname=params.collectionname, collection_dataset=params.collection_dataset, plan_hash=params.plan_hash),
+                    id=f"chunk-embed-{params.collection_dataset}-{params.plan_hash}",
+                    task_queue="processing-common-queue",
+                    search_attributes=dataset_search_attributes(params.collection_dataset),
+                ),
+            )
+        else:
+            await workflow.execute_child_workflow(
+                ExtractEntitiesForPlan.run,
+                ExtractEntitiesForPlanParams(collectionname=params.collectionname, collection_dataset=params.collection_dataset, plan_hash=params.plan_hash),
+                id=f"extract-entities-{params.collection_dataset}-{params.plan_hash}",
+                task_queue="processing-common-queue",
+                search_attributes=dataset_search_attributes(params.collection_dataset),
+            )
+            await workflow.execute_child_workflow(
+                ChunkEmbedForPlan.run,
+                ChunkEmbedForPlanParams(collectionname=params.collectionname, collection_dataset=params.collection_dataset, plan_hash=params.plan_hash),
+                id=f"chunk-embed-{params.collection_dataset}-{params.plan_hash}",
+                task_queue="processing-common-queue",
+                search_attributes=dataset_search_attributes(params.collection_dataset),
+            )
 
         # 7) Indexing stage
         await workflow.execute_child_workflow(
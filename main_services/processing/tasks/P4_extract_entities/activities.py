@@ -9,6 +9,8 @@ empty result.
 
 import logging
 import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import pyarrow as pa
@@ -28,6 +30,17 @@ log = logging.getLogger(__name__)
 # possible (today's alternative is the whole activity chunk in one request).
 NLP_BATCH_TEXTS = 64
 
+#: NER requests in flight per worker process. One request per batch answered one at a
+#: time left the NER host idle for a round trip between batches; the session in
+#: ``tasks.remote`` already keeps the connections alive, so the remaining cost was the
+#: wait. Module-level and shared, like P5's embeddings pool: a per-worker bound on the
+#: load the NER host (or its CPU twin, under fallback) sees.
+NER_PARALLEL_REQUESTS = max(1, int(os.getenv("NER_SERVICE_PARALLELISM", "4")))
+
+_NER_POOL = ThreadPoolExecutor(
+    max_workers=NER_PARALLEL_REQUESTS, thread_name_prefix="ner-request",
+)
+
 
 def configured_nlp_model() -> str:
     """The ``nlp_model`` this worker *intends* to write.
@@ -86,46 +99,80 @@ def extract_entities_for_hashes(params: ExtractEntitiesParams) -> ExtractEntitie
         return ExtractEntitiesResult(text_segments=0, entity_groups=0)
 
     cleaned_texts = [clean_text(t['text']) for t in text_content]
+    # Each distinct text is sent once. Email footers, cover sheets and OCR'd
+    # templates repeat across a dataset, and NER is a pure function of the text,
+    # so a duplicate's entities are its first occurrence's.
+    unique_texts = list(dict.fromkeys(cleaned_texts))
 
-    ner_results: list[dict[str, list[str]]] = []
+    unique_results: list[dict[str, list[str]]] = []
     # One model per text, not one per activity: the circuit breaker can open
     # part-way through, so batch 1 may be served by the GPU and batch 2 by the
     # CPU twin. Recording a single activity-wide model would attribute rows to a
     # provider that never saw them.
-    served_models: list[str] = []
-    for i in range(0, len(cleaned_texts), NLP_BATCH_TEXTS):
-        batch = cleaned_texts[i:i + NLP_BATCH_TEXTS]
-        batch_results, batch_model = extract_ner_from_texts(batch)
-        ner_results.extend(batch_results)
-        served_models.extend([batch_model] * len(batch))
+    unique_models: list[str] = []
+
+    # Requests run on the pool, a bounded window ahead of this thread; results are
+    # taken in submission order, so they line up with ``unique_texts`` however the
+    # responses interleave. Heartbeats stay here (the activity context does not
+    # follow a task onto a pool thread).
+    window: deque[Future] = deque()
+
+    def collect_oldest() -> None:
+        batch_results, batch_model = window.popleft().result()
+        unique_results.extend(batch_results)
+        unique_models.extend([batch_model] * len(batch_results))
         # In-loop heartbeat: evidence of forward progress, not merely of a live
         # thread. This is the loop that stalled for 26 minutes on 2026-08-06.
-        heartbeat.beat(f"NER {len(ner_results)}/{len(cleaned_texts)} texts")
+        heartbeat.beat(f"NER {len(unique_results)}/{len(unique_texts)} texts")
         log.info(
             f"{collection_dataset} (plan {plan_hash[:8]}): "
-            f"NER processed {len(ner_results)}/{len(cleaned_texts)} texts "
+            f"NER processed {len(unique_results)}/{len(unique_texts)} distinct texts "
             f"via {batch_model}"
         )
 
-    clickhouse_ner_rows = []
+    try:
+        for i in range(0, len(unique_texts), NLP_BATCH_TEXTS):
+            window.append(_NER_POOL.submit(
+                extract_ner_from_texts, unique_texts[i:i + NLP_BATCH_TEXTS],
+            ))
+            if len(window) >= NER_PARALLEL_REQUESTS:
+                collect_oldest()
+        while window:
+            collect_oldest()
+    finally:
+        # On failure, do not spend NER time on batches nobody will write.
+        for future in window:
+            future.cancel()
+
+    served_by_text = dict(zip(unique_texts, zip(unique_results, unique_models)))
+    ner_results = [served_by_text[text][0] for text in cleaned_texts]
+    served_models = [served_by_text[text][1] for text in cleaned_texts]
+
+    # entity_hit is built column by column: four rows per segment, and a dict
+    # per row only to be taken apart again seven times for the Arrow table was
+    # most of this loop's cost on a large plan.
+    ner_columns: dict[str, list] = {
+        "collection_dataset": [], "file_hash": [], "extracted_by": [], "page_id": [],
+        "nlp_model": [], "entity_type": [], "entity_values": [],
+    }
     ner_values = set()
     for text_row, ner_result, served_model in zip(text_content, ner_results, served_models):
-        for entity_type, entity_values in ner_result.items():
-            clickhouse_ner_rows.append({
-                "collection_dataset": text_row['collection_dataset'],
-                "file_hash": text_row['file_hash'],
-                "extracted_by": text_row['extracted_by'],
-                "page_id": text_row['page_id'],
-                # Per row, and the provider that actually served it. entity_hit has
-                # nlp_model in its ORDER BY, so two providers' hits for the same
-                # (file, variant, page, type) coexist. Leaving it empty would collapse
-                # them onto one key and make whichever provider ran last the only one
-                # with entities -- silently, with no error and simply fewer facets.
-                "nlp_model": served_model,
-                "entity_type": entity_type,
-                "entity_values": entity_values,
-            })
+        groups = len(ner_result)
+        ner_columns["collection_dataset"].extend([text_row['collection_dataset']] * groups)
+        ner_columns["file_hash"].extend([text_row['file_hash']] * groups)
+        ner_columns["extracted_by"].extend([text_row['extracted_by']] * groups)
+        ner_columns["page_id"].extend([text_row['page_id']] * groups)
+        # Per row, and the provider that actually served it. entity_hit has
+        # nlp_model in its ORDER BY, so two providers' hits for the same
+        # (file, variant, page, type) coexist. Leaving it empty would collapse
+        # them onto one key and make whichever provider ran last the only one
+        # with entities -- silently, with no error and simply fewer facets.
+        ner_columns["nlp_model"].extend([served_model] * groups)
+        ner_columns["entity_type"].extend(ner_result.keys())
+        ner_columns["entity_values"].extend(ner_result.values())
+        for entity_values in ner_result.values():
             ner_values.update(entity_values)
+    entity_groups = len(ner_columns["entity_type"])
 
     # Populate the term dictionary here. The indexing stage calls the same
     # function with the same values and gets cache hits; the ids are
@@ -133,15 +180,15 @@ def extract_entities_for_hashes(params: ExtractEntitiesParams) -> ExtractEntitie
     get_string_term_ids(params.collectionname, collection_dataset, 'ner', ner_values)
 
     with get_collection_client(params.collectionname) as client:
-        if clickhouse_ner_rows:
+        if entity_groups:
             tbl_ner = pa.table({
-                "collection_dataset": pa.array([row['collection_dataset'] for row in clickhouse_ner_rows], type=pa.string()),
-                "file_hash": pa.array([row['file_hash'] for row in clickhouse_ner_rows], type=pa.string()),
-                "extracted_by": pa.array([row['extracted_by'] for row in clickhouse_ner_rows], type=pa.string()),
-                "page_id": pa.array([row['page_id'] for row in clickhouse_ner_rows], type=pa.uint32()),
-                "nlp_model": pa.array([row['nlp_model'] for row in clickhouse_ner_rows], type=pa.string()),
-                "entity_type": pa.array([row['entity_type'] for row in clickhouse_ner_rows], type=pa.string()),
-                "entity_values": pa.array([row['entity_values'] for row in clickhouse_ner_rows], type=pa.list_(pa.string())),
+                "collection_dataset": pa.array(ner_columns["collection_dataset"], type=pa.string()),
+                "file_hash": pa.array(ner_columns["file_hash"], type=pa.string()),
+                "extracted_by": pa.array(ner_columns["extracted_by"], type=pa.string()),
+                "page_id": pa.array(ner_columns["page_id"], type=pa.uint32()),
+                "nlp_model": pa.array(ner_columns["nlp_model"], type=pa.string()),
+                "entity_type": pa.array(ner_columns["entity_type"], type=pa.string()),
+                "entity_values": pa.array(ner_columns["entity_values"], type=pa.list_(pa.string())),
             })
             client.insert_arrow("entity_hit", tbl_ner)
 
@@ -165,6 +212,6 @@ def extract_entities_for_hashes(params: ExtractEntitiesParams) -> ExtractEntitie
 
     log.info(
         f"{collection_dataset} (plan {plan_hash[:8]}): extracted "
-        f"{len(clickhouse_ner_rows)} entity groups from {len(text_content)} text segments"
+        f"{entity_groups} entity groups from {len(text_content)} text segments"
     )
-    return ExtractEntitiesResult(text_segments=len(text_content), entity_groups=len(clickhouse_ner_rows))
+    return ExtractEntitiesResult(text_segments=len(text_content), entity_groups=entity_groups)
@@ -23,6 +23,18 @@ NLP_MODEL_BY_PROVIDER = {
     "spacy": "ner-spacy-xx",
 }
 
+#: The request fields that are the same on every call; only ``input`` varies. One
+#: place to read what this client asks of the server, built once instead of per batch.
+_REQUEST_OPTIONS = {
+    "include_confidence": False,
+    "entity_types": None,
+}
+
+
+#: Service label -> the `entity_hit.entity_type` it is stored under. CoNLL-03 models
+#: say LOC, OntoNotes-style ones say GPE (geopolitical entity) for the same thing.
+_ENTITY_TYPES = {"PER": "PER", "ORG": "ORG", "LOC": "LOC", "GPE": "LOC", "MISC": "MISC"}
+
 
 def _endpoints() -> list[tuple[str, str]]:
     """Ordered ``(provider, url)`` candidates, primary first.
@@ -44,11 +56,8 @@ def _endpoints() -> list[tuple[str, str]]:
 
 def extract_ner_from_texts(texts: list[str]) -> tuple[list[dict[str, list[str]]], str]:
     """Return per-text entities and the ``nlp_model`` of the provider that served."""
-    result = post_json(_endpoints(), {
-        "input": texts,
-        "include_confidence": False,
-        "entity_types": None,
-    }, service="ner")
+    result = post_json(_endpoints(), {**_REQUEST_OPTIONS, "input": texts}, service="ner",
+                       compress=True)
     entities_by_text = _group_entities_by_text(result.data["data"], len(texts))
     nlp_model = NLP_MODEL_BY_PROVIDER.get(result.provider, f"ner-{result.provider}")
     logger.debug("extracted entities from %d texts via %s", len(texts), nlp_model)
@@ -56,29 +65,33 @@ def extract_ner_from_texts(texts: list[str]) -> tuple[list[dict[str, list[str]]]
 
 
 def _group_entities_by_text(entities: list[dict], num_texts: int) -> list[dict[str, list[str]]]:
-    """Group entities by text index and entity type."""
-    # Initialize result for each text
-    result = []
-    for _ in range(num_texts):
-        result.append({"PER": [], "ORG": [], "LOC": [], "MISC": []})
+    """Group entities by text index and entity type.
+
+    Every text gets all four types, empty or not: `entity_hit` carries one row per
+    type per segment. One label lookup per entity; anything the table does not name
+    (DATE, MONEY, ...) is dropped.
+    """
+    result = [{"PER": [], "ORG": [], "LOC": [], "MISC": []} for _ in range(num_texts)]
+    if not entities or not result:
+        return result
+
+    if num_texts == 1:
+        # A single text owns every entity, whatever text_index the service claims.
+        only = result[0]
+        for entity in entities:
+            entity_type = _ENTITY_TYPES.get(entity["label"])
+            if entity_type is not None:
+                only[entity_type].append(entity["text"])
+        return result
 
-    # Group entities
     for entity in entities:
-        text_index = entity.get("text_index", 0) if num_texts > 1 else 0
+        entity_type = _ENTITY_TYPES.get(entity["label"])
+        if entity_type is None:
+            continue
+        text_index = entity.get("text_index", 0)
         # Bounds-check both directions: a negative index would otherwise pass
         # `text_index < len(result)` and silently write into the wrong text.
-        if isinstance(text_index, int) and 0 <= text_index < len(result):
-            entity_type = entity["label"]
-            entity_text = entity["text"]
-
-            # Map entity types (CoNLL-03 uses different labels)
-            if entity_type == "PER":
-                result[text_index]["PER"].append(entity_text)
-            elif entity_type == "ORG":
-                result[text_index]["ORG"].append(entity_text)
-            elif entity_type in ["LOC", "GPE"]:  # GPE = Geopolitical entity
-                result[text_index]["LOC"].append(entity_text)
-            elif entity_type == "MISC":
-                result[text_index]["MISC"].append(entity_text)
-
-    return result
\ No newline at end of file
+        if isinstance(text_index, int) and 0 <= text_index < num_texts:
+            result[text_index][entity_type].append(entity["text"])
+
+    return result
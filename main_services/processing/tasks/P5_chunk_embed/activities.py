@@ -20,9 +20,15 @@ makes a re-run embed exactly the chunks that never got a vector. Chunking is
 deterministic (``chunking.py``), so the re-run reproduces the same chunk keys.
 """
 
+import base64
 import logging
 import os
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 
+import numpy as np
+import pyarrow as pa
 from temporalio import activity
 from temporalio.exceptions import ApplicationError
 
@@ -31,7 +37,7 @@ from tasks.heartbeat import HeartbeatClock, with_heartbeat
 from tasks.remote import post_json
 from tasks.text_quality import non_linguistic_reason
 
-from .chunking import chunk_page_text
+from .chunking import CHUNK_MAX_BYTES, chunk_page_text
 from .embedding_prefix import embedding_input
 from .params import ChunkEmbedParams, ChunkEmbedResult
 
@@ -39,7 +45,36 @@ log = logging.getLogger(__name__)
 
 #: Texts per embeddings request. Bounds request size and makes partial progress
 #: possible (today's alternative is the whole activity chunk in one request).
-EMBED_BATCH_TEXTS = 32
+#: Configurable because the ceiling is the server's, not ours: TEI and most hosted
+#: OpenAI-compatible endpoints reject an oversized batch with a 413 or a "batch size
+#: > max" error, which would fail every plan on the stage until the constant changed.
+EMBED_BATCH_TEXTS = max(1, int(os.getenv("EMBEDDING_SERVICE_BATCH_SIZE", "32")))
+
+#: UTF-8 bytes of text per embeddings request, the second bound on a batch. Chunks are
+#: capped at CHUNK_MAX_BYTES except for a single overlong word, which becomes a chunk of
+#: its own at any size; a count-only batch of those could reach megabytes. Bytes are the
+#: token proxy: every token of these models' tokenizers covers at least one byte, so the
+#: byte budget bounds the token budget. The default is 32 full-size chunks.
+EMBED_BATCH_BYTES = max(1, int(os.getenv("EMBEDDING_SERVICE_BATCH_BYTES", str(32 * CHUNK_MAX_BYTES))))
+
+#: Embeddings requests in flight per worker process. The work is a network wait on the
+#: GPU tier, so a serial loop leaves the server idle for one round trip per batch. The
+#: pool is module-level and shared by every embed activity in the process, which makes
+#: this a per-worker bound on GPU load rather than a per-activity one.
+EMBED_PARALLEL_REQUESTS = max(1, int(os.getenv("EMBEDDING_SERVICE_PARALLELISM", "4")))
+
+#: Wire format asked of the endpoint. ``base64`` (OpenAI's format: little-endian float32
+#: bytes) is ~4x smaller than decimal floats and decodes with one ``frombuffer`` instead
+#: of parsing N x D numbers. A server that ignores the field answers with float lists,
+#: which are still accepted; set ``float`` for one that rejects it.
+EMBED_ENCODING_FORMAT = (os.getenv("EMBEDDINGS_ENCODING_FORMAT") or "base64").strip()
+
+#: The request fields that are the same on every batch; only ``input`` varies.
+_EMBED_REQUEST_OPTIONS = {"encoding_format": EMBED_ENCODING_FORMAT}
+
+_EMBED_POOL = ThreadPoolExecutor(
+    max_workers=EMBED_PARALLEL_REQUESTS, thread_name_prefix="embed-request",
+)
 
 
 def _probed_serving() -> tuple[str, int]:
@@ -60,6 +95,166 @@ def _probed_serving() -> tuple[str, int]:
     return model, int(dims_raw)
 
 
+def _decode_embedding(raw) -> np.ndarray:
+    """One response vector as float32, from base64 float32 bytes or a JSON float list."""
+    if isinstance(raw, str):
+        return np.frombuffer(base64.b64decode(raw), dtype="<f4")
+    return np.asarray(raw, dtype=np.float32)
+
+
+def _embedding_decoder(sample) -> Callable[[object], np.ndarray]:
+    """A decoder for a response's vectors, specialised on its first one.
+
+    A server answers a request in one format, so the type test is taken once per
+    response rather than once per vector. A vector in the other format (nothing forbids
+    it) fails the specialised decode and goes through :func:`_decode_embedding`.
+    """
+    if isinstance(sample, str):
+        b64decode, frombuffer = base64.b64decode, np.frombuffer
+
+        def decode(raw) -> np.ndarray:
+            try:
+                return frombuffer(b64decode(raw), dtype="<f4")
+            except TypeError:
+                return _decode_embedding(raw)
+    else:
+        asarray, float32 = np.asarray, np.float32
+
+        def decode(raw) -> np.ndarray:
+            try:
+                return asarray(raw, dtype=float32)
+            except ValueError:
+                return _decode_embedding(raw)
+
+    return decode
+
+
+def _embed_batch(
+    base_url: str, serving_model: str, serving_dims: int, texts: list[str],
+) -> np.ndarray:
+    """Embed one batch of passages: a ``(len(texts), serving_dims)`` float32 matrix.
+
+    Row ``i`` is the vector of ``texts[i]``. A matrix rather than a list of lists: the
+    column is ``Array(Float32)`` anyway, and boxing every component as a Python float
+    costs several times the memory while the batch waits in the write window.
+
+    The response is scattered by its ``index`` field, never zipped positionally: the
+    OpenAI contract does not promise response order, and a positional zip would write
+    each vector under a neighbour's chunk key without any error. A short response, a
+    different served model or a different dimension is refused non-retryably — each is
+    a config lie that a retry reproduces.
+    """
+    # Identical chunks are sent once. Boilerplate — a letterhead, a disclaimer footer, a
+    # repeated table header — chunks to the same text on every page it appears on, and
+    # embedding is deterministic, so the repeats only cost GPU time.
+    slot_of: dict[str, int] = {}
+    order = [
+        slot_of.setdefault(embedding_input(serving_model, "passage", text)[0], len(slot_of))
+        for text in texts
+    ]
+    unique = list(slot_of)
+    result = post_json(
+        [("embeddings", f"{base_url}/embeddings")],
+        {**_EMBED_REQUEST_OPTIONS, "input": unique},
+        service="embeddings",
+        compress=True,
+    )
+    data = result.data
+    served_model = data.get("model") or ""
+    if served_model != serving_model:
+        # The probe is stale. The rows would be written under a model the anti-join
+        # never matches (re-embedding forever) and possibly under the wrong prefix
+        # convention. Refuse loudly instead.
+        raise ApplicationError(
+            f"embeddings endpoint serves {served_model!r} but the probe recorded "
+            f"{serving_model!r}; run `main.py probe-embeddings`",
+            non_retryable=True,
+        )
+    # One pass scatters the vectors and gathers both checks: how many slots were
+    # filled (a repeated index fills one) and which dimensions came back.
+    by_slot: list[np.ndarray | None] = [None] * len(unique)
+    filled = 0
+    dims: set[int] = set()
+    items = data["data"]
+    decode = _embedding_decoder(items[0]["embedding"]) if items else _decode_embedding
+    for item in items:
+        slot = int(item["index"])
+        embedding = decode(item["embedding"])
+        if by_slot[slot] is None:
+            filled += 1
+        by_slot[slot] = embedding
+        dims.add(len(embedding))
+    if filled != len(unique):
+        raise ApplicationError(
+            f"embeddings endpoint returned {filled} vectors for {len(unique)} texts",
+            non_retryable=True,
+        )
+    if dims != {serving_dims}:
+        raise ApplicationError(
+            f"embeddings endpoint served dims {sorted(dims)} but the probe recorded "
+            f"{serving_dims}; run `main.py probe-embeddings`",
+            non_retryable=True,
+        )
+    return np.stack(by_slot)[order]
+
+
+def _batches(chunks: list[dict]) -> Iterator[list[dict]]:
+    """Greedy, order-preserving packing of ``chunks`` into embeddings requests.
+
+    A batch closes when the next chunk would exceed either EMBED_BATCH_TEXTS or
+    EMBED_BATCH_BYTES; a chunk bigger than the byte budget on its own still goes out,
+    alone. Order is kept so vectors are written in the order chunks were planned —
+    length-sorting inside a batch is the server's job (sentence-transformers already
+    sorts by length before padding).
+    """
+    batch: list[dict] = []
+    batch_bytes = 0
+    for chunk in chunks:
+        size = len(chunk["text"].encode("utf-8"))
+        if batch and (len(batch) >= EMBED_BATCH_TEXTS or batch_bytes + size > EMBED_BATCH_BYTES):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(chunk)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+def _embedding_column(embeddings: np.ndarray) -> pa.ListArray:
+    """The ``(n, dims)`` float32 matrix as an Arrow ``list<float>`` column, zero-copy:
+    the flat values buffer is the matrix's own, with offsets every ``dims`` floats."""
+    n, dims = embeddings.shape
+    values = pa.array(np.ascontiguousarray(embeddings, dtype=np.float32).ravel())
+    offsets = pa.array(np.arange(0, (n + 1) * dims, dims, dtype=np.int32))
+    return pa.ListArray.from_arrays(offsets, values)
+
+
+def _write_vectors(
+    collectionname: str, batch: list[dict], serving_model: str, serving_dims: int,
+    embeddings: np.ndarray,
+) -> int:
+    """Insert one batch's vectors into ``text_chunk_vectors``; returns the row count.
+
+    Columnar, like P4's writers: a list-of-rows insert materialised every float of the
+    batch as a Python object and clickhouse-connect transposed the rows back into
+    columns to serialise them.
+    """
+    n = len(batch)
+    tbl = pa.table({
+        "collection_dataset": pa.array([c["collection_dataset"] for c in batch], type=pa.string()),
+        "file_hash": pa.array([c["file_hash"] for c in batch], type=pa.string()),
+        "extracted_by": pa.array([c["extracted_by"] for c in batch], type=pa.string()),
+        "page_id": pa.array([c["page_id"] for c in batch], type=pa.uint32()),
+        "chunk_index": pa.array([c["chunk_index"] for c in batch], type=pa.uint32()),
+        "embedding_model": pa.array([serving_model] * n, type=pa.string()),
+        "dims": pa.array([serving_dims] * n, type=pa.uint16()),
+        "embedding": _embedding_column(embeddings),
+    })
+    with get_collection_client(collectionname) as client:
+        client.insert_arrow("text_chunk_vectors", tbl)
+    return n
+
+
 @activity.defn
 @with_heartbeat
 def chunk_embed_for_hashes(params: ChunkEmbedParams) -> ChunkEmbedResult:
@@ -106,18 +301,46 @@ def chunk_embed_for_hashes(params: ChunkEmbedParams) -> ChunkEmbedResult:
             "item_hashes": item_hashes,
         }).to_pylist()
 
-    if not text_content:
-        log.info("%s (plan %s): nothing to chunk+embed", collection_dataset, plan_hash[:8])
-        return ChunkEmbedResult(text_segments=0, chunks_written=0, vectors_written=0)
+        if not text_content:
+            log.info("%s (plan %s): nothing to chunk+embed", collection_dataset, plan_hash[:8])
+            return ChunkEmbedResult(text_segments=0, chunks_written=0, vectors_written=0)
 
-    # Chunk every segment, then keep only the chunks with no vector for the serving
+        existing = {
+            (r[0], r[1], int(r[2]), int(r[3]))
+            for r in client.query("""
+                SELECT file_hash, extracted_by, page_id, chunk_index
+                FROM text_chunk_vectors FINAL
+                WHERE collection_dataset = {collection_dataset:String}
+                AND file_hash IN {item_hashes:Array(String)}
+                AND embedding_model = {model:String}
+            """, {
+                "collection_dataset": collection_dataset,
+                "item_hashes": item_hashes,
+                "model": serving_model,
+            }).result_rows
+        }
+
+    # Chunk every segment and keep only the chunks with no vector for the serving
     # model. The anti-join key is the full vector-row identity, chunk_index included:
     # a crash between batches leaves a page half-embedded, and only the missing
     # chunks may be redone.
-    candidates: list[dict] = []
+    #
+    # Chunk rows go in before the first vector of their page: a vector without its
+    # chunk row would be a KNN hit with no text to rerank or render. Only pages with
+    # missing vectors are (re)written — text_chunks is keyed without the model, and
+    # the content is deterministic, so a rewrite would only bump updated_at. A page's
+    # chunks all come from its own segment, so that is decided page by page: chunks
+    # of pages that are already embedded are counted and dropped, never held for the
+    # whole plan.
+    chunk_rows: list[dict] = []
+    missing: list[dict] = []
+    chunk_count = 0
     skipped_non_linguistic = 0
     skip_examples: list[str] = []
     for row in text_content:
+        page = (row["file_hash"], row["extracted_by"], row["page_id"])
+        page_chunks: list[dict] = []
+        page_missing: list[dict] = []
         for chunk in chunk_page_text(row["text"]):
             # Text extraction is greedy on purpose, so it also yields an email
             # attachment's base64 and an image's pixel rows. Embedding those costs GPU
@@ -133,7 +356,7 @@ def chunk_embed_for_hashes(params: ChunkEmbedParams) -> ChunkEmbedResult:
                         f"{row['file_hash'][:8]} p{row['page_id']}#{chunk.chunk_index}: {reason}"
                     )
                 continue
-            candidates.append({
+            candidate = {
                 "collection_dataset": row["collection_dataset"],
                 "file_hash": row["file_hash"],
                 "extracted_by": row["extracted_by"],
@@ -142,123 +365,81 @@ def chunk_embed_for_hashes(params: ChunkEmbedParams) -> ChunkEmbedResult:
                 "index_start": chunk.index_start,
                 "index_end": chunk.index_end,
                 "text": chunk.text,
-            })
+            }
+            page_chunks.append(candidate)
+            if (*page, chunk.chunk_index) not in existing:
+                page_missing.append(candidate)
+        chunk_count += len(page_chunks)
+        if page_missing:
+            chunk_rows.extend(page_chunks)
+            missing.extend(page_missing)
     if skipped_non_linguistic:
         log.info(
             "%s (plan %s): skipped %d non-linguistic chunk(s) before embedding, e.g. %s",
             collection_dataset, plan_hash[:8], skipped_non_linguistic, "; ".join(skip_examples),
         )
-    heartbeat.beat(f"chunked {len(text_content)} segments into {len(candidates)} chunks")
+    heartbeat.beat(f"chunked {len(text_content)} segments into {chunk_count} chunks")
 
-    with get_collection_client(params.collectionname) as client:
-        existing = {
-            (r[0], r[1], int(r[2]), int(r[3]))
-            for r in client.query("""
-                SELECT file_hash, extracted_by, page_id, chunk_index
-                FROM text_chunk_vectors FINAL
-                WHERE collection_dataset = {collection_dataset:String}
-                AND file_hash IN {item_hashes:Array(String)}
-                AND embedding_model = {model:String}
-            """, {
-                "collection_dataset": collection_dataset,
-                "item_hashes": item_hashes,
-                "model": serving_model,
-            }).result_rows
-        }
-
-    missing = [
-        c for c in candidates
-        if (c["file_hash"], c["extracted_by"], c["page_id"], c["chunk_index"]) not in existing
-    ]
     if not missing:
         log.info(
             "%s (plan %s): all %d chunks already embedded via %s",
-            collection_dataset, plan_hash[:8], len(candidates), serving_model,
+            collection_dataset, plan_hash[:8], chunk_count, serving_model,
         )
         return ChunkEmbedResult(
             text_segments=len(text_content), chunks_written=0, vectors_written=0,
             chunks_skipped_non_linguistic=skipped_non_linguistic,
         )
 
-    # Chunk rows go in before the first vector of their page: a vector without its
-    # chunk row would be a KNN hit with no text to rerank or render. Only pages with
-    # missing vectors are (re)written — text_chunks is keyed without the model, and
-    # the content is deterministic, so a rewrite would only bump updated_at.
-    pages_needing_work = {
-        (c["file_hash"], c["extracted_by"], c["page_id"]) for c in missing
-    }
-    chunk_rows = [
-        [c["collection_dataset"], c["file_hash"], c["extracted_by"], c["page_id"],
-         c["chunk_index"], c["index_start"], c["index_end"], c["text"],
-         len(c["text"].encode("utf-8"))]
-        for c in candidates
-        if (c["file_hash"], c["extracted_by"], c["page_id"]) in pages_needing_work
-    ]
+    tbl_chunks = pa.table({
+        "collection_dataset": pa.array([c["collection_dataset"] for c in chunk_rows], type=pa.string()),
+        "file_hash": pa.array([c["file_hash"] for c in chunk_rows], type=pa.string()),
+        "extracted_by": pa.array([c["extracted_by"] for c in chunk_rows], type=pa.string()),
+        "page_id": pa.array([c["page_id"] for c in chunk_rows], type=pa.uint32()),
+        "chunk_index": pa.array([c["chunk_index"] for c in chunk_rows], type=pa.uint32()),
+        "index_start": pa.array([c["index_start"] for c in chunk_rows], type=pa.uint32()),
+        "index_end": pa.array([c["index_end"] for c in chunk_rows], type=pa.uint32()),
+        "text": pa.array([c["text"] for c in chunk_rows], type=pa.string()),
+        "text_bytes": pa.array([len(c["text"].encode("utf-8")) for c in chunk_rows], type=pa.uint32()),
+    })
     with get_collection_client(params.collectionname) as client:
-        client.insert(
-            "text_chunks",
-            chunk_rows,
-            column_names=["collection_dataset", "file_hash", "extracted_by", "page_id",
-                          "chunk_index", "index_start", "index_end", "text", "text_bytes"],
-        )
+        client.insert_arrow("text_chunks", tbl_chunks)
     heartbeat.beat(f"wrote {len(chunk_rows)} chunk rows")
 
+    # Requests run on the pool, a bounded window ahead of the writer; inserts and
+    # heartbeats stay on this thread (the activity context does not follow a task onto
+    # a pool thread). Batches are written in submission order, so a failure leaves
+    # every earlier batch durable and the anti-join redoes only the rest.
     vectors_written = 0
-    for i in range(0, len(missing), EMBED_BATCH_TEXTS):
-        batch = missing[i:i + EMBED_BATCH_TEXTS]
-        prefixed = [embedding_input(serving_model, "passage", c["text"])[0] for c in batch]
-        result = post_json(
-            [("embeddings", f"{base_url}/embeddings")],
-            {"input": prefixed},
-            service="embeddings",
+    window: deque[tuple[list[dict], Future]] = deque()
+
+    def write_oldest() -> None:
+        nonlocal vectors_written
+        batch, future = window.popleft()
+        vectors_written += _write_vectors(
+            params.collectionname, batch, serving_model, serving_dims, future.result(),
         )
-        data = result.data
-        served_model = data.get("model") or ""
-        if served_model != serving_model:
-            # The probe is stale. The rows would be written under a model the anti-join
-            # never matches (re-embedding forever) and possibly under the wrong prefix
-            # convention. Refuse loudly instead.
-            raise ApplicationError(
-                f"embeddings endpoint serves {served_model!r} but the probe recorded "
-                f"{serving_model!r}; run `main.py probe-embeddings`",
-                non_retryable=True,
-            )
-        embeddings = [None] * len(batch)
-        for item in data["data"]:
-            embeddings[int(item["index"])] = [float(v) for v in item["embedding"]]
-        if any(e is None for e in embeddings):
-            raise ApplicationError(
-                f"embeddings endpoint returned {sum(e is not None for e in embeddings)} "
-                f"vectors for {len(batch)} texts",
-                non_retryable=True,
-            )
-        dims = {len(e) for e in embeddings}
-        if dims != {serving_dims}:
-            raise ApplicationError(
-                f"embeddings endpoint served dims {sorted(dims)} but the probe recorded "
-                f"{serving_dims}; run `main.py probe-embeddings`",
-                non_retryable=True,
-            )
-
-        with get_collection_client(params.collectionname) as client:
-            client.insert(
-                "text_chunk_vectors",
-                [
-                    [c["collection_dataset"], c["file_hash"], c["extracted_by"], c["page_id"],
-                     c["chunk_index"], served_model, serving_dims, embedding]
-                    for c, embedding in zip(batch, embeddings)
-                ],
-                column_names=["collection_dataset", "file_hash", "extracted_by", "page_id",
-                              "chunk_index", "embedding_model", "dims", "embedding"],
-            )
-        vectors_written += len(batch)
         # In-loop heartbeat: evidence of forward progress, not merely of a live thread.
         heartbeat.beat(f"embedded {vectors_written}/{len(missing)} chunks")
         log.info(
             "%s (plan %s): embedded %d/%d chunks via %s",
-            collection_dataset, plan_hash[:8], vectors_written, len(missing), served_model,
+            collection_dataset, plan_hash[:8], vectors_written, len(missing), serving_model,
         )
 
+    try:
+        for batch in _batches(missing):
+            window.append((batch, _EMBED_POOL.submit(
+                _embed_batch, base_url, serving_model, serving_dims,
+                [c["text"] for c in batch],
+            )))
+            if len(window) >= EMBED_PARALLEL_REQUESTS:
+                write_oldest()
+        while window:
+            write_oldest()
+    finally:
+        # On failure, do not spend GPU time on batches nobody will write.
+        for _, future in window:
+            future.cancel()
+
     log.info(
         "%s (plan %s): chunked %d segments, wrote %d chunk rows and %d vectors",
         collection_dataset, plan_hash[:8], len(text_content), len(chunk_rows), vectors_written,
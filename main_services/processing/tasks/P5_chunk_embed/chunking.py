@@ -26,7 +26,9 @@ CHUNK_MAX_BYTES = 1200
 CHUNK_OVERLAP_BYTES = 200
 
 
-@dataclass
+#: Frozen and slotted: a large page yields thousands of these per activity, and nothing
+#: edits one after chunk_page_text builds it.
+@dataclass(frozen=True, slots=True)
 class Chunk:
     chunk_index: int
     index_start: int  # start BYTE offset within the UTF-8 page text
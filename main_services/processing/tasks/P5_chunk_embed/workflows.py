@@ -1,6 +1,6 @@
 """Chunk+embed stage (P5) workflow: embed every text segment of a plan.
 
-Runs after P4 (entity extraction) and before P6 (indexing) in the ExecuteSinglePlan
+Runs alongside P4 (entity extraction) and before P6 (indexing) in the ExecuteSinglePlan
 chain: P6's vector indexer copies the ``text_chunk_vectors`` rows this stage writes
 into the shard's HNSW table, so an index that ran before embedding would come up with
 empty ``_vectors`` tables.
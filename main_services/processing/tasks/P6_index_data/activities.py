@@ -30,6 +30,20 @@ log = logging.getLogger(__name__)
 
 INDEX_ROW_CHUNK_SIZE = 512
 
+# Vectors rows per multi-row REPLACE. One statement per row paid a round trip and a
+# parse per chunk for rows that are ~8 KB of literal each; 64 keeps a statement near
+# half a megabyte at 384 dims, far under Manticore's max_packet_size at any model size.
+VECTOR_ROWS_PER_STATEMENT = max(1, int(os.getenv("INDEX_VECTOR_ROWS_PER_STATEMENT", "64")))
+
+# Pages and metadata rows per multi-row REPLACE, for the same reason. Fewer than the
+# vectors: an unpaged text segment may be 256 KB, so 16 of them stay a few megabytes.
+TEXT_ROWS_PER_STATEMENT = max(1, int(os.getenv("INDEX_TEXT_ROWS_PER_STATEMENT", "16")))
+
+
+#: `entity_hit.entity_type` -> pages MVA column, resolved once instead of formatting
+#: the column name for every type of every segment.
+NER_FIELDS = (("PER", "ner_per"), ("ORG", "ner_org"), ("LOC", "ner_loc"), ("MISC", "ner_misc"))
+
 
 def union_entities_by_segment(entity_rows):
     """Group `entity_hit` rows into `{(hash, extracted_by, page_id): {type: [values]}}`.
@@ -64,67 +78,68 @@ def chunks(lst, n):
         yield lst[i:i + n]
 
 
-def pages_replace_sql(pages_table: str, row: dict) -> str:
-    """REPLACE INTO statement for one pages row.
+def pages_replace_sql(pages_table: str, collection_dataset: str,
+                      rows: list[dict]) -> tuple[str, list]:
+    """One multi-row REPLACE INTO for pages ``rows`` and its flattened bound parameters.
 
     The four NER MVA values are interpolated as Manticore tuples (they cannot be
     bound parameters); ``repr_manticore_tuple([])`` renders the empty MVA as ``()``.
     Everything else is a bound parameter. ``pages_table`` comes from
     ``shard_tables_from_name`` (validated).
     """
-    return f"""REPLACE INTO {pages_table} (
-                        id,
-                        collection_dataset,
-                        file_hash,
-                        extracted_by,
-                        page_id,
-                        page_text,
-                        ner_per,
-                        ner_org,
-                        ner_loc,
-                        ner_misc
-                    ) VALUES (
-                        %s,
-                        %s,
-                        %s,
-                        %s,
-                        %s,
-                        %s,
-                        {row.get('ner_per') or '()'},
-                        {row.get('ner_org') or '()'},
-                        {row.get('ner_loc') or '()'},
-                        {row.get('ner_misc') or '()'}
-                    )"""
-
-
-def meta_replace_sql(meta_table: str, row: dict) -> str:
-    """REPLACE INTO statement for one metadata row.
+    tuples = []
+    values: list = []
+    for row in rows:
+        tuples.append(
+            f"(%s, %s, %s, %s, %s, %s, {row.get('ner_per') or '()'}, {row.get('ner_org') or '()'}, "
+            f"{row.get('ner_loc') or '()'}, {row.get('ner_misc') or '()'})"
+        )
+        values.extend((
+            pages_row_id(collection_dataset, row['file_hash'], row['extracted_by'], row['page_id']),
+            row['collection_dataset'],
+            row['file_hash'],
+            row['extracted_by'],
+            row['page_id'],
+            clean_text(row['text']),
+        ))
+    sql = (
+        f"REPLACE INTO {pages_table} "
+        "(id, collection_dataset, file_hash, extracted_by, page_id, page_text, "
+        "ner_per, ner_org, ner_loc, ner_misc) "
+        "VALUES " + ", ".join(tuples)
+    )
+    return sql, values
+
+
+def meta_replace_sql(meta_table: str, collection_dataset: str,
+                     rows: list[dict]) -> tuple[str, list]:
+    """One multi-row REPLACE INTO for metadata ``rows`` and its flattened bound parameters.
 
     The four facet MVA values are interpolated as Manticore tuples (they cannot be
     bound parameters); everything else is a bound parameter. ``meta_table`` comes
     from ``shard_tables_from_name`` (validated).
     """
-    return f"""REPLACE INTO {meta_table} (
-                        id,
-                        collection_dataset,
-                        file_hash,
-                        filenames,
-                        metadata_values,
-                        file_types,
-                        file_mime_types,
-                        file_extensions,
-                        file_paths
-                    ) VALUES (
-                        %s,
-                        %s,
-                        %s,
-                        %s,
-                        %s,
-                        {row['file_types']},
-                        {row['file_mime_types']},
-                        {row['file_extensions']},
-                        {row['file_paths']}
-                    )"""
+    tuples = []
+    values: list = []
+    for row in rows:
+        tuples.append(
+            f"(%s, %s, %s, %s, %s, {row['file_types']}, {row['file_mime_types']}, "
+            f"{row['file_extensions']}, {row['file_paths']})"
+        )
+        values.extend((
+            metadata_row_id(collection_dataset, row['file_hash']),
+            row['collection_dataset'],
+            row['file_hash'],
+            row['filenames'],
+            row['metadata_values'],
+        ))
+    sql = (
+        f"REPLACE INTO {meta_table} "
+        "(id, collection_dataset, file_hash, filenames, metadata_values, "
+        "file_types, file_mime_types, file_extensions, file_paths) "
+        "VALUES " + ", ".join(tuples)
+    )
+    return sql, values
 
 
 def pages_row_id(collection_dataset: str, file_hash: str, extracted_by: str, page_id: int) -> int:
@@ -211,29 +226,18 @@ def index_text_pages(params: IndexShardParams) -> list[str]:
             segment_entities = {}
         else:
             segment_entities = entities_by_segment.get(key, {})
-        for entity_type in ("PER", "ORG", "LOC", "MISC"):
-            field_name = f"ner_{entity_type.lower()}"
-            field_values = [ner_ids[value] for value in segment_entities.get(entity_type, [])]
-            row[field_name] = repr_manticore_tuple(field_values)
+        for entity_type, field_name in NER_FIELDS:
+            values = segment_entities.get(entity_type)
+            row[field_name] = repr_manticore_tuple([ner_ids[value] for value in values]) if values else "()"
 
     with get_manticore_client() as client:
         cursor = client.cursor()
         for chunk in chunks(text_content, INDEX_ROW_CHUNK_SIZE):
-            for row in chunk:
-                cursor.execute(
-                    pages_replace_sql(pages_table, row),
-                    (
-                        pages_row_id(collection_dataset, row['file_hash'], row['extracted_by'], row['page_id']),
-                        row['collection_dataset'],
-                        row['file_hash'],
-                        row['extracted_by'],
-                        row['page_id'],
-                        clean_text(row['text'])
-                    )
-                )
+            for statement_rows in chunks(chunk, TEXT_ROWS_PER_STATEMENT):
+                sql, values = pages_replace_sql(pages_table, collection_dataset, statement_rows)
+                cursor.execute(sql, values)
             log.info(f"{collection_dataset} (plan {plan_hash[:8]}): Indexed {len(chunk)} text content into {pages_table}")
             client.commit()
-        client.commit()
     return sorted({row['file_hash'] for row in text_content})
 
 
@@ -307,14 +311,11 @@ def index_metadata(params: IndexShardParams) -> list[str]:
     with get_manticore_client() as client:
         cursor = client.cursor()
         for chunk in chunks(search_rows, INDEX_ROW_CHUNK_SIZE):
-            for row in chunk:
-                cursor.execute(
-                    meta_replace_sql(meta_table, row),
-                    (metadata_row_id(collection_dataset, row['file_hash']), row['collection_dataset'], row['file_hash'],  row['filenames'], row['metadata_values'])
-                )
+            for statement_rows in chunks(chunk, TEXT_ROWS_PER_STATEMENT):
+                sql, values = meta_replace_sql(meta_table, collection_dataset, statement_rows)
+                cursor.execute(sql, values)
             log.info(f"{collection_dataset} (plan {plan_hash[:8]}): Indexed {len(chunk)} metadata into {meta_table}")
             client.commit()
-        client.commit()
     return sorted({row['file_hash'] for row in search_rows})
 
 
@@ -343,6 +344,35 @@ def vectors_row_id(collection_dataset: str, file_hash: str, extracted_by: str,
     )
 
 
+def vectors_replace_sql(vectors_table: str, collection_dataset: str,
+                        rows: list[dict]) -> tuple[str, list]:
+    """One multi-row REPLACE INTO for ``rows`` and its flattened bound parameters.
+
+    The embedding is interpolated (``repr_manticore_vector``; a float_vector cannot be
+    bound); everything else is a bound parameter. ``vectors_table`` comes from
+    ``vectors_table_from_name`` (validated).
+    """
+    tuples = []
+    values: list = []
+    for row in rows:
+        tuples.append(f"(%s, %s, %s, %s, %s, %s, {repr_manticore_vector(row['embedding'])})")
+        values.extend((
+            vectors_row_id(collection_dataset, row['file_hash'], row['extracted_by'],
+                           int(row['page_id']), int(row['chunk_index']), row['embedding_model']),
+            collection_dataset,
+            row['file_hash'],
+            row['extracted_by'],
+            int(row['page_id']),
+            int(row['chunk_index']),
+        ))
+    sql = (
+        f"REPLACE INTO {vectors_table} "
+        "(id, collection_dataset, file_hash, extracted_by, page_id, chunk_index, embedding) "
+        "VALUES " + ", ".join(tuples)
+    )
+    return sql, values
+
+
 @activity.defn
 @with_heartbeat
 def index_vectors(params: IndexShardParams) -> list[str]:
@@ -434,38 +464,11 @@ def index_vectors(params: IndexShardParams) -> list[str]:
     with get_manticore_client() as client:
         cursor = client.cursor()
         for chunk in chunks(kept, INDEX_ROW_CHUNK_SIZE):
-            for row in chunk:
-                cursor.execute(
-                    f"""REPLACE INTO {vectors_table} (
-                        id,
-                        collection_dataset,
-                        file_hash,
-                        extracted_by,
-                        page_id,
-                        chunk_index,
-                        embedding
-                    ) VALUES (
-                        %s,
-                        %s,
-                        %s,
-                        %s,
-                        %s,
-                        %s,
-                        {repr_manticore_vector(row['embedding'])}
-                    )""",
-                    (
-                        vectors_row_id(collection_dataset, row['file_hash'], row['extracted_by'],
-                                       int(row['page_id']), int(row['chunk_index']), row['embedding_model']),
-                        collection_dataset,
-                        row['file_hash'],
-                        row['extracted_by'],
-                        int(row['page_id']),
-                        int(row['chunk_index']),
-                    ),
-                )
+            for statement_rows in chunks(chunk, VECTOR_ROWS_PER_STATEMENT):
+                sql, values = vectors_replace_sql(vectors_table, collection_dataset, statement_rows)
+                cursor.execute(sql, values)
             log.info(
                 f"{collection_dataset} (plan {plan_hash[:8]}): Indexed {len(chunk)} vectors into {vectors_table}"
             )
             client.commit()
-        client.commit()
     return sorted({row['file_hash'] for row in kept})
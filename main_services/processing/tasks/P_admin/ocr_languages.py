@@ -358,27 +358,30 @@ def purge_dropped_ocr_variants(params: PurgeVariantsParams) -> Dict[str, int]:
         pdf_rows = 0
         if params.removed_pairs and "pdf_ocr_results" in existing:
             heartbeat.beat("tombstone pdf_ocr_results")
-            for engine, languages in params.removed_pairs:
-                # Tombstone by re-inserting the row with is_deleted = 1: the table is a
-                # ReplacingMergeTree(updated_at, is_deleted) and the readers take
-                # argMax(is_deleted). A hard DELETE here would lose blob_key, which is
-                # the only record of the object to remove.
-                client.command(
-                    "INSERT INTO pdf_ocr_results "
-                    "(collection_dataset, pdf_hash, engine, languages, blob_key, blob_hash, "
-                    " page_count, size_bytes, run_time_ms, is_deleted) "
-                    "SELECT collection_dataset, pdf_hash, engine, languages, "
-                    "       argMax(blob_key, updated_at), argMax(blob_hash, updated_at), "
-                    "       argMax(page_count, updated_at), argMax(size_bytes, updated_at), "
-                    "       argMax(run_time_ms, updated_at), 1 "
-                    "FROM pdf_ocr_results "
-                    "WHERE collection_dataset = {cd:String} AND engine = {en:String} "
-                    "AND languages = {la:String} "
-                    "GROUP BY collection_dataset, pdf_hash, engine, languages "
-                    "HAVING argMax(is_deleted, updated_at) = 0",
-                    parameters={"cd": params.collection_dataset, "en": engine, "la": languages},
-                )
-                pdf_rows += 1
+            # Tombstone by re-inserting the row with is_deleted = 1: the table is a
+            # ReplacingMergeTree(updated_at, is_deleted) and the readers take
+            # argMax(is_deleted). A hard DELETE here would lose blob_key, which is
+            # the only record of the object to remove. One INSERT ... SELECT for all
+            # the pairs: each is a scan of the dataset's rows and a new insert part.
+            client.command(
+                "INSERT INTO pdf_ocr_results "
+                "(collection_dataset, pdf_hash, engine, languages, blob_key, blob_hash, "
+                " page_count, size_bytes, run_time_ms, is_deleted) "
+                "SELECT collection_dataset, pdf_hash, engine, languages, "
+                "       argMax(blob_key, updated_at), argMax(blob_hash, updated_at), "
+                "       argMax(page_count, updated_at), argMax(size_bytes, updated_at), "
+                "       argMax(run_time_ms, updated_at), 1 "
+                "FROM pdf_ocr_results "
+                "WHERE collection_dataset = {cd:String} "
+                "AND (engine, languages) IN {pairs:Array(Tuple(String, String))} "
+                "GROUP BY collection_dataset, pdf_hash, engine, languages "
+                "HAVING argMax(is_deleted, updated_at) = 0",
+                parameters={
+                    "cd": params.collection_dataset,
+                    "pairs": [tuple(pair) for pair in params.removed_pairs],
+                },
+            )
+            pdf_rows = len(params.removed_pairs)
 
     manticore_tables = 0
     tables = [t for t in list_shard_tables(params.collectionname)
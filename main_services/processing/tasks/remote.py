@@ -35,13 +35,22 @@ host chewing through a batch legitimately needs minutes. A single scalar forces
 one number to serve both and guarantees one of them is wrong.
 """
 
+import gzip
 import logging
 import os
+import random
 import threading
 import time
 from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 
+# Bodies are encoded and decoded with orjson, not the stdlib codec ``requests`` uses for
+# ``json=`` / ``.json()``: an NER response for a full batch is thousands of entity
+# objects and an embeddings request is hundreds of page chunks, and orjson does that
+# work several times faster on the worker's CPU.
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 log = logging.getLogger(__name__)
 
@@ -78,6 +87,25 @@ CIRCUIT_BREAK_SECONDS = _env_float("GPU_CIRCUIT_BREAK_SECONDS", 60.0)
 
 GPU_FALLBACK = _env_bool("GPU_FALLBACK", True)
 
+# An overloaded server answers 429/503 ("come back later"), which is not the fault a
+# Temporal retry is for: re-running the activity redoes its queries and lands in the
+# same queue. These are retried in place, honouring Retry-After, a bounded number of
+# times. Every other HTTP error still propagates on the first response.
+BUSY_STATUSES = frozenset({429, 503})
+BUSY_RETRIES = int(_env_float("REMOTE_BUSY_RETRIES", 2))
+BUSY_BACKOFF_SECONDS = _env_float("REMOTE_BUSY_BACKOFF_SECONDS", 1.0)
+BUSY_MAX_DELAY_SECONDS = _env_float("REMOTE_BUSY_MAX_DELAY_SECONDS", 30.0)
+
+# Keep-alive connections kept per host. Sized for the worker's activity threads plus
+# the P5 embed pool; a smaller pool still works, it just reopens sockets under load.
+POOL_MAXSIZE = int(_env_float("REMOTE_POOL_MAXSIZE", 32))
+
+# Request bodies at least this large are sent gzipped (level 1) by the calls that opt in
+# with ``compress=True`` -- the NER and embeddings batches, whose ai-server decodes them.
+# 0, the default, sends everything plain: on a local GPU host the wire costs nothing, and
+# an OpenAI-compatible server other than ours may not decode a compressed request body.
+GZIP_MIN_BYTES = int(_env_float("REMOTE_GZIP_MIN_BYTES", 0))
+
 
 class RemoteUnavailable(RuntimeError):
     """Every configured endpoint for a capability refused or was unreachable.
@@ -129,6 +157,63 @@ class _Breaker:
 
 _BREAKER = _Breaker()
 
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def pooled_session() -> requests.Session:
+    """The process-wide keep-alive session every ai-tier call goes through by default.
+
+    A bare ``requests.post`` opens a fresh TCP connection per call and closes it after,
+    so each NER or embeddings batch paid a handshake to a host it had just talked to.
+    The adapter never retries (``max_retries=0``): retrying is this module's job, and an
+    urllib3 retry underneath would hide connect failures from the breaker.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE, max_retries=0,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def _retry_after_seconds(value: str | None) -> float | None:
+    """``Retry-After`` as seconds from now; it may be delta-seconds or an HTTP-date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _busy_delay(response, retries_so_far: int) -> float | None:
+    """Seconds to wait before asking a busy server again, or ``None`` to stop asking.
+
+    The server's own ``Retry-After`` wins over the exponential schedule. Either way the
+    wait is capped and then stretched by up to half again at random, so a fleet of
+    workers turned away together does not come back together.
+    """
+    if getattr(response, "status_code", None) not in BUSY_STATUSES:
+        return None
+    if retries_so_far >= BUSY_RETRIES:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    delay = _retry_after_seconds(headers.get("Retry-After"))
+    if delay is None:
+        delay = BUSY_BACKOFF_SECONDS * (2 ** retries_so_far)
+    return min(delay, BUSY_MAX_DELAY_SECONDS) * random.uniform(1.0, 1.5)
+
 
 def _record(service: str, provider: str, latency_ms: float, *, ok: bool,
             detail: str) -> None:
@@ -140,7 +225,7 @@ def _record(service: str, provider: str, latency_ms: float, *, ok: bool,
     record(service, provider=provider, latency_ms=latency_ms, ok=ok, detail=detail)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RemoteResult:
     """A response plus **which endpoint actually served it**.
 
@@ -162,6 +247,7 @@ def post_json(
     read_timeout: float = READ_TIMEOUT,
     session: requests.Session | None = None,
     service: str = "",
+    compress: bool = False,
 ) -> RemoteResult:
     """POST ``payload`` to the first endpoint that answers.
 
@@ -172,13 +258,18 @@ def post_json(
     An endpoint is skipped without a request while its breaker is open. A
     connect failure moves to the next endpoint; a *read* failure or an HTTP
     error does not, because the host is alive and retrying elsewhere would hide
-    a real server-side problem behind a silently degraded provider.
+    a real server-side problem behind a silently degraded provider. A 429/503
+    is asked again on the same endpoint after a jittered wait (``BUSY_RETRIES``
+    times), then propagates like any other HTTP error.
 
     ``service`` names the capability for ``ai_service_telemetry`` (``ocr``, ``ner``,
     ``embeddings``). It is separate from ``provider`` because provider is *which endpoint
     answered* -- under fallback those differ, and that difference is the evidence an
     outage happened. Empty means do not record: the callers that opt in are the ones
     ``/admin/ai_status`` has a panel for.
+
+    ``compress`` gzips a body of ``GZIP_MIN_BYTES`` or more, encoded once for every
+    endpoint and retry; pass it only for endpoints that decode ``Content-Encoding``.
     """
     live = [(name, url) for name, url in endpoints if url]
     if not live:
@@ -189,21 +280,31 @@ def post_json(
     if not GPU_FALLBACK:
         live = live[:1]
 
-    post = (session or requests).post
+    post = (session or pooled_session()).post
     attempts: list[str] = []
 
-    for index, (provider, url) in enumerate(live):
+    body = orjson.dumps(payload)
+    headers = {"Content-Type": "application/json"}
+    if compress and 0 < GZIP_MIN_BYTES <= len(body):
+        body = gzip.compress(body, compresslevel=1)
+        headers["Content-Encoding"] = "gzip"
+
+    index = 0
+    busy_retries = 0
+    while index < len(live):
+        provider, url = live[index]
         is_last = index == len(live) - 1
         if _BREAKER.is_open(url) and not is_last:
             attempts.append(f"{provider} ({url}): circuit open, skipped")
             _record(service, provider, 0.0, ok=False, detail="circuit open, skipped")
+            index += 1
             continue
         started = time.monotonic()
         try:
             response = post(
                 url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
+                data=body,
+                headers=headers,
                 timeout=(CONNECT_TIMEOUT, read_timeout),
             )
         except (requests.ConnectionError, requests.Timeout) as exc:
@@ -222,10 +323,22 @@ def post_json(
                     ok=False, detail=type(exc).__name__)
             if isinstance(exc, requests.ReadTimeout):
                 break       # host is alive and slow; do not silently downgrade
+            index += 1
             continue
 
         _BREAKER.record_success(url)
         elapsed_ms = (time.monotonic() - started) * 1000.0
+        delay = _busy_delay(response, busy_retries)
+        if delay is not None:
+            # Same endpoint again, not the CPU twin: a busy GPU is alive, and falling
+            # back would hide its saturation behind a silently degraded provider.
+            _record(service, provider, elapsed_ms, ok=False,
+                    detail=f"HTTP {response.status_code}, retrying")
+            log.info("%s (%s) is busy (HTTP %s); retrying in %.1fs",
+                     provider, url, response.status_code, delay)
+            time.sleep(delay)
+            busy_retries += 1
+            continue
         try:
             response.raise_for_status()
         except Exception:
@@ -238,7 +351,7 @@ def post_json(
         _record(service, provider, elapsed_ms, ok=True, detail=provider)
         if index > 0:
             log.warning("served by fallback provider %s (%s)", provider, url)
-        return RemoteResult(data=response.json(), url=url, provider=provider)
+        return RemoteResult(data=orjson.loads(response.content), url=url, provider=provider)
 
     raise RemoteUnavailable(
         "every endpoint for this call failed:\n  " + "\n  ".join(attempts)
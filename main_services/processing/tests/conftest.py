@@ -8,8 +8,17 @@ Layout:
   ``integration`` and skipped unless ``--integration`` (or
   ``HOOVER4_INTEGRATION=1``) is given. Run them inside the worker container:
   ``docker exec -it hoover4-worker uv run pytest tests --integration -q``.
+
+The integration tests spend nearly all their time waiting on the worker, and each
+one works in its own ``temp_collection`` (a random name, its own ClickHouse
+database and shard tables), so they can run side by side. pytest-xdist is not a
+locked dev dependency; pull it in for the run:
+``uv run --with pytest-xdist pytest tests --integration -n 4 -q``. Every xdist
+worker is its own session, so ``live_stack`` probes once per worker and
+``migrated_collection`` is per worker too; collection names carry the worker id.
 """
 
+import contextlib
 import os
 import sys
 import uuid
@@ -51,21 +60,75 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(skip)
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _no_telemetry_writes(request, monkeypatch):
+    """Unit tests write no ``ai_service_telemetry`` rows.
+
+    Every faked OCR / NER / embeddings call otherwise opened a ClickHouse client of
+    its own to record the attempt; with no stack that is a failed connect per call,
+    and a slow resolver made it seconds each. Integration tests keep the real writes.
+    """
+    if request.node.get_closest_marker("integration"):
+        return
+    from tasks import ai_telemetry
+
+    monkeypatch.setattr(ai_telemetry, "record", lambda *args, **kwargs: None)
+
+
+@pytest.fixture(scope="session")
 def tiny_dataset() -> Path:
-    """Path to the checked-in ~6-file fixture dataset."""
+    """Path to the checked-in ~6-file fixture dataset. Read-only, so shared by the session."""
     assert TINY_DATASET_PATH.is_dir(), f"missing fixture dataset: {TINY_DATASET_PATH}"
     return TINY_DATASET_PATH
 
 
+@pytest.fixture(scope="session")
+def live_stack() -> None:
+    """ClickHouse and Manticore answer, checked once per session.
+
+    Every integration test starts by building a collection, so with the stack down
+    each of them failed on its own connect timeouts — twice, because the teardown
+    reconnects to clean up — before the run reported one problem a dozen ways. A
+    dead stack ends the session here instead, with the one message that matters.
+    """
+    from database.clickhouse import get_global_client
+    from database.manticore import check_manticore_health
+
+    try:
+        with get_global_client() as client:
+            client.query("SELECT 1")
+        check_manticore_health()
+    except Exception as e:
+        pytest.exit(f"integration stack is not reachable: {e}", returncode=1)
+
+
 @pytest.fixture
-def temp_collection():
+def temp_collection(live_stack):
     """A throwaway collection: registry row plus a migrated database.
 
     Yields the collectionname; on teardown drops the Manticore shard tables,
     the ClickHouse database and the global registry rows. Never touches
     ``testdata`` or any other real collection.
     """
+    with _temp_collection() as collectionname:
+        yield collectionname
+
+
+@pytest.fixture(scope="module")
+def migrated_collection(live_stack):
+    """A ``temp_collection`` shared by a module's tests that only read it.
+
+    Creating and migrating a collection database is a few dozen DDL round trips, and
+    dropping it as many again; tests that only inspect the fresh schema need not pay
+    that once each. Anything that ingests, drops or rewrites must keep using
+    ``temp_collection``.
+    """
+    with _temp_collection() as collectionname:
+        yield collectionname
+
+
+@contextlib.contextmanager
+def _temp_collection():
     from database.clickhouse import (
         drop_collection_db,
         get_global_client,
@@ -78,7 +141,10 @@ def temp_collection():
     # validate_collectionname (shard-name collision) and an all-digit hex suffix
     # makes that ~2.3% likely per draw. ('-' is not an option: collection names
     # are [a-z0-9_] only, because Manticore table names are unquoted identifiers.)
-    collectionname = f"test_x{uuid.uuid4().hex[:7]}"
+    # Under pytest-xdist the worker id ("gw3") goes in front of the 'x', so whatever a
+    # killed parallel run leaves behind says which worker's test it belonged to.
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+    collectionname = f"test_{worker}x{uuid.uuid4().hex[:7]}"
     try:
         # Validate before writing anything: a rejected name must not leave an
         # orphan registry row behind.
@@ -1,28 +1,58 @@
 """Shared helpers for the integration tests (live docker stack required)."""
 
 import json
+import logging
 import os
 import time
+import urllib.error
 import urllib.request
 
+log = logging.getLogger(__name__)
+
 PLAN_POLL_INTERVAL_S = 5
 
 
+def poll_intervals(initial_s: float, maximum_s: float):
+    """Sleeps for a readiness poll: ``initial_s`` first, growing 1.5x up to ``maximum_s``.
+
+    A flat interval paid its full length even when the condition held a moment after
+    the first probe (a purge's deletes usually land well inside one interval), while a
+    short flat one kept hammering ClickHouse through a long ingest. Backing off gives
+    the quick case its answer quickly and the slow case few probes.
+    """
+    interval = initial_s
+    while True:
+        yield interval
+        interval = min(maximum_s, interval * 1.5)
+
+
 def ner_service_reachable() -> bool:
-    """Whether the remote NER service answers on its real endpoint.
+    """Whether the remote NER service is up with its model loaded.
 
-    Probes ``{NER_URL}/extract-entities`` with a one-text request — the same
-    endpoint the P4 stage posts to (NOT ``/docs``: a healthy service that does
-    not serve docs would otherwise be reported unreachable, silently downgrading
-    every test that branches on this probe).
+    Asks ``/health`` first — both NER servers (the GPU ai-server and the spaCy
+    twin) report ``ner_model_loaded`` there, and answering it costs no forward
+    pass. Only a server without that route (404) is probed the expensive way, on
+    its real endpoint ``{NER_URL}/extract-entities`` with a one-text request —
+    NOT ``/docs``: a healthy service that does not serve docs would otherwise be
+    reported unreachable, silently downgrading every test that branches on this
+    probe.
 
     When it does not answer, P4 records its failures in ``processing_errors`` and
     the pipeline continues with empty entity MVAs — but ``nlp_processed`` stays
     empty, so tests asserting on it must branch on this probe.
     """
-    ner_url = os.environ.get("NER_URL", "")
+    ner_url = os.environ.get("NER_URL", "").rstrip("/")
     if not ner_url:
         return False
+    origin = ner_url[:-len("/v1")] if ner_url.endswith("/v1") else ner_url
+    try:
+        with urllib.request.urlopen(f"{origin}/health", timeout=5) as response:
+            return bool(json.load(response).get("ner_model_loaded"))
+    except urllib.error.HTTPError as exc:
+        if exc.code != 404:
+            return False
+    except Exception:
+        return False
     try:
         req = urllib.request.Request(
             f"{ner_url}/extract-entities",
@@ -39,6 +69,28 @@ def ner_service_reachable() -> bool:
         return False
 
 
+def manticore_doc_counts(collectionname: str) -> dict[str, int]:
+    """Documents per ``<shard>_meta`` table of the collection.
+
+    Document identity is the ``(collection_dataset, file_hash)`` pair, and a meta row's
+    id is derived from exactly that pair (``metadata_row_id``, written with REPLACE), so
+    a table holds one row per pair and ``count(*)`` is the distinct-pair count. The
+    tests used to GROUP BY the pair and pull every group back over the wire to count
+    them client-side.
+    """
+    from database.manticore import get_manticore_client, list_shard_tables
+
+    counts = {}
+    with get_manticore_client() as cnx:
+        cursor = cnx.cursor()
+        for table in list_shard_tables(collectionname):
+            if not table.endswith("_meta"):
+                continue
+            cursor.execute(f"SELECT count(*) FROM {table}")
+            counts[table] = int(cursor.fetchone()[0])
+    return counts
+
+
 def wait_for_plans_finished(collectionname: str, timeout_s: int = 1800) -> None:
     """Poll until every plan of the collection is finished (P0..P6 chain done).
 
@@ -48,7 +100,9 @@ def wait_for_plans_finished(collectionname: str, timeout_s: int = 1800) -> None:
     """
     from database.clickhouse import get_collection_client
 
-    deadline = time.monotonic() + timeout_s
+    started = time.monotonic()
+    deadline = started + timeout_s
+    intervals = poll_intervals(0.5, PLAN_POLL_INTERVAL_S)
     while True:
         with get_collection_client(collectionname) as client:
             plans = client.query(
@@ -58,13 +112,15 @@ def wait_for_plans_finished(collectionname: str, timeout_s: int = 1800) -> None:
                 "SELECT count() FROM processing_plan_finished FINAL"
             ).result_rows[0][0]
         if plans > 0 and plans == finished:
+            log.debug("%d plans of %s finished after %.1fs",
+                      plans, collectionname, time.monotonic() - started)
             return
         if time.monotonic() > deadline:
             raise TimeoutError(
                 f"plans of {collectionname} not finished after {timeout_s}s: "
                 f"{finished}/{plans}"
             )
-        time.sleep(PLAN_POLL_INTERVAL_S)
+        time.sleep(next(intervals))
 
 
 def ingest_dataset(collectionname: str, dataset_name: str, path: str) -> str:
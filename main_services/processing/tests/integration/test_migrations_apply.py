@@ -35,16 +35,16 @@ def _expected_tables() -> set[str]:
     return tables
 
 
-def test_fresh_collection_has_exact_table_set(temp_collection):
+def test_fresh_collection_has_exact_table_set(migrated_collection):
     """A migrated collection DB has exactly the migration tables plus schema_versions."""
     expected = _expected_tables()
     assert len(expected) > 20, "migration parsing must find the full table set"
-    with get_collection_client(temp_collection) as client:
+    with get_collection_client(migrated_collection) as client:
         actual = {row[0] for row in client.query("SHOW TABLES").result_rows}
     assert actual == expected | {"schema_versions"}
 
 
-def test_schema_versions_records_every_migration(temp_collection):
+def test_schema_versions_records_every_migration(migrated_collection):
     """One schema_versions row per migration file, with matching versions.
 
     This clickhouse-migrations version records (version, md5, script, created_at)
@@ -53,16 +53,16 @@ def test_schema_versions_records_every_migration(temp_collection):
     """
     files = sorted(Path(COLLECTION_MIGRATIONS_PATH).glob("*.sql"))
     expected_versions = sorted(int(f.name.split("_")[0]) for f in files)
-    with get_collection_client(temp_collection) as client:
+    with get_collection_client(migrated_collection) as client:
         rows = client.query("SELECT version FROM schema_versions").result_rows
     assert sorted(row[0] for row in rows) == expected_versions
 
 
-def test_migrate_twice_applies_nothing_new(temp_collection):
+def test_migrate_twice_applies_nothing_new(migrated_collection):
     """Migrate is idempotent: a second run records no additional migrations."""
-    with get_collection_client(temp_collection) as client:
+    with get_collection_client(migrated_collection) as client:
         before = client.query("SELECT count() FROM schema_versions").result_rows[0][0]
-    migrate_collection(temp_collection)
-    with get_collection_client(temp_collection) as client:
+    migrate_collection(migrated_collection)
+    with get_collection_client(migrated_collection) as client:
         after = client.query("SELECT count() FROM schema_versions").result_rows[0][0]
     assert before == after
@@ -14,30 +14,14 @@ import time
 import pytest
 
 from database.clickhouse import get_collection_client
-from database.manticore import drop_collection_tables, get_manticore_client, list_shard_tables
+from database.manticore import drop_collection_tables, list_shard_tables
 from main import reindex_collection
 
-from .helpers import ingest_dataset, wait_for_plans_finished
+from .helpers import ingest_dataset, manticore_doc_counts, poll_intervals, wait_for_plans_finished
 
 pytestmark = [pytest.mark.integration, pytest.mark.timeout(3600)]
 
 
-def _manticore_pair_count(collectionname: str) -> int:
-    # Manticore has no count(distinct concat(...)): GROUP BY the pair, count rows.
-    total = 0
-    with get_manticore_client() as cnx:
-        cursor = cnx.cursor()
-        for table in list_shard_tables(collectionname):
-            if not table.endswith("_meta"):
-                continue
-            cursor.execute(
-                f"SELECT collection_dataset, file_hash FROM {table} "
-                "GROUP BY collection_dataset, file_hash LIMIT 100000"
-            )
-            total += len(cursor.fetchall())
-    return total
-
-
 def test_reindex_collection_command(temp_collection, tiny_dataset):
     collectionname = temp_collection
     ingest_dataset(collectionname, "tiny", str(tiny_dataset))
@@ -48,7 +32,7 @@ def test_reindex_collection_command(temp_collection, tiny_dataset):
             "SELECT count() FROM index_state FINAL"
         ).result_rows[0][0])
     assert expected_docs > 0
-    assert _manticore_pair_count(collectionname) == expected_docs
+    assert sum(manticore_doc_counts(collectionname).values()) == expected_docs
 
     # Simulate the lost Manticore volume, then run the recovery command.
     dropped = drop_collection_tables(collectionname)
@@ -59,6 +43,7 @@ def test_reindex_collection_command(temp_collection, tiny_dataset):
     # The command queues real IndexDatasetPlan workflows; wait until every
     # document is recorded as indexed again.
     deadline = time.monotonic() + 600
+    intervals = poll_intervals(0.5, 5)
     while True:
         with get_collection_client(collectionname) as client:
             indexed = int(client.query("SELECT count() FROM index_state FINAL").result_rows[0][0])
@@ -69,7 +54,7 @@ def test_reindex_collection_command(temp_collection, tiny_dataset):
                 f"reindex of {collectionname} did not finish within 600s: "
                 f"{indexed}/{expected_docs} documents indexed"
             )
-        time.sleep(5)
+        time.sleep(next(intervals))
 
     assert list_shard_tables(collectionname), "reindex must recreate the shard tables"
-    assert _manticore_pair_count(collectionname) == expected_docs
+    assert sum(manticore_doc_counts(collectionname).values()) == expected_docs
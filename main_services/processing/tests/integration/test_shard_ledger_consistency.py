@@ -18,37 +18,17 @@ import asyncio
 import pytest
 
 from database.clickhouse import get_collection_client
-from database.manticore import get_manticore_client, list_shard_tables
 from tasks.P0_scan_disk.submit_job import add_disk_dataset
 from tasks.P1_compute_plans.submit_job import submit_compute_plans
 from tasks.P2_execute_plan.submit_job import submit_execute_plans
 from tasks.P6_index_data import shard_planner
 from tasks.P6_index_data.params import PlanShardsParams
 
-from .helpers import wait_for_plans_finished
+from .helpers import manticore_doc_counts, wait_for_plans_finished
 
 pytestmark = [pytest.mark.integration, pytest.mark.timeout(3600)]
 
 
-def _manticore_doc_counts_by_shard_table(collectionname: str) -> dict[str, int]:
-    """Distinct ``(collection_dataset, file_hash)`` pairs per ``<shard>_meta`` table.
-
-    Manticore has no ``count(distinct concat(...))``: GROUP BY the pair and count
-    the rows. Document identity is the pair, not file_hash alone."""
-    counts = {}
-    with get_manticore_client() as cnx:
-        cursor = cnx.cursor()
-        for table in list_shard_tables(collectionname):
-            if not table.endswith("_meta"):
-                continue
-            cursor.execute(
-                f"SELECT collection_dataset, file_hash FROM {table} "
-                "GROUP BY collection_dataset, file_hash LIMIT 100000"
-            )
-            counts[table] = len(cursor.fetchall())
-    return counts
-
-
 def test_shard_ledger_consistency(temp_collection, tiny_dataset, monkeypatch):
     collectionname = temp_collection
     collection_dataset = f"{collectionname}_tiny"
@@ -81,7 +61,7 @@ def test_shard_ledger_consistency(temp_collection, tiny_dataset, monkeypatch):
     assert len(assignments) == len(pairs), "every (dataset, file_hash) pair must appear exactly once"
     assert sum(int(row[2]) for row in ledger) == len(pairs)
     assert int(index_state_count) == len(pairs), "index_state must record every indexed pair"
-    manticore_counts = _manticore_doc_counts_by_shard_table(collectionname)
+    manticore_counts = manticore_doc_counts(collectionname)
     assert manticore_counts, "expected Manticore shard meta tables"
     assert sum(manticore_counts.values()) == len(pairs)
 
@@ -13,33 +13,12 @@ Requires the docker stack; run inside the worker container:
 import pytest
 
 from database.clickhouse import get_collection_client
-from database.manticore import get_manticore_client, list_shard_tables
 
-from .helpers import ingest_dataset, wait_for_plans_finished
+from .helpers import ingest_dataset, manticore_doc_counts, wait_for_plans_finished
 
 pytestmark = [pytest.mark.integration, pytest.mark.timeout(3600)]
 
 
-def _manticore_pair_count(collectionname: str) -> int:
-    """Distinct (collection_dataset, file_hash) pairs over all shard meta tables.
-
-    Manticore has no ``count(distinct concat(...))``: GROUP BY the pair and
-    count the rows.
-    """
-    total = 0
-    with get_manticore_client() as cnx:
-        cursor = cnx.cursor()
-        for table in list_shard_tables(collectionname):
-            if not table.endswith("_meta"):
-                continue
-            cursor.execute(
-                f"SELECT collection_dataset, file_hash FROM {table} "
-                "GROUP BY collection_dataset, file_hash LIMIT 100000"
-            )
-            total += len(cursor.fetchall())
-    return total
-
-
 def test_two_datasets_sharing_content(temp_collection, tiny_dataset):
     collectionname = temp_collection
     cd1 = ingest_dataset(collectionname, "tiny", str(tiny_dataset))
@@ -73,4 +52,4 @@ def test_two_datasets_sharing_content(temp_collection, tiny_dataset):
     assert len(assignments) == len(per_pair) == 2 * docs_per_dataset
     # What actually reached a shard: one copy per dataset.
     assert int(index_state_count) == 2 * docs_per_dataset
-    assert _manticore_pair_count(collectionname) == 2 * docs_per_dataset
+    assert sum(manticore_doc_counts(collectionname).values()) == 2 * docs_per_dataset
@@ -0,0 +1,34 @@
+"""Fixtures shared by the unit tests."""
+
+import gzip
+import json
+
+import pytest
+
+from tasks import remote
+
+
+class _FakeSession:
+    """Stands in for tasks.remote's pooled session: every call goes to ``post``, with
+    the wire body decoded back into ``json=`` the way the server reads it."""
+
+    def __init__(self, post):
+        self._post = post
+
+    def post(self, url, data=None, headers=None, **kwargs):
+        body = data
+        if (headers or {}).get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return self._post(url, json=json.loads(body), data=data, headers=headers, **kwargs)
+
+
+@pytest.fixture
+def fake_remote(monkeypatch):
+    """Installs a fake ai-tier server: ``fake_remote(post)`` routes every
+    ``tasks.remote`` call to ``post(url, json=..., data=..., headers=..., timeout=...)``
+    for the rest of the test."""
+
+    def install(post):
+        monkeypatch.setattr(remote, "_SESSION", _FakeSession(post))
+
+    return install
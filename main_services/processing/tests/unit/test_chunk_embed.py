@@ -118,3 +118,156 @@ class TestEmbeddingInput:
     def test_unknown_kind_refuses(self):
         with pytest.raises(ValueError):
             embedding_input("intfloat/multilingual-e5-small", "document", "text")
+
+
+class TestEmbedBatch:
+    """`_embed_batch`: one request per batch, vectors back in input order."""
+
+    @staticmethod
+    def _serve(monkeypatch, reply):
+        from tasks.P5_chunk_embed import activities
+        from tasks.remote import RemoteResult
+
+        sent = []
+
+        def post_json(endpoints, payload, **kwargs):
+            sent.append(payload["input"])
+            return RemoteResult(data=reply(payload["input"]), url=endpoints[0][1], provider="embeddings")
+
+        monkeypatch.setattr(activities, "post_json", post_json)
+        return activities, sent
+
+    def test_scatters_by_index_not_position(self, monkeypatch):
+        # The server may answer out of order; a positional zip would file each
+        # vector under its neighbour's chunk key.
+        def reply(texts):
+            items = [{"index": i, "embedding": [float(i), 0.0]} for i in range(len(texts))]
+            return {"model": "intfloat/multilingual-e5-small", "data": items[::-1]}
+
+        activities, sent = self._serve(monkeypatch, reply)
+        vectors = activities._embed_batch(
+            "http://gpu", "intfloat/multilingual-e5-small", 2, ["a", "b", "c"],
+        )
+        assert vectors.tolist() == [[0.0, 0.0], [1.0, 0.0], [2.0, 0.0]]
+        assert sent == [["passage: a", "passage: b", "passage: c"]]
+
+    def test_duplicate_texts_are_sent_once_and_fanned_back_out(self, monkeypatch):
+        # Boilerplate footers chunk to identical text on every page.
+        def reply(texts):
+            return {"model": "intfloat/multilingual-e5-small",
+                    "data": [{"index": i, "embedding": [float(i), 1.0]} for i in range(len(texts))]}
+
+        activities, sent = self._serve(monkeypatch, reply)
+        vectors = activities._embed_batch(
+            "http://gpu", "intfloat/multilingual-e5-small", 2, ["footer", "a", "footer", "b", "a"],
+        )
+        assert sent == [["passage: footer", "passage: a", "passage: b"]]
+        assert vectors.tolist() == [[0.0, 1.0], [1.0, 1.0], [0.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+
+    def test_base64_vectors_are_decoded_as_float32(self, monkeypatch):
+        import base64
+
+        import numpy as np
+
+        def reply(texts):
+            packed = base64.b64encode(np.array([0.5, -2.0], dtype="<f4").tobytes()).decode()
+            return {"model": "intfloat/multilingual-e5-small",
+                    "data": [{"index": 0, "embedding": packed},
+                             {"index": 1, "embedding": [0.25, 1.0]}]}
+
+        activities, _ = self._serve(monkeypatch, reply)
+        vectors = activities._embed_batch(
+            "http://gpu", "intfloat/multilingual-e5-small", 2, ["a", "b"],
+        )
+        # The second item shows a server that ignored encoding_format is still accepted.
+        assert vectors.dtype == np.float32
+        assert vectors.tolist() == [[0.5, -2.0], [0.25, 1.0]]
+
+    def test_the_decoder_picked_from_the_first_vector_still_takes_the_other_format(
+        self, monkeypatch,
+    ):
+        import base64
+
+        import numpy as np
+
+        def reply(texts):
+            packed = base64.b64encode(np.array([0.5, -2.0], dtype="<f4").tobytes()).decode()
+            return {"model": "intfloat/multilingual-e5-small",
+                    "data": [{"index": 0, "embedding": [0.25, 1.0]},
+                             {"index": 1, "embedding": packed}]}
+
+        activities, _ = self._serve(monkeypatch, reply)
+        vectors = activities._embed_batch(
+            "http://gpu", "intfloat/multilingual-e5-small", 2, ["a", "b"],
+        )
+        assert vectors.tolist() == [[0.25, 1.0], [0.5, -2.0]]
+
+    def test_short_response_is_refused(self, monkeypatch):
+        from temporalio.exceptions import ApplicationError
+
+        def reply(texts):
+            return {"model": "intfloat/multilingual-e5-small",
+                    "data": [{"index": 0, "embedding": [1.0, 0.0]}]}
+
+        activities, _ = self._serve(monkeypatch, reply)
+        with pytest.raises(ApplicationError) as err:
+            activities._embed_batch("http://gpu", "intfloat/multilingual-e5-small", 2, ["a", "b"])
+        assert err.value.non_retryable
+
+    def test_a_repeated_index_does_not_count_twice(self, monkeypatch):
+        # Two items for slot 0 and none for slot 1 is still a short response.
+        from temporalio.exceptions import ApplicationError
+
+        def reply(texts):
+            return {"model": "intfloat/multilingual-e5-small",
+                    "data": [{"index": 0, "embedding": [1.0, 0.0]},
+                             {"index": 0, "embedding": [1.0, 0.0]}]}
+
+        activities, _ = self._serve(monkeypatch, reply)
+        with pytest.raises(ApplicationError, match="returned 1 vectors for 2 texts"):
+            activities._embed_batch("http://gpu", "intfloat/multilingual-e5-small", 2, ["a", "b"])
+
+
+class TestBatches:
+    """`_batches`: packing by count AND bytes, in order, never dropping a chunk."""
+
+    @staticmethod
+    def _chunks(*sizes):
+        return [{"text": "x" * size, "n": i} for i, size in enumerate(sizes)]
+
+    def test_closes_on_the_byte_budget(self, monkeypatch):
+        from tasks.P5_chunk_embed import activities
+
+        monkeypatch.setattr(activities, "EMBED_BATCH_TEXTS", 10)
+        monkeypatch.setattr(activities, "EMBED_BATCH_BYTES", 100)
+        batches = list(activities._batches(self._chunks(40, 40, 40, 10, 90)))
+        assert [[c["n"] for c in b] for b in batches] == [[0, 1], [2, 3], [4]]
+
+    def test_closes_on_the_count(self, monkeypatch):
+        from tasks.P5_chunk_embed import activities
+
+        monkeypatch.setattr(activities, "EMBED_BATCH_TEXTS", 2)
+        monkeypatch.setattr(activities, "EMBED_BATCH_BYTES", 10_000)
+        batches = list(activities._batches(self._chunks(1, 1, 1, 1, 1)))
+        assert [len(b) for b in batches] == [2, 2, 1]
+
+    def test_an_oversized_chunk_goes_out_alone(self, monkeypatch):
+        # A single overlong word is its own chunk at any size (see chunking.py).
+        from tasks.P5_chunk_embed import activities
+
+        monkeypatch.setattr(activities, "EMBED_BATCH_TEXTS", 10)
+        monkeypatch.setattr(activities, "EMBED_BATCH_BYTES", 100)
+        batches = list(activities._batches(self._chunks(10, 5000, 10)))
+        assert [[c["n"] for c in b] for b in batches] == [[0], [1], [2]]
+
+
+def test_embedding_column_shares_the_matrix_buffer():
+    import numpy as np
+
+    from tasks.P5_chunk_embed import activities
+
+    matrix = np.arange(6, dtype=np.float32).reshape(3, 2)
+    column = activities._embedding_column(matrix)
+    assert column.to_pylist() == [[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]]
+    assert np.shares_memory(column.values.to_numpy(), matrix)
+    assert activities._embedding_column(np.zeros((0, 2), dtype=np.float32)).to_pylist() == []
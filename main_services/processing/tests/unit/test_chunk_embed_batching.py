@@ -0,0 +1,172 @@
+"""Tests for tasks.P5_chunk_embed.activities.chunk_embed_for_hashes.
+
+Covers the embeddings-request fan-out: batches are requested concurrently on the
+module pool but written strictly in submission order, every chunk gets exactly its
+own vector however the responses interleave, and a failed batch fails the activity
+with every earlier batch already durable.
+"""
+
+import contextlib
+import json
+import random
+import time
+
+import pytest
+import requests
+
+from tasks.P5_chunk_embed import activities as embed_activities
+from tasks.P5_chunk_embed.params import ChunkEmbedParams
+
+MODEL = "intfloat/multilingual-e5-small"
+
+
+class _FakeQueryResult:
+    def __init__(self, rows):
+        self._rows = rows
+        self.result_rows = []
+
+    def to_pylist(self):
+        return self._rows
+
+
+class _FakeCHClient:
+    """Serves canned text_content rows, an empty anti-join, and records inserts."""
+
+    def __init__(self, text_rows):
+        self._text_rows = text_rows
+        self.inserts = {}
+
+    def query_arrow(self, query, parameters=None):
+        return _FakeQueryResult(self._text_rows)
+
+    def query(self, query, parameters=None):
+        return _FakeQueryResult([])
+
+    def insert_arrow(self, table, tbl):
+        self.inserts.setdefault(table, []).append(tbl.to_pylist())
+
+
+class _FakeResponse:
+    def __init__(self, payload, error=None):
+        self._payload = payload
+        self._error = error
+
+    def raise_for_status(self):
+        if self._error is not None:
+            raise self._error
+
+    @property
+    def content(self):
+        return json.dumps(self._payload).encode()
+
+
+def _text_rows(n):
+    return [
+        {
+            "collection_dataset": "coll_ds",
+            "file_hash": f"hash-{i}",
+            "extracted_by": "tika",
+            "page_id": 0,
+            "text": f"page number {i} of an ordinary document",
+        }
+        for i in range(n)
+    ]
+
+
+def _params(n):
+    return ChunkEmbedParams(
+        collectionname="coll",
+        collection_dataset="coll_ds",
+        plan_hash="planhash123",
+        hashes=[f"hash-{i}" for i in range(n)],
+    )
+
+
+def _vector_for(text):
+    # The page number rides in the vector, so a mis-filed vector is visible.
+    return [float(text.split()[3]), 1.0]
+
+
+def _embedded(texts):
+    """The server's answer for ``texts``: one vector per input, in input order."""
+    return _FakeResponse({
+        "model": MODEL,
+        "data": [{"index": j, "embedding": _vector_for(t)} for j, t in enumerate(texts)],
+    })
+
+
+def _install_fakes(monkeypatch, fake_remote, text_rows, post, *, batch_texts=4):
+    fake_client = _FakeCHClient(text_rows)
+
+    @contextlib.contextmanager
+    def fake_client_ctx(collectionname):
+        yield fake_client
+
+    monkeypatch.setattr(embed_activities, "get_collection_client", fake_client_ctx)
+    monkeypatch.setattr(embed_activities, "_probed_serving", lambda: (MODEL, 2))
+    monkeypatch.setattr(embed_activities, "EMBED_BATCH_TEXTS", batch_texts)
+    monkeypatch.setenv("EMBEDDINGS_URL", "http://embeddings.test/v1")
+    fake_remote(post)
+    return fake_client
+
+
+def test_batches_are_written_in_order_whatever_order_they_finish(monkeypatch, fake_remote):
+    def fake_post(url, json=None, **kwargs):
+        time.sleep(random.uniform(0, 0.02))
+        return _embedded(json["input"])
+
+    fake_client = _install_fakes(monkeypatch, fake_remote, _text_rows(30), fake_post)
+
+    result = embed_activities.chunk_embed_for_hashes(_params(30))
+
+    assert result.vectors_written == 30
+    batches = fake_client.inserts["text_chunk_vectors"]
+    assert [len(b) for b in batches] == [4] * 7 + [2]
+    rows = [row for batch in batches for row in batch]
+    assert [row["file_hash"] for row in rows] == [f"hash-{i}" for i in range(30)]
+    for row in rows:
+        assert row["embedding"] == [float(row["file_hash"].split("-")[1]), 1.0]
+        assert (row["embedding_model"], row["dims"]) == (MODEL, 2)
+    (chunk_rows,) = fake_client.inserts["text_chunks"]
+    assert len(chunk_rows) == 30
+    assert all(row["text_bytes"] == len(row["text"].encode()) for row in chunk_rows)
+
+
+def test_failed_batch_propagates_after_earlier_batches_are_written(monkeypatch, fake_remote):
+    """Failure policy: the activity fails so Temporal retries it; batches before the
+    failure are durable, so the anti-join redoes only the rest."""
+
+    def fake_post(url, json=None, **kwargs):
+        if "page number 9 " in " ".join(json["input"]) + " ":
+            return _FakeResponse({}, error=requests.HTTPError("embeddings down"))
+        return _embedded(json["input"])
+
+    fake_client = _install_fakes(monkeypatch, fake_remote, _text_rows(20), fake_post)
+
+    with pytest.raises(requests.HTTPError):
+        embed_activities.chunk_embed_for_hashes(_params(20))
+
+    written = [row["file_hash"] for batch in fake_client.inserts.get("text_chunk_vectors", []) for row in batch]
+    assert written == [f"hash-{i}" for i in range(8)]
+
+
+def test_only_pages_with_a_missing_vector_are_rewritten_and_embedded(monkeypatch, fake_remote):
+    """The anti-join is decided page by page: an embedded page writes nothing, a page
+    missing one vector rewrites its chunk rows and embeds only that one chunk."""
+    posted = []
+
+    def fake_post(url, json=None, **kwargs):
+        posted.extend(json["input"])
+        return _embedded(json["input"])
+
+    fake_client = _install_fakes(monkeypatch, fake_remote, _text_rows(3), fake_post)
+    embedded = _FakeQueryResult([])
+    embedded.result_rows = [("hash-0", "tika", 0, 0), ("hash-2", "tika", 0, 0)]
+    monkeypatch.setattr(fake_client, "query", lambda query, parameters=None: embedded)
+
+    result = embed_activities.chunk_embed_for_hashes(_params(3))
+
+    assert result.vectors_written == 1
+    assert len(posted) == 1 and "page number 1 " in posted[0] + " "
+    (chunk_rows,) = fake_client.inserts["text_chunks"]
+    assert [row["file_hash"] for row in chunk_rows] == ["hash-1"]
@@ -6,7 +6,10 @@ policy: NER errors must propagate, never be swallowed into empty results.
 """
 
 import contextlib
+import json
 import math
+import random
+import time
 
 import pytest
 import requests
@@ -49,8 +52,9 @@ class _FakeResponse:
         if self._error is not None:
             raise self._error
 
-    def json(self):
-        return self._payload
+    @property
+    def content(self):
+        return json.dumps(self._payload).encode()
 
 
 def _text_rows(n):
@@ -76,7 +80,7 @@ def _params(n):
     )
 
 
-def _install_fakes(monkeypatch, text_rows, post):
+def _install_fakes(monkeypatch, fake_remote, text_rows, post):
     fake_client = _FakeCHClient(text_rows)
 
     @contextlib.contextmanager
@@ -90,12 +94,12 @@ def _install_fakes(monkeypatch, text_rows, post):
     monkeypatch.setenv("NER_URL", "http://ner.test/v1")
     monkeypatch.setenv("NER_PROVIDER", "gpu")
     monkeypatch.delenv("NER_URL_FALLBACK", raising=False)
-    monkeypatch.setattr(requests, "post", post)
+    fake_remote(post)
     return fake_client
 
 
 @pytest.mark.parametrize("n", [1, 63, 64, 65, 130])
-def test_ner_requests_are_batched_and_reassembled_in_order(monkeypatch, n):
+def test_ner_requests_are_batched_and_reassembled_in_order(monkeypatch, fake_remote, n):
     batches = []
 
     def fake_post(url, json=None, **kwargs):
@@ -107,14 +111,16 @@ def test_ner_requests_are_batched_and_reassembled_in_order(monkeypatch, n):
         ]
         return _FakeResponse({"data": entities})
 
-    fake_client = _install_fakes(monkeypatch, _text_rows(n), fake_post)
+    fake_client = _install_fakes(monkeypatch, fake_remote, _text_rows(n), fake_post)
 
     result = nlp_activities.extract_entities_for_hashes(_params(n))
 
     # ceil(n / NLP_BATCH_TEXTS) calls, each bounded by NLP_BATCH_TEXTS
     assert len(batches) == math.ceil(n / NLP_BATCH_TEXTS)
     assert all(len(batch) <= NLP_BATCH_TEXTS for batch in batches)
-    # requests cover the cleaned texts in input order
+    # requests cover the cleaned texts in input order (they may arrive in any
+    # order: batches are in flight concurrently)
+    batches.sort(key=lambda batch: int(batch[0].split("-")[1]))
     assert [t for batch in batches for t in batch] == [f"text-{i}" for i in range(n)]
 
     assert result.text_segments == n
@@ -139,14 +145,68 @@ def test_ner_requests_are_batched_and_reassembled_in_order(monkeypatch, n):
         assert row["nlp_model"] == ner_module.NLP_MODEL_BY_PROVIDER["gpu"]
 
 
-def test_ner_failure_propagates_and_writes_nothing(monkeypatch):
+def test_results_line_up_whatever_order_the_batches_finish(monkeypatch, fake_remote):
+    def fake_post(url, json=None, **kwargs):
+        time.sleep(random.uniform(0, 0.02))
+        entities = [
+            {"text_index": j, "label": "PER", "text": f"ent:{text}"}
+            for j, text in enumerate(json["input"])
+        ]
+        return _FakeResponse({"data": entities})
+
+    n = NLP_BATCH_TEXTS * 5 + 3
+    fake_client = _install_fakes(monkeypatch, fake_remote, _text_rows(n), fake_post)
+
+    nlp_activities.extract_entities_for_hashes(_params(n))
+
+    for row in fake_client.inserts["entity_hit"][0].to_pylist():
+        if row["entity_type"] == "PER":
+            assert row["entity_values"] == [f"ent:text-{row['file_hash'].split('-')[1]}"]
+
+
+def test_duplicate_texts_are_sent_once_and_fanned_back_out(monkeypatch, fake_remote):
+    """Repeated boilerplate (footers, cover pages) costs one NER slot, yet every
+    segment still gets its entity rows and its own watermark."""
+    batches = []
+
+    def fake_post(url, json=None, **kwargs):
+        batch = list(json["input"])
+        batches.append(batch)
+        entities = [
+            {"text_index": j, "label": "PER", "text": f"ent:{text}"}
+            for j, text in enumerate(batch)
+        ]
+        return _FakeResponse({"data": entities})
+
+    rows = _text_rows(6)
+    for row in rows[3:]:
+        row["text"] = "same footer  "
+    fake_client = _install_fakes(monkeypatch, fake_remote, rows, fake_post)
+
+    result = nlp_activities.extract_entities_for_hashes(_params(6))
+
+    assert [t for batch in batches for t in batch] == [
+        "text-0", "text-1", "text-2", "same footer",
+    ]
+    assert result.text_segments == 6
+    per_rows = [
+        r for r in fake_client.inserts["entity_hit"][0].to_pylist()
+        if r["entity_type"] == "PER"
+    ]
+    by_hash = {r["file_hash"]: r["entity_values"] for r in per_rows}
+    assert by_hash["hash-1"] == ["ent:text-1"]
+    assert by_hash["hash-3"] == by_hash["hash-5"] == ["ent:same footer"]
+    assert len(fake_client.inserts["nlp_processed"][0].to_pylist()) == 6
+
+
+def test_ner_failure_propagates_and_writes_nothing(monkeypatch, fake_remote):
     """Failure policy: the activity must fail (so Temporal retries it), never
     swallow the error into empty entity lists."""
 
     def fake_post(url, json=None, **kwargs):
         return _FakeResponse({}, error=requests.HTTPError("ner service down"))
 
-    fake_client = _install_fakes(monkeypatch, _text_rows(3), fake_post)
+    fake_client = _install_fakes(monkeypatch, fake_remote, _text_rows(3), fake_post)
 
     with pytest.raises(requests.HTTPError):
         nlp_activities.extract_entities_for_hashes(_params(3))
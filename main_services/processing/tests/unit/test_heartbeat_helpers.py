@@ -44,7 +44,11 @@ def test_the_two_constants_hold_the_agreed_relationship():
 def test_pump_fires_from_a_blocked_thread(monkeypatch):
     ctx = _FakeActivityContext().install(monkeypatch)
     with hb.heartbeat_pump("extracting", interval_seconds=0.02):
-        time.sleep(0.2)          # stands in for a blocking subprocess.run
+        # Stands in for a blocking subprocess.run: block until the pump has fired
+        # a few times rather than for a fixed stretch, with a deadline for failure.
+        deadline = time.monotonic() + 2.0
+        while len(ctx.beats) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
     assert len(ctx.beats) >= 3, f"pump did not fire while blocked: {ctx.beats}"
     assert all(beat == ("extracting",) for beat in ctx.beats)
 
@@ -80,11 +84,13 @@ def test_pump_survives_a_heartbeat_that_raises(monkeypatch):
 
 def test_clock_rate_limits_in_loop_heartbeats(monkeypatch):
     ctx = _FakeActivityContext().install(monkeypatch)
+    now = {"t": 1000.0}
+    monkeypatch.setattr(time, "monotonic", lambda: now["t"])
     clock = hb.HeartbeatClock(interval_seconds=0.05)
 
     assert clock.beat("0/100") is True, "first iteration must always beat"
     assert clock.beat("1/100") is False, "a tight loop must not beat every pass"
-    time.sleep(0.06)
+    now["t"] += 0.06
     assert clock.beat("2/100") is True
 
     assert [d[0] for d in ctx.beats] == ["0/100", "2/100"]
@@ -31,52 +31,70 @@ class TestReprManticoreTuple:
         assert repr_manticore_tuple([42, 7, 99]) == "(42,7,99)"
 
 
+def _page(file_hash, page_id, text, **ner):
+    return {"collection_dataset": "ds", "file_hash": file_hash, "extracted_by": "tika",
+            "page_id": page_id, "text": text, **ner}
+
+
 class TestPagesReplaceSql:
     def test_golden_with_entities(self):
-        row = {
-            "ner_per": "(11,22)",
-            "ner_org": "(33)",
-            "ner_loc": "()",
-            "ner_misc": "(44)",
-        }
-        sql = pages_replace_sql("testdata_1_pages", row)
+        row = _page("h1", 0, "hello", ner_per="(11,22)", ner_org="(33)", ner_loc="()", ner_misc="(44)")
+        sql, values = pages_replace_sql("testdata_1_pages", "ds", [row])
         assert _normalize(sql) == _normalize("""
-            REPLACE INTO testdata_1_pages (
-                id, collection_dataset, file_hash, extracted_by, page_id, page_text,
-                ner_per, ner_org, ner_loc, ner_misc
-            ) VALUES (
-                %s, %s, %s, %s, %s, %s,
-                (11,22), (33), (), (44)
-            )
+            REPLACE INTO testdata_1_pages
+            (id, collection_dataset, file_hash, extracted_by, page_id, page_text,
+             ner_per, ner_org, ner_loc, ner_misc)
+            VALUES (%s, %s, %s, %s, %s, %s, (11,22), (33), (), (44))
         """)
+        assert values == [pages_row_id("ds", "h1", "tika", 0), "ds", "h1", "tika", 0, "hello"]
 
     def test_missing_ner_fields_default_to_empty_mva(self):
         # A segment with no entities interpolates () — the `{row.get(...) or '()'}`
         # behaviour is load-bearing.
-        sql = pages_replace_sql("testdata_1_pages", {})
+        sql, _ = pages_replace_sql("testdata_1_pages", "ds", [_page("h1", 0, "hello")])
         normalized = _normalize(sql)
         assert "%s, %s, %s, %s, %s, %s, (), (), (), ()" in normalized
         assert "None" not in normalized
 
+    def test_rows_share_one_statement_in_order(self):
+        """One round trip and one parse per statement instead of per row; each row
+        keeps its own MVAs and its parameters stay aligned with its tuple."""
+        rows = [_page("h1", 0, "first", ner_per="(1)"), _page("h2", 3, "second", ner_misc="(2)")]
+        sql, values = pages_replace_sql("testdata_1_pages", "ds", rows)
+        assert _normalize(sql).endswith(
+            "VALUES (%s, %s, %s, %s, %s, %s, (1), (), (), ()), "
+            "(%s, %s, %s, %s, %s, %s, (), (), (), (2))"
+        )
+        assert values == [
+            pages_row_id("ds", "h1", "tika", 0), "ds", "h1", "tika", 0, "first",
+            pages_row_id("ds", "h2", "tika", 3), "ds", "h2", "tika", 3, "second",
+        ]
+
 
 class TestMetaReplaceSql:
     def test_golden(self):
         row = {
+            "collection_dataset": "ds",
+            "file_hash": "h1",
+            "filenames": "a.txt",
+            "metadata_values": "",
             "file_types": "(5)",
             "file_mime_types": "(6,7)",
             "file_extensions": "()",
             "file_paths": "(8,9)",
         }
-        sql = meta_replace_sql("testdata_1_meta", row)
+        sql, values = meta_replace_sql("testdata_1_meta", "ds", [row, dict(row, file_hash="h2")])
         assert _normalize(sql) == _normalize("""
-            REPLACE INTO testdata_1_meta (
-                id, collection_dataset, file_hash, filenames, metadata_values,
-                file_types, file_mime_types, file_extensions, file_paths
-            ) VALUES (
-                %s, %s, %s, %s, %s,
-                (5), (6,7), (), (8,9)
-            )
+            REPLACE INTO testdata_1_meta
+            (id, collection_dataset, file_hash, filenames, metadata_values,
+             file_types, file_mime_types, file_extensions, file_paths)
+            VALUES (%s, %s, %s, %s, %s, (5), (6,7), (), (8,9)),
+                   (%s, %s, %s, %s, %s, (5), (6,7), (), (8,9))
         """)
+        assert values == [
+            metadata_row_id("ds", "h1"), "ds", "h1", "a.txt", "",
+            metadata_row_id("ds", "h2"), "ds", "h2", "a.txt", "",
+        ]
 
 
 class TestRowIds:
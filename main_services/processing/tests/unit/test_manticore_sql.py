@@ -6,12 +6,14 @@ runtime Manticore syntax error; these pin the exact strings.
 
 import pytest
 
+from database import manticore
 from database.manticore import meta_table_ddl, pages_table_ddl, vectors_table_ddl
 from tasks.P6_index_data.activities import (
     metadata_row_id,
     pages_row_id,
     repr_manticore_tuple,
     repr_manticore_vector,
+    vectors_replace_sql,
     vectors_row_id,
 )
 
@@ -87,10 +89,18 @@ def test_vectors_table_ddl_golden():
             page_id int,
             chunk_index int,
             embedding float_vector knn_type='hnsw' knn_dims='384' hnsw_similarity='COSINE'
+                hnsw_m='16' hnsw_ef_construction='200'
         )
     """)
 
 
+def test_vectors_table_ddl_quantization(monkeypatch):
+    monkeypatch.setattr(manticore, "VECTOR_QUANTIZATION", "8bit")
+    assert "hnsw_ef_construction='200' quantization='8bit'" in _normalize(
+        vectors_table_ddl("testdata_1_vectors", 384)
+    )
+
+
 def test_vectors_table_ddl_validates_dims():
     # knn_dims cannot be altered after creation; a bad value must fail here, not as a
     # Manticore syntax error at plan time.
@@ -115,3 +125,22 @@ def test_vectors_row_id_is_deterministic_and_model_scoped():
     }
     assert len(ids) == 4
     assert all(0 < i < 2**63 for i in ids)
+
+
+def test_vectors_replace_sql_is_one_multi_row_statement():
+    rows = [
+        {"file_hash": "h1", "extracted_by": "tika", "page_id": 1, "chunk_index": 0,
+         "embedding_model": "e5-small", "embedding": [0.5, 0.25]},
+        {"file_hash": "h1", "extracted_by": "tika", "page_id": 1, "chunk_index": 1,
+         "embedding_model": "e5-small", "embedding": [1, -2]},
+    ]
+    sql, values = vectors_replace_sql("testdata_1_vectors", "ds", rows)
+    assert _normalize(sql) == _normalize("""
+        REPLACE INTO testdata_1_vectors
+        (id, collection_dataset, file_hash, extracted_by, page_id, chunk_index, embedding)
+        VALUES (%s, %s, %s, %s, %s, %s, (0.5,0.25)), (%s, %s, %s, %s, %s, %s, (1.0,-2.0))
+    """)
+    assert values == [
+        vectors_row_id("ds", "h1", "tika", 1, 0, "e5-small"), "ds", "h1", "tika", 1, 0,
+        vectors_row_id("ds", "h1", "tika", 1, 1, "e5-small"), "ds", "h1", "tika", 1, 1,
+    ]
@@ -0,0 +1,33 @@
+"""Tests for database.minio.ensure_bucket's existence cache."""
+
+from database import minio as minio_db
+
+
+class _FakeMinio:
+    def __init__(self, exists):
+        self.exists = exists
+        self.calls = []
+
+    def bucket_exists(self, name):
+        self.calls.append(("exists", name))
+        return self.exists
+
+    def make_bucket(self, name):
+        self.calls.append(("make", name))
+        self.exists = True
+
+
+def test_bucket_is_checked_once_per_process(monkeypatch):
+    """P0 ensures the bucket before every new blob; only the first call may reach MinIO."""
+    fake = _FakeMinio(exists=False)
+    monkeypatch.setattr(minio_db, "get_minio_client", lambda: fake)
+    monkeypatch.setattr(minio_db, "_known_buckets", set())
+
+    for _ in range(3):
+        minio_db.ensure_bucket("blobs")
+
+    assert fake.calls == [("exists", "blobs"), ("make", "blobs")]
+
+    minio_db.forget_bucket("blobs")
+    minio_db.ensure_bucket("blobs")
+    assert fake.calls[-1] == ("exists", "blobs")
@@ -65,3 +65,10 @@ def test_negative_text_index_is_dropped():
     the entity into the LAST text's slot."""
     result = _group_entities_by_text([_entity("PER", "Ada", text_index=-1)], 2)
     assert result == [{"PER": [], "ORG": [], "LOC": [], "MISC": []}] * 2
+
+
+def test_texts_do_not_share_their_lists():
+    """Each text gets its own four lists; an entity for one must never show up in another."""
+    result = _group_entities_by_text([_entity("MISC", "Euro", text_index=0)], 3)
+    assert result[0]["MISC"] == ["Euro"]
+    assert result[1]["MISC"] == [] and result[2]["MISC"] == []
@@ -3,12 +3,15 @@
 Two pure things carry the whole job. The diff decides what gets purged — get a removal
 wrong and either rows leak forever or a variant still in use is deleted. The key decides
 where the derived object lives — get it wrong and the ingest walker starts a re-derive
-loop that bills an OCR pass per lap.
+loop that bills an OCR pass per lap. The purge's tombstone write is pinned too.
 """
 
+import contextlib
+
 import pytest
 
-from tasks.P_admin.ocr_languages import compute_diff
+from tasks.P_admin import ocr_languages
+from tasks.P_admin.ocr_languages import PurgeVariantsParams, compute_diff
 from tasks.ocr_pdf_client import DERIVED_PREFIX, derived_key, engines_for_provider
 from tasks.text_sources import ENGINE_EASYOCR, ENGINE_TESSERACT
 
@@ -66,6 +69,50 @@ class TestComputeDiff:
         assert result.removed_pairs == [[ENGINE_TESSERACT, "eng+ron"]]
 
 
+class _FakeResult:
+    def __init__(self, rows):
+        self.result_rows = rows
+
+
+class _FakeCHClient:
+    def __init__(self, tables):
+        self._tables = tables
+        self.commands = []
+
+    def query(self, sql, parameters=None):
+        return _FakeResult([[t] for t in self._tables])
+
+    def command(self, sql, parameters=None):
+        self.commands.append((sql, parameters))
+
+
+class TestPurgeDroppedVariants:
+    def test_every_removed_pair_is_tombstoned_by_one_insert(self, monkeypatch):
+        """One INSERT ... SELECT for all the pairs, not one scan and insert part each."""
+        import database.clickhouse
+        import database.manticore
+
+        client = _FakeCHClient(["pdf_ocr_results"])
+
+        @contextlib.contextmanager
+        def fake_client_ctx(collectionname):
+            yield client
+
+        monkeypatch.setattr(database.clickhouse, "get_collection_client", fake_client_ctx)
+        monkeypatch.setattr(database.manticore, "list_shard_tables", lambda c: [])
+        pairs = [[ENGINE_TESSERACT, "eng"], [ENGINE_TESSERACT, "eng+ron"], [ENGINE_EASYOCR, "en"]]
+
+        result = ocr_languages.purge_dropped_ocr_variants(PurgeVariantsParams(
+            collectionname="coll", collection_dataset="coll_ds",
+            variants=["ocr_tesseract_eng"], removed_pairs=pairs,
+        ))
+
+        ((sql, parameters),) = [c for c in client.commands if "INSERT INTO pdf_ocr_results" in c[0]]
+        assert "(engine, languages) IN {pairs:Array(Tuple(String, String))}" in sql
+        assert parameters == {"cd": "coll_ds", "pairs": [tuple(p) for p in pairs]}
+        assert result["pdf_rows"] == 3
+
+
 class TestDerivedKey:
     def test_the_key_is_always_under_the_derived_prefix(self):
         key = derived_key("testdata_testfiles", "abc123", "tesseract", "eng+ron")
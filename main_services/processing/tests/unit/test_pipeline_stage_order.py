@@ -31,8 +31,10 @@ def _child_workflow_order() -> list[str]:
                             and child.args[0].attr == "run"
                             and isinstance(child.args[0].value, ast.Name)
                         ):
-                            order.append(child.args[0].value.id)
-                    return order
+                            order.append((child.lineno, child.args[0].value.id))
+                    # ast.walk is breadth-first; a call nested in a gather would
+                    # otherwise sort after a later top-level await.
+                    return [name for _, name in sorted(order)]
     raise AssertionError("ExecuteSinglePlan.run not found in P2_execute_plan/workflows.py")
 
 
@@ -49,18 +51,63 @@ def test_extract_entities_runs_before_indexing():
     )
 
 
-def test_chunk_embed_runs_between_nlp_and_indexing():
+def test_chunk_embed_runs_before_indexing():
     # P6's vector indexer copies the text_chunk_vectors rows P5 writes; an index that
     # runs before embedding comes up with empty _vectors tables.
     order = _child_workflow_order()
     assert "ChunkEmbedForPlan" in order, (
         f"ChunkEmbedForPlan is not executed by ExecuteSinglePlan: {order}"
     )
-    assert order.index("ExtractEntitiesForPlan") < order.index("ChunkEmbedForPlan") \
-        < order.index("IndexDatasetPlan"), (
-        f"stage order must be P4 NER -> P5 chunk+embed -> P6 index: {order}"
+    assert order.index("ChunkEmbedForPlan") < order.index("IndexDatasetPlan"), (
+        f"ChunkEmbedForPlan must run strictly before IndexDatasetPlan: {order}"
     )
 
 
+def test_nlp_and_chunk_embed_are_awaited_together():
+    """P4 and P5 are independent (both read text_content, neither reads the other's
+    tables), so they run concurrently: one gather holds both child workflows."""
+    source = open(p2_workflows.__file__).read()
+    for node in ast.walk(ast.parse(source)):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "gather"
+        ):
+            children = {
+                arg.args[0].value.id
+                for arg in node.args
+                if isinstance(arg, ast.Call) and arg.args
+                and isinstance(arg.args[0], ast.Attribute)
+                and isinstance(arg.args[0].value, ast.Name)
+            }
+            if {"ExtractEntitiesForPlan", "ChunkEmbedForPlan"} <= children:
+                return
+    raise AssertionError("ExtractEntitiesForPlan and ChunkEmbedForPlan are not gathered together")
+
+
+def test_concurrent_nlp_and_chunk_embed_are_versioned():
+    """Plans already running replay a history with the two children one after the
+    other; the gather must sit behind a patch marker or their replay fails."""
+    source = open(p2_workflows.__file__).read()
+    for node in ast.walk(ast.parse(source)):
+        if (
+            isinstance(node, ast.If)
+            and isinstance(node.test, ast.Call)
+            and isinstance(node.test.func, ast.Attribute)
+            and node.test.func.attr == "patched"
+            and node.test.args
+            and getattr(node.test.args[0], "value", None) == "p4-p5-concurrent"
+        ):
+            gathered = any(
+                isinstance(n, ast.Call) and isinstance(n.func, ast.Attribute)
+                and n.func.attr == "gather"
+                for stmt in node.body for n in ast.walk(stmt)
+            )
+            assert gathered, "the patched branch must hold the gather"
+            assert node.orelse, "the unpatched branch must keep the sequential awaits"
+            return
+    raise AssertionError('no workflow.patched("p4-p5-concurrent") guard in ExecuteSinglePlan')
+
+
 def test_sanity_order_is_nonempty():
     assert _child_workflow_order()
@@ -7,6 +7,10 @@ the pipeline for tens of minutes instead of degrading it. Each one gets a test
 here so it cannot go back to being decorative.
 """
 
+import gzip
+import json
+
+import orjson
 import pytest
 import requests
 
@@ -32,24 +36,25 @@ class _Response:
         if self._error is not None:
             raise self._error
 
-    def json(self):
-        return self._payload
+    @property
+    def content(self):
+        return json.dumps(self._payload).encode()
 
 
 GPU = ("gpu", "http://gpu.test/v1/extract-entities")
 CPU = ("spacy", "http://cpu.test/v1/extract-entities")
 
 
-def test_connect_timeout_is_a_two_tuple_not_a_scalar(monkeypatch):
+def test_connect_timeout_is_a_two_tuple_not_a_scalar(fake_remote):
     """The bug this module exists for: requests measures timeouts in SECONDS,
     so timeout=3000 was a 50-minute budget for both connect and read."""
     seen = {}
 
-    def post(url, json=None, headers=None, timeout=None):
+    def post(url, json=None, data=None, headers=None, timeout=None):
         seen["timeout"] = timeout
         return _Response({"ok": True})
 
-    monkeypatch.setattr(requests, "post", post)
+    fake_remote(post)
     remote.post_json([GPU], {"input": []})
 
     assert isinstance(seen["timeout"], tuple), "must pass (connect, read)"
@@ -58,37 +63,37 @@ def test_connect_timeout_is_a_two_tuple_not_a_scalar(monkeypatch):
     assert read > connect, "a live host chewing through a batch needs minutes"
 
 
-def test_records_which_endpoint_actually_served(monkeypatch):
-    monkeypatch.setattr(requests, "post", lambda *a, **kw: _Response({"data": []}))
+def test_records_which_endpoint_actually_served(fake_remote):
+    fake_remote(lambda *a, **kw: _Response({"data": []}))
     result = remote.post_json([GPU, CPU], {})
     assert result.provider == "gpu" and result.url == GPU[1]
 
 
-def test_falls_back_to_the_cpu_twin_on_connect_failure(monkeypatch):
+def test_falls_back_to_the_cpu_twin_on_connect_failure(fake_remote):
     def post(url, **kwargs):
         if url == GPU[1]:
             raise requests.ConnectTimeout("no route to host")
         return _Response({"data": ["cpu"]})
 
-    monkeypatch.setattr(requests, "post", post)
+    fake_remote(post)
     result = remote.post_json([GPU, CPU], {})
     assert result.provider == "spacy", "must degrade, not fail"
     assert result.data == {"data": ["cpu"]}
 
 
-def test_no_twin_configured_fails_fast_and_names_the_url(monkeypatch):
+def test_no_twin_configured_fails_fast_and_names_the_url(fake_remote):
     """Until Part 2 builds the CPU twin, GPU_FALLBACK=true with nothing to fall
     back to must fail fast with a clear message, not stall."""
     def post(url, **kwargs):
         raise requests.ConnectTimeout("no route to host")
 
-    monkeypatch.setattr(requests, "post", post)
+    fake_remote(post)
     with pytest.raises(remote.RemoteUnavailable) as excinfo:
         remote.post_json([GPU, ("spacy", "")], {})
     assert "gpu.test" in str(excinfo.value)
 
 
-def test_a_read_timeout_does_not_silently_downgrade(monkeypatch):
+def test_a_read_timeout_does_not_silently_downgrade(fake_remote):
     """A ReadTimeout means the host IS alive. Retrying on the CPU twin would
     hide a real server-side problem behind a silently degraded provider."""
     calls = []
@@ -97,13 +102,13 @@ def test_a_read_timeout_does_not_silently_downgrade(monkeypatch):
         calls.append(url)
         raise requests.ReadTimeout("still chewing")
 
-    monkeypatch.setattr(requests, "post", post)
+    fake_remote(post)
     with pytest.raises(remote.RemoteUnavailable):
         remote.post_json([GPU, CPU], {})
     assert calls == [GPU[1]], "must not try the twin after a read timeout"
 
 
-def test_breaker_opens_and_stops_paying_the_connect_timeout(monkeypatch):
+def test_breaker_opens_and_stops_paying_the_connect_timeout(monkeypatch, fake_remote):
     """Without the breaker a dead host costs one connect timeout PER FILE across
     the whole dataset; with it, one per break window."""
     attempts = []
@@ -114,7 +119,7 @@ def test_breaker_opens_and_stops_paying_the_connect_timeout(monkeypatch):
             raise requests.ConnectTimeout("down")
         return _Response({"data": []})
 
-    monkeypatch.setattr(requests, "post", post)
+    fake_remote(post)
     monkeypatch.setattr(remote, "CIRCUIT_FAILURE_THRESHOLD", 2)
     monkeypatch.setattr(remote, "CIRCUIT_BREAK_SECONDS", 60.0)
 
@@ -128,7 +133,7 @@ def test_breaker_opens_and_stops_paying_the_connect_timeout(monkeypatch):
     )
 
 
-def test_breaker_is_time_boxed_never_latching(monkeypatch):
+def test_breaker_is_time_boxed_never_latching(monkeypatch, fake_remote):
     """A recovered GPU host must come back on its own -- a latching breaker
     would silently pin everything to CPU forever."""
     state = {"down": True}
@@ -138,36 +143,38 @@ def test_breaker_is_time_boxed_never_latching(monkeypatch):
             raise requests.ConnectTimeout("down")
         return _Response({"data": []})
 
-    monkeypatch.setattr(requests, "post", post)
+    # The breaker's clock is driven by hand: no real wait, and no race between a
+    # short window and a slow machine reaching the "circuit open" call.
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(remote.time, "monotonic", lambda: clock["now"])
+    fake_remote(post)
     monkeypatch.setattr(remote, "CIRCUIT_FAILURE_THRESHOLD", 1)
-    monkeypatch.setattr(remote, "CIRCUIT_BREAK_SECONDS", 0.05)
+    monkeypatch.setattr(remote, "CIRCUIT_BREAK_SECONDS", 30)
 
     assert remote.post_json([GPU, CPU], {}).provider == "spacy"
     assert remote.post_json([GPU, CPU], {}).provider == "spacy"  # circuit open
 
     state["down"] = False
-    import time
-    time.sleep(0.08)
+    clock["now"] += 31
     assert remote.post_json([GPU, CPU], {}).provider == "gpu", "breaker latched"
 
 
-def test_gpu_fallback_false_never_uses_the_twin(monkeypatch):
+def test_gpu_fallback_false_never_uses_the_twin(monkeypatch, fake_remote):
     def post(url, **kwargs):
         if url == GPU[1]:
             raise requests.ConnectTimeout("down")
         return _Response({"data": []})
 
-    monkeypatch.setattr(requests, "post", post)
+    fake_remote(post)
     monkeypatch.setattr(remote, "GPU_FALLBACK", False)
     with pytest.raises(remote.RemoteUnavailable):
         remote.post_json([GPU, CPU], {})
 
 
-def test_http_errors_propagate_rather_than_falling_back(monkeypatch):
+def test_http_errors_propagate_rather_than_falling_back(fake_remote):
     """A 500 means the host is alive and broken. Failing the activity makes
     Temporal retry it; degrading to CPU would mask the fault."""
-    monkeypatch.setattr(requests, "post", lambda *a, **kw: _Response(
-        error=requests.HTTPError("boom")))
+    fake_remote(lambda *a, **kw: _Response(error=requests.HTTPError("boom")))
     with pytest.raises(requests.HTTPError):
         remote.post_json([GPU, CPU], {})
 
@@ -176,3 +183,116 @@ def test_no_endpoint_configured_is_a_clear_error(monkeypatch):
     with pytest.raises(remote.RemoteUnavailable) as excinfo:
         remote.post_json([("gpu", ""), ("spacy", "")], {})
     assert "no endpoint is configured" in str(excinfo.value)
+
+
+def test_calls_reuse_one_pooled_session(monkeypatch):
+    """A bare requests.post opened a new connection per batch; the default path
+    must go through the one keep-alive session, and the adapter must not retry
+    underneath the breaker."""
+    monkeypatch.setattr(remote, "_SESSION", None)
+    session = remote.pooled_session()
+    assert remote.pooled_session() is session
+    adapter = session.get_adapter("http://gpu.test/")
+    assert adapter.max_retries.total == 0
+    assert adapter._pool_maxsize == remote.POOL_MAXSIZE
+
+
+class _BusyResponse(_Response):
+    def __init__(self, status_code, headers=None):
+        super().__init__(error=requests.HTTPError(f"HTTP {status_code}"))
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def test_busy_server_is_asked_again_after_retry_after(monkeypatch, fake_remote):
+    """429/503 means "come back later": wait as told (plus jitter) and retry the
+    same endpoint, never the CPU twin."""
+    replies = [_BusyResponse(429, {"Retry-After": "3"}), _BusyResponse(503), _Response({"ok": 1})]
+    urls, sleeps = [], []
+
+    def post(url, **kwargs):
+        urls.append(url)
+        return replies.pop(0)
+
+    fake_remote(post)
+    monkeypatch.setattr(remote.time, "sleep", sleeps.append)
+    result = remote.post_json([GPU, CPU], {})
+
+    assert result.provider == "gpu"
+    assert urls == [GPU[1]] * 3
+    assert 3.0 <= sleeps[0] <= 4.5, "Retry-After is a floor, jitter only stretches it"
+    assert remote.BUSY_BACKOFF_SECONDS * 2 <= sleeps[1] <= remote.BUSY_BACKOFF_SECONDS * 3
+
+
+def test_busy_retries_are_bounded_then_the_error_propagates(monkeypatch, fake_remote):
+    calls = []
+
+    def post(url, **kwargs):
+        calls.append(url)
+        return _BusyResponse(503, {"Retry-After": "0"})
+
+    fake_remote(post)
+    monkeypatch.setattr(remote.time, "sleep", lambda s: None)
+    with pytest.raises(requests.HTTPError):
+        remote.post_json([GPU, CPU], {})
+    assert len(calls) == remote.BUSY_RETRIES + 1
+
+
+def test_retry_after_accepts_an_http_date():
+    assert remote._retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert remote._retry_after_seconds("not a date") is None
+    assert remote._retry_after_seconds("2") == 2.0
+
+
+def test_large_bodies_are_gzipped_only_for_callers_that_opt_in(monkeypatch, fake_remote):
+    sent = []
+
+    def post(url, json=None, data=None, headers=None, timeout=None):
+        sent.append((json, data, headers))
+        return _Response({"ok": True})
+
+    fake_remote(post)
+    monkeypatch.setattr(remote, "GZIP_MIN_BYTES", 100)
+    big = {"input": ["x" * 200]}
+
+    remote.post_json([GPU], big, compress=True)
+    remote.post_json([GPU], {"input": ["short"]}, compress=True)
+    remote.post_json([GPU], big)  # OCR and other callers never opt in
+
+    (_, data, headers), small, plain = sent
+    assert headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(data)) == big
+    assert small[0] == {"input": ["short"]} and "Content-Encoding" not in small[2]
+    assert plain[0] == big and "Content-Encoding" not in plain[2]
+
+
+def test_gzip_is_off_by_default(fake_remote):
+    seen = {}
+
+    def post(url, json=None, data=None, headers=None, timeout=None):
+        seen.update(headers)
+        return _Response({"ok": True})
+
+    fake_remote(post)
+    remote.post_json([GPU], {"input": ["x" * 100_000]}, compress=True)
+    assert "Content-Encoding" not in seen
+
+
+def test_bodies_go_through_orjson_both_ways(monkeypatch):
+    """The request is sent as orjson's bytes, never ``json=`` (the stdlib codec), and
+    the reply is decoded from ``response.content``, not ``response.json()``."""
+    seen = {}
+
+    class _RawSession:
+        def post(self, url, **kwargs):
+            seen.update(kwargs)
+            return _Response({"data": [{"index": 0, "embedding": [0.5, -1.0]}]})
+
+    monkeypatch.setattr(remote, "_SESSION", _RawSession())
+    payload = {"input": ["zürich", "x" * 50], "model": "m"}
+    result = remote.post_json([GPU], payload)
+
+    assert "json" not in seen
+    assert seen["data"] == orjson.dumps(payload)
+    assert seen["headers"]["Content-Type"] == "application/json"
+    assert result.data == {"data": [{"index": 0, "embedding": [0.5, -1.0]}]}